@@ -5,15 +5,18 @@ from datetime import datetime
 from database import DatabaseManager
 
 class APISyncService:
-    def __init__(self, target_username: str, sync_interval: int = 60):
+    def __init__(self, target_username: str, sync_interval: int = 60, ack_batch_size: int = 50):
         """Initialize the API sync service
         
         Args:
             target_username: Twitter username being tracked
             sync_interval: Interval between syncs in seconds (default: 60)
+            ack_batch_size: Synced followers acknowledged in the database per commit
         """
         self.target_username = target_username
         self.sync_interval = sync_interval
+        self.ack_batch_size = ack_batch_size
+        self.synced_ids = []
         self.should_exit = False
         
         # Get API configuration
@@ -103,6 +106,16 @@ class APISyncService:
             print(f"Error syncing follower {follower['username']}: {str(e)}")
             return False
             
+    def flush_synced(self):
+        """Mark the followers synced since the last flush in one commit"""
+        if not self.synced_ids:
+            return
+        results = self.db.mark_followers_synced(self.synced_ids)
+        failed = [follower_id for follower_id, ok in results.items() if not ok]
+        if failed:
+            print(f"Could not mark {len(failed)} followers as synced: {failed[:10]}")
+        self.synced_ids = []
+        
     def stop(self):
         """Stop the service"""
         print("Stopping API sync service...")
@@ -140,7 +153,9 @@ class APISyncService:
                             break
                             
                         if self.sync_follower(follower):
-                            self.db.mark_follower_synced(follower['id'])
+                            self.synced_ids.append(follower['id'])
+                            if len(self.synced_ids) >= self.ack_batch_size:
+                                self.flush_synced()
                             
                         # Exit if flag was set during sync
                         if self.should_exit:
@@ -149,6 +164,7 @@ class APISyncService:
                         # Only sleep between followers if not exiting
                         if not self.should_exit and len(pending_followers) > 1:
                             time.sleep(2)
+                    self.flush_synced()
                 else:
                     print(".", end="", flush=True)
                 
@@ -180,4 +196,5 @@ class APISyncService:
                         time.sleep(self.sync_interval)
         
         # Final cleanup
+        self.flush_synced()
         print("\nAPI sync service stopped.") 
\ No newline at end of file
@@ -0,0 +1,891 @@
+import os
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+import tracemalloc
+from typing import Dict
+from dotenv import load_dotenv
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from twitter_checker import TwitterFollowerTracker, ScanIndex, EXTRACTION_MODES
+from follower_simulator import FollowerSimulator
+from follower_index import FollowerIndex, INDEX_MODES
+from datetime import datetime, timedelta
+from database import DatabaseManager, DISPLAY_TIMESTAMP, setup_schema, migrate
+from web_viewer import FollowerWebViewer
+from exporter import export
+from importer import import_followers
+
+def benchmark_extraction(target_username: str, steps: int = 30, scroll_step: int = 300, pause: float = 2):
+    """Compare WebDriver round trips and wall time of the extraction modes
+    
+    Each mode gets its own browser session, walks the same number of scroll
+    steps down the followers page and only times the extraction calls, so
+    page loading and sleeps do not skew the comparison.
+    
+    Args:
+        target_username: Account whose followers page is scrolled
+        steps: Number of scroll steps per mode
+        scroll_step: Pixels scrolled between extractions
+        pause: Seconds to wait for content after each scroll
+        
+    Returns:
+        dict: Results per extraction mode
+    """
+    results = {}
+    
+    for mode in EXTRACTION_MODES:
+        tracker = TwitterFollowerTracker(target_username, extraction_mode=mode)
+        if not tracker.setup_driver():
+            print(f"Failed to set up WebDriver for {mode} mode")
+            continue
+            
+        try:
+            tracker.driver.get(f"{tracker.base_url}/{target_username}/followers")
+            WebDriverWait(tracker.driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="cellInnerDiv"]'))
+            )
+            
+            usernames = set()
+            calls = 0
+            elapsed = 0.0
+            
+            for _ in range(steps):
+                calls_before = tracker.webdriver_calls
+                started = time.perf_counter()
+                _, visible_followers = tracker.collect_visible_followers()
+                elapsed += time.perf_counter() - started
+                calls += tracker.webdriver_calls - calls_before
+                
+                usernames.update(row[1] for row in visible_followers if row[1])
+                tracker.driver.execute_script(f"window.scrollBy(0, {scroll_step});")
+                time.sleep(pause)
+                
+            results[mode] = {
+                'followers': len(usernames),
+                'round_trips': calls,
+                'seconds': elapsed
+            }
+            
+        finally:
+            tracker.stop()
+            
+    print(f"\n{'Mode':<10}{'Followers':>10}{'Trips/1k':>12}{'Secs/1k':>10}")
+    for mode, result in results.items():
+        per_thousand = 1000 / max(result['followers'], 1)
+        print(f"{mode:<10}{result['followers']:>10}"
+              f"{result['round_trips'] * per_thousand:>12.0f}"
+              f"{result['seconds'] * per_thousand:>10.2f}")
+              
+    return results
+
+def synthetic_cell_stream(total: int, visible: int = 8, step: int = 4, cell_height: int = 80):
+    """Yield (page_y, follower) the way the scroll loop reads a timeline
+    
+    Consecutive viewports overlap, so every cell is read visible / step times.
+    """
+    for top in range(0, total, step):
+        for index in range(top, min(top + visible, total)):
+            yield index * cell_height, {'display_name': f"User {index}", 'username': f"user{index}"}
+            
+def benchmark_scan_index(sizes=(1000, 10000, 100000), known_ratio: float = 0.5, legacy_limit: int = 20000):
+    """Compare the legacy position/list dedup with ScanIndex on synthetic cells
+    
+    Args:
+        sizes: Timeline lengths to simulate
+        known_ratio: Share of followers already in the database
+        legacy_limit: Largest size run through the quadratic legacy path
+        
+    Returns:
+        dict: Microseconds per cell and peak memory per size and strategy
+    """
+    results = {}
+    
+    for total in sizes:
+        known = {f"user{index}" for index in range(int(total * (1 - known_ratio)), total)}
+        cells = list(synthetic_cell_stream(total))
+        results[total] = {}
+        
+        if total <= legacy_limit:
+            tracemalloc.start()
+            started = time.perf_counter()
+            processed_positions = set()
+            all_followers = []
+            for position, follower in cells:
+                if position in processed_positions:
+                    continue
+                processed_positions.add(position)
+                if follower['username'] not in known and follower not in all_followers:
+                    all_followers.append(follower)
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results[total]['legacy'] = (elapsed * 1e6 / len(cells), peak)
+            
+        tracemalloc.start()
+        started = time.perf_counter()
+        scan_index = ScanIndex(known)
+        for _, follower in cells:
+            scan_index.observe(follower)
+            if scan_index.pending_count >= 100:
+                scan_index.take_pending()
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results[total]['scan_index'] = (elapsed * 1e6 / len(cells), peak)
+        
+    print(f"\n{'Followers':>10}{'Strategy':>12}{'us/cell':>10}{'Peak KB':>10}")
+    for total, strategies in results.items():
+        for strategy, (per_cell, peak) in strategies.items():
+            print(f"{total:>10}{strategy:>12}{per_cell:>10.2f}{peak / 1024:>10.0f}")
+            
+    return results
+    
+def benchmark_simulated_scan(followers: int = 2000, latency_ms: int = 100, modes=EXTRACTION_MODES,
+                             pacing: str = 'adaptive'):
+    """Run full scans against the offline follower simulator
+    
+    Every mode scans its own target on the same synthetic list with a lean
+    headless browser, a throwaway profile and a throwaway database, so runs
+    are repeatable and never touch x.com or data/followers.db.
+    
+    Args:
+        followers: Followers served by the simulator
+        latency_ms: Delay added to every Followers API response
+        modes: Extraction modes to run
+        pacing: Scroll pacing used by every run
+        
+    Returns:
+        dict: Results per extraction mode
+    """
+    work_dir = tempfile.mkdtemp(prefix='follower-benchmark-')
+    # Must be set before the first DatabaseManager() in this process
+    os.environ['DATABASE_PATH'] = os.path.join(work_dir, 'followers.db')
+    
+    simulator = FollowerSimulator(followers, latency_ms)
+    simulator.start()
+    results = {}
+    
+    try:
+        for mode in modes:
+            tracker = TwitterFollowerTracker(
+                f"sim_{mode}",
+                extraction_mode=mode,
+                pacing=pacing,
+                profile_dir=os.path.join(work_dir, f"profile_{mode}"),
+                lean=True,
+                base_url=simulator.base_url
+            )
+            if not tracker.setup_driver():
+                print(f"Failed to set up WebDriver for {mode} mode")
+                continue
+                
+            try:
+                calls_before = tracker.webdriver_calls
+                requests_before = simulator.api_requests
+                
+                tracemalloc.start()
+                tracker.scan_followers()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                
+                calls = tracker.webdriver_calls - calls_before
+                metrics = tracker.driver.execute_cdp_cmd('Performance.getMetrics', {})['metrics']
+                metrics = {metric['name']: metric['value'] for metric in metrics}
+                stats = tracker.scan_stats[-1]
+                
+                results[mode] = {
+                    'followers': stats['followers_seen'],
+                    'followers_per_sec': stats['followers_per_sec'],
+                    'seconds': stats['seconds'],
+                    'round_trips': calls,
+                    'api_requests': simulator.api_requests - requests_before,
+                    'python_peak_bytes': peak,
+                    'js_heap_bytes': metrics.get('JSHeapUsedSize'),
+                    'dom_nodes': metrics.get('Nodes')
+                }
+                
+            finally:
+                tracker.stop()
+                
+    finally:
+        simulator.stop()
+        
+    print(f"\n{followers} simulated followers, {latency_ms} ms API latency, {pacing} pacing")
+    print(f"{'Mode':<10}{'Found':>8}{'Per sec':>10}{'Trips/1k':>10}{'API reqs':>10}{'Py peak KB':>12}{'JS heap MB':>12}")
+    for mode, result in results.items():
+        per_thousand = 1000 / max(result['followers'], 1)
+        js_heap = f"{result['js_heap_bytes'] / 1048576:.1f}" if result['js_heap_bytes'] else '-'
+        print(f"{mode:<10}{result['followers']:>8}{result['followers_per_sec']:>10.1f}"
+              f"{result['round_trips'] * per_thousand:>10.0f}{result['api_requests']:>10}"
+              f"{result['python_peak_bytes'] / 1024:>12.0f}{js_heap:>12}")
+              
+    return results
+    
+def benchmark_follower_index(sizes=(10000, 100000, 500000), lookups: int = 20000):
+    """Compare load time, memory and lookup cost of the follower index modes
+    
+    Half of the lookups hit stored followers and half miss, roughly what a
+    scan sees once it reaches followers found by earlier scans.
+    
+    Args:
+        sizes: Stored followers per run
+        lookups: Membership checks timed per mode
+        
+    Returns:
+        dict: Load seconds, memory bytes and microseconds per lookup by size and mode
+    """
+    work_dir = tempfile.mkdtemp(prefix='follower-benchmark-')
+    # Must be set before the first DatabaseManager() in this process
+    os.environ['DATABASE_PATH'] = os.path.join(work_dir, 'followers.db')
+    db = DatabaseManager()
+    conn = db.get_connection()
+    results = {}
+    
+    for total in sizes:
+        target = f"index_{total}"
+        now = int(time.time())
+        conn.executemany("""
+            INSERT INTO followers (target_username, display_name, username, first_seen, last_seen)
+            VALUES (?, ?, ?, ?, ?)
+        """, ((target, f"User {i}", f"user{i}", now, now) for i in range(total)))
+        conn.commit()
+        
+        probes = [f"user{i * 7919 % total}" if i % 2 else f"missing{i}" for i in range(lookups)]
+        results[total] = {}
+        
+        for mode in INDEX_MODES:
+            index = FollowerIndex(target, db, mode)
+            started = time.perf_counter()
+            index.load()
+            loaded = time.perf_counter() - started
+            
+            started = time.perf_counter()
+            hits = sum(1 for username in probes if username in index)
+            elapsed = time.perf_counter() - started
+            
+            results[total][mode] = (loaded, index.stats()['memory_bytes'], elapsed * 1e6 / lookups)
+            assert hits == lookups // 2
+            
+    print(f"\n{'Followers':>10}{'Mode':>8}{'Load s':>9}{'Memory KB':>11}{'us/lookup':>11}")
+    for total, modes in results.items():
+        for mode, (loaded, memory, per_lookup) in modes.items():
+            print(f"{total:>10}{mode:>8}{loaded:>9.2f}{memory / 1024:>11.0f}{per_lookup:>11.2f}")
+            
+    return results
+    
+def legacy_add_followers(conn, target_username: str, followers):
+    """The per-row add_followers loop the bulk upsert replaced, for comparison"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT username FROM followers WHERE target_username = ?", (target_username,))
+    existing = {row[0] for row in cursor.fetchall()}
+    now = int(time.time())
+    for follower in followers:
+        if follower['username'] not in existing:
+            cursor.execute("""
+                INSERT INTO followers (target_username, display_name, username, first_seen, last_seen, is_active, api_synced)
+                VALUES (?, ?, ?, ?, ?, 1, 0)
+            """, (target_username, follower['display_name'], follower['username'], now, now))
+        else:
+            cursor.execute("""
+                UPDATE followers SET last_seen = ?, is_active = 1
+                WHERE target_username = ? AND username = ?
+            """, (now, target_username, follower['username']))
+    conn.commit()
+    
+def benchmark_bulk_insert(sizes=(1000, 10000, 100000, 1000000), batches: int = 20, batch_size: int = 100,
+                          legacy_limit: int = 100000):
+    """Time add_followers batches as the followers table grows
+    
+    Each batch is half new followers and half followers already stored,
+    like a scan that is catching up with earlier ones.
+    
+    Args:
+        sizes: Stored followers before each run
+        batches: Batches timed per size and strategy
+        batch_size: Followers per batch
+        legacy_limit: Largest size run through the legacy per-row path
+        
+    Returns:
+        dict: Milliseconds per batch by size and strategy
+    """
+    work_dir = tempfile.mkdtemp(prefix='follower-benchmark-')
+    # Must be set before the first DatabaseManager() in this process
+    os.environ['DATABASE_PATH'] = os.path.join(work_dir, 'followers.db')
+    db = DatabaseManager()
+    conn = db.get_connection()
+    results = {}
+    
+    def batch_of(target, start):
+        half = batch_size // 2
+        fresh = [f"fresh_{target}_{start + i}" for i in range(half)]
+        stored = [f"user{(start * 7919 + i * 104729) % total}" for i in range(batch_size - half)]
+        return [{'display_name': username, 'username': username} for username in fresh + stored]
+        
+    for total in sizes:
+        results[total] = {}
+        for strategy in ('legacy', 'bulk'):
+            if strategy == 'legacy' and total > legacy_limit:
+                continue
+                
+            target = f"{strategy}_{total}"
+            now = int(time.time())
+            conn.executemany("""
+                INSERT INTO followers (target_username, display_name, username, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?)
+            """, ((target, f"User {i}", f"user{i}", now, now) for i in range(total)))
+            conn.commit()
+            if strategy == 'bulk':
+                db.follower_index(target)
+                
+            started = time.perf_counter()
+            for batch_num in range(batches):
+                followers = batch_of(target, batch_num * batch_size)
+                if strategy == 'bulk':
+                    db.add_followers(target, followers, batch_num)
+                else:
+                    legacy_add_followers(conn, target, followers)
+            elapsed = time.perf_counter() - started
+            results[total][strategy] = elapsed * 1000 / batches
+            
+    print(f"\n{'Followers':>10}{'Strategy':>10}{'ms/batch':>10}")
+    for total, strategies in results.items():
+        for strategy, per_batch in strategies.items():
+            print(f"{total:>10}{strategy:>10}{per_batch:>10.2f}")
+            
+    return results
+    
+def legacy_dashboard(conn, target_username: str, hours: int = 48):
+    """The follower list, recent scans and hourly gains as read from ISO timestamps"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT id, username, display_name, first_seen, last_seen, api_synced as is_synced
+        FROM followers WHERE target_username = ? AND is_active = 1
+        ORDER BY first_seen DESC LIMIT 25 OFFSET 0
+    """, (target_username,))
+    followers = []
+    for row in cursor.fetchall():
+        follower = dict(row)
+        for field in ['first_seen', 'last_seen']:
+            follower[field] = datetime.fromisoformat(follower[field]).strftime('%Y-%m-%d %H:%M:%S')
+        followers.append(follower)
+        
+    cursor.execute("""
+        SELECT timestamp, total_followers, new_followers, batch_number FROM scans
+        WHERE target_username = ? ORDER BY timestamp DESC LIMIT 10
+    """, (target_username,))
+    scans = [dict(row) for row in cursor.fetchall()]
+    for scan in scans:
+        scan['timestamp'] = datetime.fromisoformat(scan['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+        
+    # Hourly gains had to be bucketed in Python
+    since = datetime.now() - timedelta(hours=hours)
+    cursor.execute("""
+        SELECT first_seen FROM followers WHERE target_username = ? AND first_seen >= ?
+    """, (target_username, since.isoformat()))
+    gained = {}
+    for (first_seen,) in cursor.fetchall():
+        hour = datetime.fromisoformat(first_seen).replace(minute=0, second=0, microsecond=0)
+        gained[hour] = gained.get(hour, 0) + 1
+    return followers, scans, gained
+    
+def benchmark_timestamps(total: int = 1000000, days: int = 30, renders: int = 20):
+    """Compare database size and dashboard reads with ISO and epoch timestamps
+    
+    Builds a followers table with ISO timestamps, times the dashboard reads
+    the old way, then applies the epoch migration and measures the size. The
+    web viewer's reads are timed afterwards on the current schema. Both sides
+    have the same indexes.
+    
+    Args:
+        total: Followers stored, first seen evenly over the last days
+        days: Span of the first_seen values
+        renders: Dashboard reads timed per format
+        
+    Returns:
+        dict: Database bytes and milliseconds per dashboard read by format, and migration seconds
+    """
+    work_dir = tempfile.mkdtemp(prefix='follower-benchmark-')
+    # Must be set before the first DatabaseManager() in this process
+    os.environ['DATABASE_PATH'] = os.path.join(work_dir, 'followers.db')
+    target = 'timestamps'
+    
+    # The pre-epoch schema: ISO strings, migration 2 not yet applied
+    conn = sqlite3.connect(os.environ['DATABASE_PATH'])
+    conn.row_factory = sqlite3.Row
+    setup_schema(conn, 1)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_followers_first_seen ON followers(target_username, first_seen)")
+    conn.execute("DROP INDEX IF EXISTS idx_followers_active_first_seen")
+    start = datetime.now() - timedelta(days=days)
+    step = timedelta(days=days) / total
+    now = datetime.now().isoformat()
+    conn.executemany("""
+        INSERT INTO followers (target_username, display_name, username, first_seen, last_seen)
+        VALUES (?, ?, ?, ?, ?)
+    """, ((target, f"User {i}", f"user{i}", (start + i * step).isoformat(), now) for i in range(total)))
+    conn.executemany("""
+        INSERT INTO scans (target_username, timestamp, total_followers, new_followers, batch_number)
+        VALUES (?, ?, 100, 1, ?)
+    """, ((target, (start + i * 100 * step).isoformat(), i) for i in range(total // 100)))
+    conn.commit()
+    
+    def database_bytes():
+        conn.execute("VACUUM")
+        return os.path.getsize(os.environ['DATABASE_PATH'])
+        
+    results = {}
+    iso_bytes = database_bytes()
+    legacy_dashboard(conn, target)
+    started = time.perf_counter()
+    for _ in range(renders):
+        legacy_dashboard(conn, target)
+    results['iso'] = (iso_bytes, (time.perf_counter() - started) * 1000 / renders)
+    
+    started = time.perf_counter()
+    migrate(conn, 2)
+    results['migration_seconds'] = time.perf_counter() - started
+    
+    epoch_bytes = database_bytes()
+    conn.close()
+    viewer = FollowerWebViewer(target)
+    viewer.get_follower_data(target_username=target)
+    started = time.perf_counter()
+    for _ in range(renders):
+        viewer.get_follower_data(target_username=target)
+        viewer.get_gained_chart(target)
+    results['epoch'] = (epoch_bytes, (time.perf_counter() - started) * 1000 / renders)
+    
+    print(f"\n{total} followers, migration took {results['migration_seconds']:.1f}s")
+    print(f"{'Format':>8}{'DB MB':>10}{'ms/render':>11}")
+    for fmt in ('iso', 'epoch'):
+        size, per_render = results[fmt]
+        print(f"{fmt:>8}{size / 1048576:>10.1f}{per_render:>11.2f}")
+        
+    return results
+    
+def database_objects(conn) -> Dict[str, int]:
+    """Bytes used by each table and index of a database"""
+    cursor = conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")
+    return {name: size for name, size in cursor.fetchall()}
+    
+def benchmark_schema_size(targets: int = 5, followers_per_target: int = 200000, shared: float = 0.5):
+    """Compare table and index sizes before and after normalizing accounts
+    
+    Every target gets the same number of followers; ``shared`` of them are
+    drawn from a pool common to all targets, as with overlapping audiences.
+    
+    Args:
+        targets: Tracked accounts
+        followers_per_target: Followers stored per target
+        shared: Share of each target's followers that follow every target
+        
+    Returns:
+        dict: Database, table and index bytes by schema
+    """
+    work_dir = tempfile.mkdtemp(prefix='follower-benchmark-')
+    path = os.path.join(work_dir, 'followers.db')
+    conn = sqlite3.connect(path)
+    setup_schema(conn, 2)
+    
+    common = int(followers_per_target * shared)
+    now = int(time.time())
+    for t in range(targets):
+        usernames = [f"shared_user{i}" for i in range(common)]
+        usernames += [f"target{t}_user{i}" for i in range(followers_per_target - common)]
+        conn.executemany("""
+            INSERT INTO followers (target_username, display_name, username, first_seen, last_seen)
+            VALUES (?, ?, ?, ?, ?)
+        """, ((f"target{t}", f"Display name of {username}", username, now, now) for username in usernames))
+    conn.commit()
+    
+    results = {}
+    for schema in ('text', 'normalized'):
+        if schema == 'normalized':
+            started = time.perf_counter()
+            migrate(conn)
+            print(f"Migration took {time.perf_counter() - started:.1f}s")
+        conn.execute("VACUUM")
+        objects = database_objects(conn)
+        indexes = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        results[schema] = {
+            'database': os.path.getsize(path),
+            'tables': sum(size for name, size in objects.items() if name not in indexes),
+            'indexes': sum(size for name, size in objects.items() if name in indexes),
+            'objects': objects
+        }
+        
+    print(f"\n{targets} targets x {followers_per_target} followers, {shared:.0%} shared")
+    print(f"{'Schema':>12}{'DB MB':>9}{'Tables MB':>11}{'Indexes MB':>12}")
+    for schema, sizes in results.items():
+        print(f"{schema:>12}{sizes['database'] / 1048576:>9.1f}{sizes['tables'] / 1048576:>11.1f}"
+              f"{sizes['indexes'] / 1048576:>12.1f}")
+    for schema, sizes in results.items():
+        print(f"\n{schema}:")
+        for name, size in sorted(sizes['objects'].items(), key=lambda item: -item[1])[:6]:
+            print(f"    {name:<36}{size / 1048576:>8.1f} MB")
+            
+    return results
+    
+def benchmark_follow_events(total: int = 2000000, accounts: int = 500000, days: int = 90, queries: int = 20):
+    """Time as-of follower sets and interval diffs over a long event log, before and after compaction
+    
+    Accounts follow and unfollow the target at random, evenly over the last
+    days. Only accounts and follow_events are filled, which is all the
+    time-travel queries read.
+    
+    Args:
+        total: Follow and unfollow events
+        accounts: Accounts the events are spread over
+        days: Span of the event times
+        queries: Calls timed per query
+        
+    Returns:
+        dict: Milliseconds per call by query, before and after compaction
+    """
+    work_dir = tempfile.mkdtemp(prefix='follower-benchmark-')
+    os.environ['DATABASE_PATH'] = os.path.join(work_dir, 'followers.db')
+    db = DatabaseManager()
+    target = 'events'
+    
+    rng = random.Random(42)
+    following = bytearray(accounts)
+    now = int(time.time())
+    start = now - days * 86400
+    step = days * 86400 / total
+    
+    def events():
+        for i in range(total):
+            account = rng.randrange(accounts)
+            following[account] ^= 1
+            yield account + 2, following[account], start + int(i * step)
+            
+    conn = db.connect()
+    conn.execute("INSERT INTO accounts (id, username) VALUES (1, ?)", (target,))
+    conn.executemany("INSERT INTO accounts (id, username) VALUES (?, ?)",
+                     ((i + 2, f"user{i}") for i in range(accounts)))
+    conn.executemany("""
+        INSERT INTO follow_events (target_id, account_id, followed, occurred_at) VALUES (1, ?, ?, ?)
+    """, events())
+    conn.commit()
+    conn.close()
+    
+    end = datetime.fromtimestamp(now)
+    calls = {
+        'as-of, 30 days ago': lambda: db.get_followers_as_of(target, end - timedelta(days=30)),
+        'as-of, now': lambda: db.get_followers_as_of(target, end),
+        'changes, last hour': lambda: db.get_follower_changes(target, end - timedelta(hours=1), end),
+        'changes, last day': lambda: db.get_follower_changes(target, end - timedelta(days=1), end),
+        'changes, last week': lambda: db.get_follower_changes(target, end - timedelta(days=7), end)
+    }
+    
+    results = {}
+    for phase in ('raw', 'compacted'):
+        if phase == 'compacted':
+            started = time.perf_counter()
+            compacted = db.compact_follow_events(target, end - timedelta(days=7))
+            print(f"Compaction wrote {compacted['checkpoints']} checkpoints and removed "
+                  f"{compacted['events_removed']} events in {time.perf_counter() - started:.1f}s")
+        results[phase] = {}
+        for name, call in calls.items():
+            rows = call()
+            started = time.perf_counter()
+            for _ in range(queries):
+                call()
+            results[phase][name] = ((time.perf_counter() - started) * 1000 / queries,
+                                    len(rows) if isinstance(rows, list) else sum(len(v) for v in rows.values()))
+            
+    print(f"\n{total} events over {accounts} accounts and {days} days")
+    print(f"{'Query':<22}{'Rows':>9}{'raw ms':>10}{'compacted ms':>14}")
+    for name in calls:
+        print(f"{name:<22}{results['raw'][name][1]:>9}{results['raw'][name][0]:>10.2f}"
+              f"{results['compacted'][name][0]:>14.2f}")
+        
+    return results
+    
+def benchmark_search(total: int = 1000000, queries: int = 20):
+    """Compare the old LIKE filter with the trigram search on one target's followers
+    
+    Args:
+        total: Active followers of the target
+        queries: Calls timed per search term
+        
+    Returns:
+        dict: Matches and milliseconds per page (count included) by term and method
+    """
+    work_dir = tempfile.mkdtemp(prefix='follower-benchmark-')
+    os.environ['DATABASE_PATH'] = os.path.join(work_dir, 'followers.db')
+    db = DatabaseManager()
+    target = 'search'
+    
+    rng = random.Random(42)
+    words = ['alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel', 'india', 'juliet']
+    now = int(time.time())
+    conn = db.connect()
+    conn.execute("INSERT INTO accounts (id, username) VALUES (1, ?)", (target,))
+    conn.executemany("INSERT INTO accounts (id, username, display_name) VALUES (?, ?, ?)", (
+        (i + 2, f"{rng.choice(words)}_{i}", f"{rng.choice(words).title()} {rng.choice(words).title()} {i}")
+        for i in range(total)
+    ))
+    conn.executemany("""
+        INSERT INTO follows (target_id, account_id, first_seen, last_seen) VALUES (1, ?, ?, ?)
+    """, ((i + 2, now - i, now) for i in range(total)))
+    conn.commit()
+    
+    def like_filter(term):
+        # The viewer's filter before the trigram index
+        query = f"""
+            SELECT id, username, display_name,
+                {DISPLAY_TIMESTAMP.format('first_seen')} AS first_seen,
+                {DISPLAY_TIMESTAMP.format('last_seen')} AS last_seen,
+                api_synced as is_synced
+            FROM followers
+            WHERE target_username = ? AND is_active = 1 AND username LIKE ?
+        """
+        total_count = conn.execute(f"SELECT COUNT(*) FROM ({query})", (target, f"%{term}%")).fetchone()[0]
+        conn.execute(f"{query} ORDER BY followers.first_seen DESC LIMIT 25 OFFSET 0", (target, f"%{term}%")).fetchall()
+        return total_count
+        
+    methods = {
+        'like': like_filter,
+        'search': lambda term: db.search_followers(target, term)['total']
+    }
+    terms = ['_123456', '99999', 'hotel_7', '@juliet_42', 'Foxtrot Golf', 'ab']
+    
+    results = {}
+    for term in terms:
+        results[term] = {}
+        for method, call in methods.items():
+            matches = call(term)
+            started = time.perf_counter()
+            for _ in range(queries):
+                call(term)
+            results[term][method] = (matches, (time.perf_counter() - started) * 1000 / queries)
+            
+    print(f"\n{total} followers")
+    print(f"{'Term':<16}{'LIKE matches':>14}{'LIKE ms':>10}{'Search matches':>16}{'Search ms':>11}")
+    for term in terms:
+        like, search = results[term]['like'], results[term]['search']
+        print(f"{term:<16}{like[0]:>14}{like[1]:>10.2f}{search[0]:>16}{search[1]:>11.2f}")
+        
+    return results
+    
+def benchmark_sync_ack(total: int = 10000, batch_sizes=(1, 50, 1000, 10000)):
+    """Time marking followers as synced, one commit per follower vs batched acknowledgements
+    
+    Args:
+        total: Unsynced followers acknowledged per run
+        batch_sizes: Followers per mark_followers_synced call; 1 uses mark_follower_synced
+        
+    Returns:
+        dict: Acknowledgements per second by batch size
+    """
+    work_dir = tempfile.mkdtemp(prefix='follower-benchmark-')
+    os.environ['DATABASE_PATH'] = os.path.join(work_dir, 'followers.db')
+    db = DatabaseManager()
+    results = {}
+    
+    for batch_size in batch_sizes:
+        target = f"sync_{batch_size}"
+        db.add_followers(target, [
+            {'display_name': f"User {i}", 'username': f"{target}_user{i}"} for i in range(total)
+        ], 1)
+        follower_ids = [follower['id'] for follower in db.get_unsynced_followers(target)]
+        
+        started = time.perf_counter()
+        if batch_size == 1:
+            for follower_id in follower_ids:
+                db.mark_follower_synced(follower_id)
+        else:
+            for i in range(0, len(follower_ids), batch_size):
+                db.mark_followers_synced(follower_ids[i:i + batch_size])
+        elapsed = time.perf_counter() - started
+        
+        assert not db.get_unsynced_followers(target)
+        results[batch_size] = len(follower_ids) / elapsed
+        
+    print(f"\n{total} followers acknowledged")
+    print(f"{'Batch':>8}{'Commits':>9}{'rows/s':>12}{'Total ms':>10}")
+    for batch_size, rate in results.items():
+        print(f"{batch_size:>8}{-(-total // batch_size):>9}{rate:>12,.0f}{total / rate * 1000:>10.0f}")
+        
+    return results
+    
+def benchmark_export(sizes=(1000, 100000, 1000000), formats=('csv', 'jsonl')):
+    """Time to first byte, throughput and peak Python memory of follower exports
+    
+    get_all_followers, which builds every row as a dict, is measured alongside
+    for comparison.
+    
+    Args:
+        sizes: Followers of each target exported
+        formats: Export formats measured
+        
+    Returns:
+        dict: Seconds to first chunk, total seconds and peak bytes by size and method
+    """
+    work_dir = tempfile.mkdtemp(prefix='follower-benchmark-')
+    os.environ['DATABASE_PATH'] = os.path.join(work_dir, 'followers.db')
+    db = DatabaseManager()
+    
+    conn = db.connect()
+    now = int(time.time())
+    next_id = 1
+    for total in sizes:
+        target_id = next_id
+        conn.execute("INSERT INTO accounts (id, username) VALUES (?, ?)", (target_id, f"export_{total}"))
+        conn.executemany("INSERT INTO accounts (id, username, display_name) VALUES (?, ?, ?)", (
+            (target_id + 1 + i, f"export_{total}_user{i}", f"User {i}") for i in range(total)
+        ))
+        conn.executemany("""
+            INSERT INTO follows (target_id, account_id, first_seen, last_seen) VALUES (?, ?, ?, ?)
+        """, ((target_id, target_id + 1 + i, now - total + i, now) for i in range(total)))
+        next_id += total + 1
+    conn.commit()
+    conn.close()
+    
+    def run(method, target):
+        tracemalloc.start()
+        started = time.perf_counter()
+        first = None
+        if method == 'get_all_followers':
+            db.get_all_followers(target)
+            first = time.perf_counter() - started
+        else:
+            for _ in export(db, 'followers', method, target):
+                if first is None:
+                    first = time.perf_counter() - started
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return first, elapsed, peak
+        
+    results = {}
+    for total in sizes:
+        for method in formats + ('get_all_followers',):
+            results[(total, method)] = run(method, f"export_{total}")
+            
+    print(f"{'Followers':>10}{'Method':>19}{'First chunk ms':>16}{'Total s':>9}{'rows/s':>11}{'Peak MB':>9}")
+    for (total, method), (first, elapsed, peak) in results.items():
+        print(f"{total:>10}{method:>19}{first * 1000:>16.1f}{elapsed:>9.2f}{total / elapsed:>11,.0f}"
+              f"{peak / 1048576:>9.1f}")
+        
+    return results
+    
+def benchmark_import(total: int = 1000000, chunk_sizes=(1000, 10000, 50000)):
+    """Wall time of importing a CSV follower list into an empty database
+    
+    Args:
+        total: Followers in the generated CSV
+        chunk_sizes: Followers written per transaction
+        
+    Returns:
+        dict: Seconds by chunk size
+    """
+    work_dir = tempfile.mkdtemp(prefix='follower-benchmark-')
+    os.environ['DATABASE_PATH'] = os.path.join(work_dir, 'followers.db')
+    db = DatabaseManager()
+    path = os.path.join(work_dir, 'followers.csv')
+    started = int(time.time()) - total
+    
+    results = {}
+    for chunk_size in chunk_sizes:
+        # Fresh handles for every run, so each one creates all of its accounts
+        with open(path, 'w', encoding='utf-8') as csv_file:
+            csv_file.write("username,display_name,first_seen\n")
+            for i in range(total):
+                csv_file.write(f"import_{chunk_size}_user{i},User {i},{started + i}\n")
+                
+        begin = time.perf_counter()
+        result = import_followers(db, f"import_{chunk_size}", path, chunk_size=chunk_size)
+        results[chunk_size] = time.perf_counter() - begin
+        if result['added'] != total:
+            print(f"Warning: imported {result['added']} of {total} followers")
+            
+    print(f"{'Chunk size':>10}{'Seconds':>9}{'rows/s':>11}")
+    for chunk_size, elapsed in results.items():
+        print(f"{chunk_size:>10}{elapsed:>9.2f}{total / elapsed:>11,.0f}")
+        
+    return results
+    
+def main():
+    load_dotenv()
+    
+    parser = argparse.ArgumentParser(description="Follower tracker benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+    
+    extraction = subparsers.add_parser('extraction', help="Round trips and wall time per 1,000 followers by extraction mode")
+    extraction.add_argument('--target', default=os.getenv('TARGET_USERNAME'))
+    extraction.add_argument('--steps', type=int, default=30)
+    
+    subparsers.add_parser('scan-index', help="Per-cell dedup cost on synthetic cell streams")
+    
+    subparsers.add_parser('follower-index', help="Load time, memory and lookup cost per follower index mode")
+    
+    schema_size = subparsers.add_parser('schema-size', help="Table and index sizes before and after normalizing accounts")
+    schema_size.add_argument('--targets', type=int, default=5)
+    schema_size.add_argument('--followers', type=int, default=200000, help="Followers per target")
+    schema_size.add_argument('--shared', type=float, default=0.5, help="Share of followers common to all targets")
+    
+    timestamps = subparsers.add_parser('timestamps', help="Database size and dashboard reads with ISO vs epoch timestamps")
+    timestamps.add_argument('--followers', type=int, default=1000000)
+    
+    events = subparsers.add_parser('follow-events', help="As-of and interval queries over the follow event log")
+    events.add_argument('--events', type=int, default=2000000)
+    events.add_argument('--accounts', type=int, default=500000)
+    
+    search = subparsers.add_parser('search', help="Follower filter cost with LIKE vs the trigram index")
+    search.add_argument('--followers', type=int, default=1000000)
+    
+    sync_ack = subparsers.add_parser('sync-ack', help="Synced-follower acknowledgements per second, per row vs batched")
+    sync_ack.add_argument('--followers', type=int, default=10000)
+    
+    subparsers.add_parser('export', help="Streaming follower export memory and throughput by size")
+    
+    importer = subparsers.add_parser('import', help="Bulk CSV import wall time by chunk size")
+    importer.add_argument('--rows', type=int, default=1000000)
+    
+    bulk = subparsers.add_parser('bulk-insert', help="add_followers batch cost as the followers table grows")
+    bulk.add_argument('--batches', type=int, default=20)
+    bulk.add_argument('--batch-size', type=int, default=100)
+    
+    simulated = subparsers.add_parser('simulated-scan', help="End-to-end scans against the offline follower simulator")
+    simulated.add_argument('--followers', type=int, default=2000)
+    simulated.add_argument('--latency', type=int, default=100, help="Milliseconds added to every API response")
+    simulated.add_argument('--modes', default=','.join(EXTRACTION_MODES))
+    simulated.add_argument('--pacing', default='adaptive')
+    
+    args = parser.parse_args()
+    
+    if args.benchmark == 'extraction':
+        if not args.target:
+            print("Error: pass --target or set TARGET_USERNAME in .env file")
+            return
+        benchmark_extraction(args.target, args.steps)
+    elif args.benchmark == 'scan-index':
+        benchmark_scan_index()
+    elif args.benchmark == 'follower-index':
+        benchmark_follower_index()
+    elif args.benchmark == 'schema-size':
+        benchmark_schema_size(args.targets, args.followers, args.shared)
+    elif args.benchmark == 'timestamps':
+        benchmark_timestamps(args.followers)
+    elif args.benchmark == 'follow-events':
+        benchmark_follow_events(args.events, args.accounts)
+    elif args.benchmark == 'search':
+        benchmark_search(args.followers)
+    elif args.benchmark == 'sync-ack':
+        benchmark_sync_ack(args.followers)
+    elif args.benchmark == 'export':
+        benchmark_export()
+    elif args.benchmark == 'import':
+        benchmark_import(args.rows)
+    elif args.benchmark == 'bulk-insert':
+        benchmark_bulk_insert(batches=args.batches, batch_size=args.batch_size)
+    elif args.benchmark == 'simulated-scan':
+        benchmark_simulated_scan(args.followers, args.latency, args.modes.split(','), args.pacing)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+import time
+import shutil
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, Any
+from selenium import webdriver
+
+# Files Chrome holds while a profile directory is in use
+PROFILE_LOCK_FILES = ('SingletonLock', 'lockfile')
+
+class ProfileLock:
+    """Tracks which browser session owns a Chrome profile directory
+    
+    Chrome refuses to open a profile that another Chrome instance is using,
+    so sessions on the same profile have to hand it over: the current owner
+    quits and Chrome's lock files are gone before the next owner starts.
+    """
+    
+    _locks = {}
+    _registry_lock = threading.Lock()
+    
+    @classmethod
+    def for_profile(cls, profile_dir: str) -> 'ProfileLock':
+        key = str(Path(profile_dir).absolute())
+        with cls._registry_lock:
+            if key not in cls._locks:
+                cls._locks[key] = cls(key)
+            return cls._locks[key]
+            
+    def __init__(self, profile_dir: str):
+        self.profile_dir = profile_dir
+        self.owner = None
+        self._lock = threading.Lock()
+        
+    def acquire(self, session: 'BrowserSession', take_over: bool = False, timeout: float = 15) -> bool:
+        """Claim the profile for a session
+        
+        Args:
+            session: Session that wants to start Chrome on this profile
+            take_over: Close the current owner instead of giving up
+            timeout: Seconds to wait for Chrome to release its lock files
+            
+        Returns:
+            bool: True if the session owns the profile
+        """
+        with self._lock:
+            current = self.owner
+            if current is session:
+                return True
+            if current is not None and not take_over:
+                return False
+            self.owner = session
+            
+        if current is not None:
+            print(f"Handing browser profile over from {current.name} to {session.name}...")
+            current.close(release=False)
+            self.wait_released(timeout)
+        return True
+        
+    def wait_released(self, timeout: float = 15) -> bool:
+        """Wait for a quitting Chrome process to remove its profile lock files"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if not self.chrome_running():
+                return True
+            time.sleep(0.25)
+        return False
+        
+    def chrome_running(self) -> bool:
+        """Whether Chrome's lock files are present, from this process or another one"""
+        # SingletonLock is a symlink to a host-pid name, so check the link itself
+        return any(
+            (Path(self.profile_dir) / name).is_symlink() or (Path(self.profile_dir) / name).exists()
+            for name in PROFILE_LOCK_FILES
+        )
+        
+    def copy_to(self, destination: str, ignore=None) -> bool:
+        """Copy the profile while no browser holds it
+        
+        No session can acquire the profile until the copy is done. The copy is
+        made next to the destination and swapped in, so a failed copy leaves
+        the previous one in place.
+        
+        Args:
+            destination: Directory replaced by the copy
+            ignore: Passed to shutil.copytree
+            
+        Returns:
+            bool: False if a browser holds the profile and nothing was copied
+        """
+        with self._lock:
+            if self.owner is not None or self.chrome_running():
+                return False
+                
+            destination = Path(destination)
+            staging = destination.with_name(destination.name + '.copying')
+            shutil.rmtree(staging, ignore_errors=True)
+            shutil.copytree(self.profile_dir, staging, ignore=ignore)
+            shutil.rmtree(destination, ignore_errors=True)
+            staging.rename(destination)
+            return True
+            
+    def release(self, session: 'BrowserSession'):
+        with self._lock:
+            if self.owner is session:
+                self.owner = None
+
+class BrowserSession:
+    """Long-lived Chrome session with liveness probes and bounded restarts
+    
+    Errors are first handled by a soft recovery (close stray tabs and reset
+    the remaining one); Chrome is only restarted when the browser stops
+    answering, and at most ``max_restarts`` times per ``restart_window``.
+    """
+    
+    def __init__(self, name: str, profile_dir: str, build_options: Callable, on_start: Callable = None,
+                 max_restarts: int = 5, restart_window: int = 3600, take_over_profile: bool = True):
+        """Initialize the browser session
+        
+        Args:
+            name: Label used in logs and metrics
+            profile_dir: Chrome user data directory
+            build_options: Returns the ChromeOptions for a new browser
+            on_start: Called with the new driver after every (re)start
+            max_restarts: Hard restarts allowed within the restart window
+            restart_window: Seconds over which restarts are counted
+            take_over_profile: Close another session holding the profile instead of failing
+        """
+        self.name = name
+        self.profile_dir = profile_dir
+        self.build_options = build_options
+        self.on_start = on_start
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self.take_over_profile = take_over_profile
+        self.driver = None
+        self.profile_lock = ProfileLock.for_profile(profile_dir)
+        
+        self.starts = 0
+        self.restarts = 0
+        self.soft_recoveries = 0
+        self.failed_probes = 0
+        self.cold_start_ms = deque(maxlen=20)
+        self._restart_times = deque()
+        
+    def start(self) -> bool:
+        """Start Chrome on the profile, handing it over from another session if needed"""
+        if self.driver:
+            return True
+            
+        if not self.profile_lock.acquire(self, take_over=self.take_over_profile):
+            print(f"[{self.name}] Browser profile is in use by {self.profile_lock.owner.name}")
+            return False
+            
+        try:
+            started = time.time()
+            self.driver = webdriver.Chrome(options=self.build_options())
+            if self.on_start:
+                self.on_start(self.driver)
+            self.cold_start_ms.append(int((time.time() - started) * 1000))
+            self.starts += 1
+            return True
+            
+        except Exception as e:
+            print(f"[{self.name}] Error starting browser: {str(e)}")
+            self.close()
+            return False
+            
+    def is_alive(self, timeout: float = 10) -> bool:
+        """Probe the browser with a trivial script, giving up after a timeout"""
+        if not self.driver:
+            return False
+            
+        result = {}
+        driver = self.driver
+        
+        def probe():
+            try:
+                result['state'] = driver.execute_script("return document.readyState")
+            except Exception as e:
+                result['error'] = e
+                
+        probe_thread = threading.Thread(target=probe)
+        probe_thread.daemon = True
+        probe_thread.start()
+        probe_thread.join(timeout)
+        
+        if 'state' not in result:
+            self.failed_probes += 1
+            return False
+        return True
+        
+    def soft_reset(self) -> bool:
+        """Close extra tabs and reset the remaining one without restarting Chrome"""
+        try:
+            handles = self.driver.window_handles
+            for handle in handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(handles[0])
+            self.driver.get("about:blank")
+            return self.is_alive()
+            
+        except Exception as e:
+            print(f"[{self.name}] Soft reset failed: {str(e)}")
+            return False
+            
+    def restart(self) -> bool:
+        """Restart Chrome if the restart budget allows it"""
+        now = time.time()
+        while self._restart_times and now - self._restart_times[0] > self.restart_window:
+            self._restart_times.popleft()
+            
+        if len(self._restart_times) >= self.max_restarts:
+            print(f"[{self.name}] Restart budget exhausted "
+                  f"({self.max_restarts} restarts in {self.restart_window // 60} minutes)")
+            return False
+            
+        self._restart_times.append(now)
+        self.restarts += 1
+        self.close(release=False)
+        self.profile_lock.wait_released()
+        return self.start()
+        
+    def recover(self) -> bool:
+        """Bring the session back after an error
+        
+        Returns:
+            bool: True if the browser is usable again
+        """
+        if self.is_alive() and self.soft_reset():
+            self.soft_recoveries += 1
+            print(f"[{self.name}] Recovered browser session without restart")
+            return True
+            
+        print(f"[{self.name}] Browser is not responding, restarting...")
+        return self.restart()
+        
+    def close(self, release: bool = True):
+        """Quit Chrome and optionally give up the profile"""
+        driver, self.driver = self.driver, None
+        if driver:
+            try:
+                driver.quit()
+            except:
+                pass
+        if release:
+            self.profile_lock.release(self)
+            
+    def metrics(self) -> Dict[str, Any]:
+        """Get restart counters and cold-start latency"""
+        return {
+            'name': self.name,
+            'running': self.driver is not None,
+            'starts': self.starts,
+            'restarts': self.restarts,
+            'soft_recoveries': self.soft_recoveries,
+            'failed_probes': self.failed_probes,
+            'last_cold_start_ms': self.cold_start_ms[-1] if self.cold_start_ms else None,
+            'avg_cold_start_ms': int(sum(self.cold_start_ms) / len(self.cold_start_ms)) if self.cold_start_ms else None
+        }
@@ -1,9 +1,734 @@
+import os
+import json
+import time
 import sqlite3
+import sys
 import threading
-from datetime import datetime
+from collections import Counter
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Any
+from follower_index import FollowerIndex
+from db_writer import DatabaseWriter
 
+# Applied to every connection; WAL lets readers run while the writer commits
+CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout = 10000",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000"
+)
+
+# Columns of scan_metrics written by record_scan_metrics
+SCAN_METRIC_COLUMNS = (
+    'target_username', 'started_at', 'duration_ms', 'scan_type', 'extraction_mode', 'pacing', 'lean',
+    'driver_setup_ms', 'login_check_ms', 'navigation_ms', 'scroll_ms', 'extraction_ms', 'database_ms', 'sleep_ms',
+    'steps', 'webdriver_calls', 'followers_seen', 'new_followers', 'followers_per_sec',
+    'bytes_transferred', 'js_heap_bytes', 'dom_nodes', 'error'
+)
+
+# Follower and scan timestamps are stored as integer epoch seconds and only
+# converted to text at the edges: ISO_TIMESTAMP for API payloads and exports,
+# DISPLAY_TIMESTAMP for the web viewer
+ISO_TIMESTAMP = "strftime('%Y-%m-%dT%H:%M:%S', {}, 'unixepoch', 'localtime')"
+DISPLAY_TIMESTAMP = "datetime({}, 'unixepoch', 'localtime')"
+
+def iso_to_epoch(value):
+    """Convert a stored ISO timestamp to epoch seconds, leaving numbers unchanged"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return int(datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp())
+
+def convert_timestamps_to_epoch(conn: sqlite3.Connection):
+    """Rewrite ISO follower and scan timestamps as epoch seconds"""
+    # Naive timestamps were written with datetime.now(), so they are read as local time
+    conn.create_function('iso_to_epoch', 1, iso_to_epoch, deterministic=True)
+    conn.execute("""
+        UPDATE followers
+        SET first_seen = iso_to_epoch(first_seen), last_seen = iso_to_epoch(last_seen)
+        WHERE typeof(first_seen) = 'text' OR typeof(last_seen) = 'text'
+    """)
+    conn.execute("""
+        UPDATE scans SET timestamp = iso_to_epoch(timestamp) WHERE typeof(timestamp) = 'text'
+    """)
+
+def normalize_accounts(conn: sqlite3.Connection):
+    """Move followers into accounts and follows, leaving a followers view behind"""
+    conn.execute("""
+        CREATE TABLE accounts (
+            id INTEGER PRIMARY KEY,
+            username TEXT NOT NULL UNIQUE,
+            display_name TEXT
+        )
+    """)
+    # One row per (target, follower) pair; ids are kept so API sync state carries over
+    conn.execute("""
+        CREATE TABLE follows (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            target_id INTEGER NOT NULL REFERENCES accounts(id),
+            account_id INTEGER NOT NULL REFERENCES accounts(id),
+            first_seen INTEGER NOT NULL,
+            last_seen INTEGER NOT NULL,
+            is_active INTEGER NOT NULL DEFAULT 1,
+            api_synced INTEGER NOT NULL DEFAULT 0,
+            UNIQUE(target_id, account_id)
+        )
+    """)
+    
+    # The most recently seen display name of each account wins
+    conn.execute("""
+        INSERT INTO accounts (username, display_name)
+        SELECT username, display_name FROM followers WHERE true ORDER BY last_seen
+        ON CONFLICT(username) DO UPDATE SET display_name = excluded.display_name
+    """)
+    conn.execute("""
+        INSERT OR IGNORE INTO accounts (username) SELECT DISTINCT target_username FROM followers
+    """)
+    conn.execute("""
+        INSERT INTO follows (id, target_id, account_id, first_seen, last_seen, is_active, api_synced)
+        SELECT f.id, t.id, a.id, f.first_seen, f.last_seen, f.is_active, f.api_synced
+        FROM followers f
+        JOIN accounts t ON t.username = f.target_username
+        JOIN accounts a ON a.username = f.username
+    """)
+    conn.execute("DROP TABLE followers")
+    
+    conn.execute("""
+        CREATE INDEX idx_follows_first_seen ON follows(target_id, first_seen)
+    """)
+    conn.execute("""
+        CREATE INDEX idx_follows_unsynced ON follows(target_id, account_id, first_seen, api_synced, is_active)
+        WHERE api_synced = 0 AND is_active = 1
+    """)
+    
+    # Reads keep using the old followers columns
+    conn.execute("""
+        CREATE VIEW followers AS
+        SELECT f.id, t.username AS target_username, a.display_name, a.username,
+            f.first_seen, f.last_seen, f.is_active, f.api_synced
+        FROM follows f
+        JOIN accounts t ON t.id = f.target_id
+        JOIN accounts a ON a.id = f.account_id
+    """)
+    
+    # Writes through the view, for scripts written against the old table
+    conn.execute("""
+        CREATE TRIGGER followers_insert INSTEAD OF INSERT ON followers
+        BEGIN
+            INSERT OR IGNORE INTO accounts (username) VALUES (NEW.target_username);
+            INSERT INTO accounts (username, display_name) VALUES (NEW.username, NEW.display_name)
+            ON CONFLICT(username) DO UPDATE SET display_name = excluded.display_name;
+            INSERT INTO follows (target_id, account_id, first_seen, last_seen, is_active, api_synced)
+            VALUES (
+                (SELECT id FROM accounts WHERE username = NEW.target_username),
+                (SELECT id FROM accounts WHERE username = NEW.username),
+                NEW.first_seen, NEW.last_seen, COALESCE(NEW.is_active, 1), COALESCE(NEW.api_synced, 0)
+            );
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER followers_update INSTEAD OF UPDATE ON followers
+        BEGIN
+            UPDATE follows
+            SET first_seen = NEW.first_seen, last_seen = NEW.last_seen,
+                is_active = NEW.is_active, api_synced = NEW.api_synced
+            WHERE id = OLD.id;
+            UPDATE accounts SET display_name = NEW.display_name
+            WHERE username = OLD.username AND NEW.display_name IS NOT OLD.display_name;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER followers_delete INSTEAD OF DELETE ON followers
+        BEGIN
+            DELETE FROM follows WHERE id = OLD.id;
+        END
+    """)
+
+def create_follow_events(conn: sqlite3.Connection):
+    """Create the follow event log and seed it from the current follows"""
+    # Append-only: one row per follow (followed = 1) or unfollow (followed = 0)
+    conn.execute("""
+        CREATE TABLE follow_events (
+            id INTEGER PRIMARY KEY,
+            target_id INTEGER NOT NULL REFERENCES accounts(id),
+            account_id INTEGER NOT NULL REFERENCES accounts(id),
+            followed INTEGER NOT NULL,
+            occurred_at INTEGER NOT NULL
+        )
+    """)
+    # Follower set of a target at taken_at, written when older events are compacted
+    conn.execute("""
+        CREATE TABLE follow_checkpoints (
+            target_id INTEGER NOT NULL REFERENCES accounts(id),
+            taken_at INTEGER NOT NULL,
+            account_id INTEGER NOT NULL REFERENCES accounts(id),
+            PRIMARY KEY (target_id, taken_at, account_id)
+        ) WITHOUT ROWID
+    """)
+    
+    # Best known history: followed when first seen, gone after last seen
+    conn.execute("""
+        INSERT INTO follow_events (target_id, account_id, followed, occurred_at)
+        SELECT target_id, account_id, followed, occurred_at FROM (
+            SELECT target_id, account_id, 1 AS followed, first_seen AS occurred_at FROM follows
+            UNION ALL
+            SELECT target_id, account_id, 0, last_seen FROM follows WHERE is_active = 0
+        )
+        ORDER BY occurred_at, followed DESC
+    """)
+    
+    # Changes in a time range, and the latest event of one account before a point in time
+    conn.execute("""
+        CREATE INDEX idx_follow_events_time ON follow_events(target_id, occurred_at, account_id, followed)
+    """)
+    conn.execute("""
+        CREATE INDEX idx_follow_events_account ON follow_events(target_id, account_id, occurred_at)
+    """)
+    
+    # Writes through the followers view are logged as well
+    conn.execute("DROP TRIGGER followers_insert")
+    conn.execute("""
+        CREATE TRIGGER followers_insert INSTEAD OF INSERT ON followers
+        BEGIN
+            INSERT OR IGNORE INTO accounts (username) VALUES (NEW.target_username);
+            INSERT INTO accounts (username, display_name) VALUES (NEW.username, NEW.display_name)
+            ON CONFLICT(username) DO UPDATE SET display_name = excluded.display_name;
+            INSERT INTO follows (target_id, account_id, first_seen, last_seen, is_active, api_synced)
+            VALUES (
+                (SELECT id FROM accounts WHERE username = NEW.target_username),
+                (SELECT id FROM accounts WHERE username = NEW.username),
+                NEW.first_seen, NEW.last_seen, COALESCE(NEW.is_active, 1), COALESCE(NEW.api_synced, 0)
+            );
+            INSERT INTO follow_events (target_id, account_id, followed, occurred_at)
+            SELECT target_id, account_id, 1, first_seen FROM follows WHERE id = last_insert_rowid();
+        END
+    """)
+    conn.execute("DROP TRIGGER followers_update")
+    conn.execute("""
+        CREATE TRIGGER followers_update INSTEAD OF UPDATE ON followers
+        BEGIN
+            UPDATE follows
+            SET first_seen = NEW.first_seen, last_seen = NEW.last_seen,
+                is_active = NEW.is_active, api_synced = NEW.api_synced
+            WHERE id = OLD.id;
+            UPDATE accounts SET display_name = NEW.display_name
+            WHERE username = OLD.username AND NEW.display_name IS NOT OLD.display_name;
+            INSERT INTO follow_events (target_id, account_id, followed, occurred_at)
+            SELECT target_id, account_id, NEW.is_active, CAST(strftime('%s', 'now') AS INTEGER)
+            FROM follows WHERE id = OLD.id AND NEW.is_active IS NOT OLD.is_active;
+        END
+    """)
+
+# The latest event of every account with events in a time range, as a CTE named
+# changes. Latest means last by occurred_at, then by id: backfilled events, such
+# as imports, get higher ids than live events that happened after them.
+# Parameters: target_id, range start (exclusive), range end.
+LATEST_FOLLOW_EVENTS = """
+    latest AS (
+        SELECT target_id, account_id, MAX(occurred_at) AS occurred_at
+        FROM follow_events INDEXED BY idx_follow_events_time
+        WHERE target_id = ? AND occurred_at > ? AND occurred_at <= ?
+        GROUP BY account_id
+    ),
+    changes AS (
+        SELECT account_id, (
+            SELECT e.followed FROM follow_events e
+            WHERE e.target_id = latest.target_id AND e.account_id = latest.account_id
+            AND e.occurred_at = latest.occurred_at
+            ORDER BY e.id DESC LIMIT 1
+        ) AS followed
+        FROM latest
+    )
+"""
+
+# Account ids following a target at a point in time: the latest checkpoint at or
+# before it, with the latest event of every account changed since applied on top.
+# Parameters: target_id, checkpoint, at, target_id, checkpoint (-1 without a checkpoint).
+FOLLOWER_SET_AS_OF = f"""
+    WITH {LATEST_FOLLOW_EVENTS}
+    SELECT account_id FROM follow_checkpoints
+    WHERE target_id = ? AND taken_at = ?
+    AND account_id NOT IN (SELECT account_id FROM changes)
+    UNION ALL
+    SELECT account_id FROM changes WHERE followed = 1
+"""
+
+# Rollup granularities kept in follower_stats, in seconds
+STAT_PERIODS = (3600, 86400)
+
+def stat_bucket(at: int, period: int, offsets: Dict[int, int] = None) -> int:
+    """Start of the local-time hour or day containing an epoch timestamp
+    
+    Args:
+        at: Epoch seconds
+        period: Bucket length, one of STAT_PERIODS
+        offsets: Cache of UTC offsets per quarter hour, for bucketing many timestamps
+    """
+    if offsets is None:
+        offset = time.localtime(at).tm_gmtoff
+    else:
+        # UTC offsets only change on a quarter hour
+        offset = offsets.get(at // 900)
+        if offset is None:
+            offset = offsets[at // 900] = time.localtime(at).tm_gmtoff
+    return (at + offset) // period * period - offset
+    
+def rebuild_follower_stats(conn: sqlite3.Connection, target_ids: List[int] = None):
+    """Recompute the hourly and daily rollups of targets from follows and follow_events
+    
+    Buckets before the last follow checkpoint of a target are kept, since
+    compaction removed the events they were built from. Sync time is not
+    stored, so synced followers are counted in the bucket they were first seen.
+    
+    Args:
+        conn: Connection to write through
+        target_ids: Targets to rebuild, None for every target with followers
+    """
+    if target_ids is None:
+        target_ids = [row[0] for row in conn.execute("SELECT DISTINCT target_id FROM follows")]
+    # Bucket with each timestamp's own UTC offset, as the live rollups do, so
+    # both agree across daylight saving changes
+    offsets = {}
+    conn.create_function('stat_bucket', 2, lambda at, period: stat_bucket(at, period, offsets), deterministic=True)
+    
+    for target_id in target_ids:
+        checkpoint = conn.execute("""
+            SELECT COALESCE(MAX(taken_at), -1) FROM follow_checkpoints WHERE target_id = ?
+        """, (target_id,)).fetchone()[0]
+        
+        for period in STAT_PERIODS:
+            # First whole bucket after the checkpoint, and the followers at its start
+            start, active = 0, 0
+            if checkpoint >= 0:
+                start = stat_bucket(checkpoint, period) + period
+                active = conn.execute(f"SELECT COUNT(*) FROM ({FOLLOWER_SET_AS_OF})", (
+                    target_id, checkpoint, start - 1, target_id, checkpoint
+                )).fetchone()[0]
+                
+            conn.execute("""
+                DELETE FROM follower_stats WHERE target_id = ? AND period = ? AND bucket >= ?
+            """, (target_id, period, start))
+            conn.execute("""
+                INSERT INTO follower_stats (
+                    target_id, period, bucket, new_followers, refollowers, unfollowers, synced, active
+                )
+                SELECT :target_id, :period, bucket, new_followers, MAX(follows - new_followers, 0), unfollowers,
+                    synced, :active + SUM(follows - unfollowers) OVER (ORDER BY bucket)
+                FROM (
+                    SELECT bucket, SUM(new_followers) AS new_followers, SUM(follows) AS follows,
+                        SUM(unfollowers) AS unfollowers, SUM(synced) AS synced
+                    FROM (
+                        SELECT stat_bucket(occurred_at, :period) AS bucket,
+                            0 AS new_followers, followed AS follows, 1 - followed AS unfollowers, 0 AS synced
+                        FROM follow_events WHERE target_id = :target_id AND occurred_at >= :start
+                        UNION ALL
+                        SELECT stat_bucket(first_seen, :period), 1, 0, 0, api_synced
+                        FROM follows WHERE target_id = :target_id AND first_seen >= :start
+                    )
+                    GROUP BY bucket
+                )
+            """, {
+                'target_id': target_id, 'period': period, 'start': start, 'active': active
+            })
+            
+def create_follower_stats(conn: sqlite3.Connection):
+    """Create the hourly and daily follower rollups and fill them from the existing history"""
+    # Per target and local-time hour or day: changes within it and active followers at its end
+    conn.execute("""
+        CREATE TABLE follower_stats (
+            id INTEGER PRIMARY KEY,
+            target_id INTEGER NOT NULL REFERENCES accounts(id),
+            period INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            new_followers INTEGER NOT NULL DEFAULT 0,
+            refollowers INTEGER NOT NULL DEFAULT 0,
+            unfollowers INTEGER NOT NULL DEFAULT 0,
+            synced INTEGER NOT NULL DEFAULT 0,
+            active INTEGER NOT NULL DEFAULT 0,
+            UNIQUE(target_id, period, bucket)
+        )
+    """)
+    rebuild_follower_stats(conn)
+    
+def create_account_search(conn: sqlite3.Connection):
+    """Index usernames and display names for substring search, kept in sync by triggers"""
+    # External content: the index stores trigrams only, the text stays in accounts
+    conn.execute("""
+        CREATE VIRTUAL TABLE accounts_fts USING fts5(
+            username, display_name, content='accounts', content_rowid='id', tokenize='trigram'
+        )
+    """)
+    conn.execute("INSERT INTO accounts_fts (accounts_fts) VALUES ('rebuild')")
+    conn.execute("""
+        CREATE TRIGGER accounts_fts_insert AFTER INSERT ON accounts
+        BEGIN
+            INSERT INTO accounts_fts (rowid, username, display_name)
+            VALUES (NEW.id, NEW.username, NEW.display_name);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER accounts_fts_delete AFTER DELETE ON accounts
+        BEGIN
+            INSERT INTO accounts_fts (accounts_fts, rowid, username, display_name)
+            VALUES ('delete', OLD.id, OLD.username, OLD.display_name);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER accounts_fts_update AFTER UPDATE OF username, display_name ON accounts
+        BEGIN
+            INSERT INTO accounts_fts (accounts_fts, rowid, username, display_name)
+            VALUES ('delete', OLD.id, OLD.username, OLD.display_name);
+            INSERT INTO accounts_fts (rowid, username, display_name)
+            VALUES (NEW.id, NEW.username, NEW.display_name);
+        END
+    """)
+    
+# Schema changes applied in order on top of the tables created by setup_database.
+# Each step is SQL or a function taking the connection; append new versions, never edit old ones.
+MIGRATIONS = (
+    (1, "Indexes for the follower list, API sync, scan history and sweep lookups", (
+        # Viewer follower list: active followers of a target, newest first
+        """
+        CREATE INDEX IF NOT EXISTS idx_followers_active_first_seen
+        ON followers(target_username, first_seen) WHERE is_active = 1
+        """,
+        # API sync: the few unsynced active followers, without touching the table
+        """
+        CREATE INDEX IF NOT EXISTS idx_followers_unsynced
+        ON followers(target_username, username, display_name, first_seen, api_synced, is_active)
+        WHERE api_synced = 0 AND is_active = 1
+        """,
+        # Recent scans list and new follower rate, without touching the table
+        """
+        CREATE INDEX IF NOT EXISTS idx_scans_target_timestamp
+        ON scans(target_username, timestamp, new_followers, total_followers, batch_number)
+        """,
+        # Last finished sweep (walked backwards in id order) and the rate baseline
+        """
+        CREATE INDEX IF NOT EXISTS idx_scan_generations_target
+        ON scan_generations(target_username, mode)
+        """
+    )),
+    (2, "Store follower and scan timestamps as epoch seconds", (
+        convert_timestamps_to_epoch,
+        # Followers gained per hour/day, active or not. It also serves the
+        # follower list, which makes the partial index of migration 1 redundant.
+        """
+        CREATE INDEX IF NOT EXISTS idx_followers_first_seen
+        ON followers(target_username, first_seen)
+        """,
+        "DROP INDEX IF EXISTS idx_followers_active_first_seen"
+    )),
+    (3, "Normalize followers into accounts and follows", (
+        normalize_accounts,
+    )),
+    (4, "Append-only follow event log with checkpoints", (
+        create_follow_events,
+    )),
+    (5, "Hourly and daily follower rollups", (
+        create_follower_stats,
+    )),
+    (6, "Trigram search over usernames and display names", (
+        create_account_search,
+    )),
+    (7, "Flag followers loaded by a bulk import", (
+        "ALTER TABLE follows ADD COLUMN imported INTEGER NOT NULL DEFAULT 0",
+    )),
+    (8, "Track which process last changed each target's followers", (
+        """
+        CREATE TABLE IF NOT EXISTS follower_writes (
+            target_id INTEGER PRIMARY KEY,
+            version INTEGER NOT NULL,
+            writer TEXT NOT NULL
+        )
+        """,
+    )),
+    (9, "Case-insensitive username index for short prefix searches", (
+        "CREATE INDEX IF NOT EXISTS idx_accounts_username_nocase ON accounts(username COLLATE NOCASE)",
+    )),
+    (10, "Imported account ids waiting for a scan to find their handle", (
+        """
+        CREATE TABLE IF NOT EXISTS pending_followers (
+            target_id INTEGER NOT NULL,
+            user_id TEXT NOT NULL,
+            first_seen INTEGER NOT NULL,
+            PRIMARY KEY (target_id, user_id)
+        ) WITHOUT ROWID
+        """,
+    )),
+)
+
+# Active followers of a target whose username or display name contains an FTS5
+# trigram phrase. Parameters: target username, MATCH expression.
+FOLLOWER_SEARCH = """
+    FROM accounts_fts
+    CROSS JOIN follows f
+        ON f.target_id = (SELECT id FROM accounts WHERE username = ?) AND f.account_id = accounts_fts.rowid
+    CROSS JOIN accounts a ON a.id = f.account_id
+    WHERE accounts_fts MATCH ? AND f.is_active = 1
+"""
+
+# Active followers of a target whose username starts with a prefix, ignoring case,
+# for terms too short for trigrams. Parameters: target username, lowercase prefix,
+# end of the prefix range.
+FOLLOWER_PREFIX_SEARCH = """
+    FROM accounts a
+    CROSS JOIN follows f
+        ON f.target_id = (SELECT id FROM accounts WHERE username = ?) AND f.account_id = a.id
+    WHERE a.username COLLATE NOCASE >= ? AND a.username COLLATE NOCASE < ? AND f.is_active = 1
+"""
+
+# Queries run on every scan, sync pass or page view and the index each must use,
+# checked by check_query_plans()
+HOT_QUERIES = {
+    'follower_list': ('idx_follows_first_seen', f"""
+        SELECT id, username, display_name,
+            {DISPLAY_TIMESTAMP.format('first_seen')} AS first_seen,
+            {DISPLAY_TIMESTAMP.format('last_seen')} AS last_seen,
+            api_synced as is_synced
+        FROM followers
+        WHERE target_username = ? AND is_active = 1
+        ORDER BY followers.first_seen DESC LIMIT ? OFFSET ?
+    """),
+    'follower_lookup': ('sqlite_autoindex_follows_1', """
+        SELECT 1 FROM followers WHERE target_username = ? AND username = ?
+    """),
+    'unsynced_followers': ('idx_follows_unsynced', f"""
+        SELECT id, display_name, username, {ISO_TIMESTAMP.format('first_seen')} AS first_seen
+        FROM followers
+        WHERE target_username = ?
+        AND api_synced = 0
+        AND is_active = 1
+    """),
+    'recent_scans': ('idx_scans_target_timestamp', f"""
+        SELECT {DISPLAY_TIMESTAMP.format('timestamp')} AS timestamp, total_followers, new_followers, batch_number
+        FROM scans
+        WHERE target_username = ?
+        ORDER BY scans.timestamp DESC
+        LIMIT 10
+    """),
+    'new_follower_rate': ('idx_scans_target_timestamp', """
+        SELECT COALESCE(SUM(new_followers), 0) AS new_followers FROM scans
+        WHERE target_username = ? AND timestamp > ?
+    """),
+    'followers_gained': ('idx_follows_first_seen', """
+        SELECT (first_seen + ?) / ? * ? - ? AS bucket, COUNT(*) AS followers
+        FROM followers
+        WHERE target_username = ? AND first_seen >= ?
+        GROUP BY bucket
+        ORDER BY bucket
+    """),
+    'followers_as_of': ('idx_follow_events_time', f"""
+        SELECT a.username FROM ({FOLLOWER_SET_AS_OF}) AS members
+        JOIN accounts a ON a.id = members.account_id
+    """),
+    'follower_changes': ('idx_follow_events_time', f"""
+        WITH {LATEST_FOLLOW_EVENTS}
+        SELECT a.username, changes.followed, COALESCE(
+            (SELECT e.followed FROM follow_events e
+             WHERE e.target_id = ? AND e.account_id = changes.account_id AND e.occurred_at <= ?
+             ORDER BY e.occurred_at DESC, e.id DESC LIMIT 1),
+            EXISTS (SELECT 1 FROM follow_checkpoints p
+                    WHERE p.target_id = ? AND p.taken_at = ? AND p.account_id = changes.account_id)
+        ) AS was_following
+        FROM changes
+        JOIN accounts a ON a.id = changes.account_id
+    """),
+    'follower_search': ('sqlite_autoindex_follows_1', f"""
+        SELECT COUNT(*) {FOLLOWER_SEARCH}
+    """),
+    'follower_prefix_search': ('idx_accounts_username_nocase', f"""
+        SELECT COUNT(*) {FOLLOWER_PREFIX_SEARCH}
+    """),
+    'follower_stats': ('sqlite_autoindex_follower_stats_1', """
+        SELECT bucket, new_followers, refollowers, unfollowers, synced, active
+        FROM follower_stats
+        WHERE target_id = (SELECT id FROM accounts WHERE username = ?) AND period = ? AND bucket >= ?
+        ORDER BY bucket
+    """),
+    'last_generation': ('idx_scan_generations_target', """
+        SELECT * FROM scan_generations
+        WHERE target_username = ? AND mode = ? AND status IN ('complete', 'incomplete')
+        ORDER BY id DESC
+        LIMIT 1
+    """),
+    'scan_metrics': ('idx_scan_metrics_target', """
+        SELECT * FROM scan_metrics
+        WHERE target_username = ?
+        ORDER BY started_at DESC
+        LIMIT ?
+    """)
+}
+
+def setup_schema(conn: sqlite3.Connection, version: int = None):
+    """Create the base tables if they don't exist and apply pending migrations
+    
+    Args:
+        conn: Connection to the database
+        version: Last migration to apply, None for all of them
+    """
+    cursor = conn.cursor()
+    
+    # Persistent for the database file
+    cursor.execute("PRAGMA journal_mode = WAL")
+    
+    # Create followers table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS followers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            target_username TEXT NOT NULL,
+            display_name TEXT NOT NULL,
+            username TEXT NOT NULL,
+            first_seen TIMESTAMP NOT NULL,
+            last_seen TIMESTAMP NOT NULL,
+            is_active BOOLEAN NOT NULL DEFAULT 1,
+            api_synced BOOLEAN NOT NULL DEFAULT 0,
+            UNIQUE(target_username, username)
+        )
+    """)
+    
+    # Create scans table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scans (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            target_username TEXT NOT NULL,
+            timestamp TIMESTAMP NOT NULL,
+            total_followers INTEGER NOT NULL,
+            new_followers INTEGER NOT NULL,
+            batch_number INTEGER NOT NULL
+        )
+    """)
+    
+    # Sweep generations and the usernames each sweep observed
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scan_generations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            target_username TEXT NOT NULL,
+            mode TEXT NOT NULL,
+            started_at TIMESTAMP NOT NULL,
+            finished_at TIMESTAMP,
+            status TEXT NOT NULL,
+            observed INTEGER NOT NULL DEFAULT 0,
+            new_followers INTEGER NOT NULL DEFAULT 0,
+            refollowers INTEGER NOT NULL DEFAULT 0,
+            unfollowers INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scan_observations (
+            generation_id INTEGER NOT NULL,
+            username TEXT NOT NULL,
+            PRIMARY KEY (generation_id, username)
+        ) WITHOUT ROWID
+    """)
+    
+    # Resume points of sweeps interrupted by a crash or browser restart
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scan_checkpoints (
+            target_username TEXT PRIMARY KEY,
+            generation_id INTEGER NOT NULL,
+            scroll_offset INTEGER NOT NULL,
+            last_usernames TEXT NOT NULL,
+            followers_seen INTEGER NOT NULL,
+            updated_at TIMESTAMP NOT NULL
+        )
+    """)
+    
+    # Phase timings and resource use of every scan
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scan_metrics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            target_username TEXT NOT NULL,
+            started_at TIMESTAMP NOT NULL,
+            duration_ms INTEGER NOT NULL,
+            scan_type TEXT NOT NULL,
+            extraction_mode TEXT,
+            pacing TEXT,
+            lean BOOLEAN,
+            driver_setup_ms INTEGER,
+            login_check_ms INTEGER,
+            navigation_ms INTEGER,
+            scroll_ms INTEGER,
+            extraction_ms INTEGER,
+            database_ms INTEGER,
+            sleep_ms INTEGER,
+            steps INTEGER,
+            webdriver_calls INTEGER,
+            followers_seen INTEGER,
+            new_followers INTEGER,
+            followers_per_sec REAL,
+            bytes_transferred INTEGER,
+            js_heap_bytes INTEGER,
+            dom_nodes INTEGER,
+            error TEXT
+        )
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_scan_metrics_target
+        ON scan_metrics(target_username, started_at)
+    """)
+    
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP NOT NULL
+        )
+    """)
+    
+    conn.commit()
+    migrate(conn, version)
+    
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Get the version of the last applied migration, 0 if none"""
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+    
+def migrate(conn: sqlite3.Connection, version: int = None) -> int:
+    """Apply pending migrations, each in its own transaction
+    
+    The version is checked again once the write lock is held, so processes
+    opening the database at the same time apply each migration once.
+    
+    Args:
+        conn: Connection to migrate through
+        version: Last migration to apply, None for all of them
+        
+    Returns:
+        int: Number of migrations applied
+    """
+    current = schema_version(conn)
+    applied = 0
+    
+    for number, description, steps in MIGRATIONS:
+        if number <= current or (version is not None and number > version):
+            continue
+            
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have applied it since the version was read
+            if schema_version(conn) >= number:
+                conn.commit()
+                continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute("""
+                INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)
+            """, (number, description, datetime.now().isoformat()))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+            
+        # stderr, so a command streaming an export to stdout stays parseable
+        print(f"Applied database migration {number}: {description}", file=sys.stderr)
+        applied += 1
+        
+    return applied
+    
 class DatabaseManager:
     _instance = None
     _lock = threading.Lock()
@@ -19,106 +744,254 @@ class DatabaseManager:
     def _initialize(self):
         """Initialize the database manager"""
         self._thread_local = threading.local()
+        self._follower_indexes = {}
+        self._index_lock = threading.Lock()
+        # Tells this process's follower writes from those of other processes
+        self.writer_token = f"{os.getpid()}-{os.urandom(4).hex()}"
+        self.index_mode = os.getenv('FOLLOWER_INDEX', 'set')
         
-        # Set database path
+        # Set database path, DATABASE_PATH points benchmarks and tools at another file
         root_dir = Path(__file__).parent.parent
         data_dir = root_dir / 'data'
         if not data_dir.exists():
             data_dir.mkdir(exist_ok=True)
-        self.db_path = str(data_dir / 'followers.db')
+        self.db_path = os.getenv('DATABASE_PATH') or str(data_dir / 'followers.db')
         
         # Initialize database schema
         self.setup_database()
         
+        # Every write goes through one thread that groups them into shared commits
+        self.writer = DatabaseWriter(self.connect, linger_ms=float(os.getenv('DB_GROUP_COMMIT_MS', '0')))
+        
+    def connect(self) -> sqlite3.Connection:
+        """Open a new connection with the shared pragmas applied"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+        
     def get_connection(self) -> sqlite3.Connection:
-        """Get thread-local database connection"""
+        """Get thread-local database connection, used for reads"""
         if not hasattr(self._thread_local, "connection"):
-            self._thread_local.connection = sqlite3.connect(self.db_path)
-            self._thread_local.connection.row_factory = sqlite3.Row
+            self._thread_local.connection = self.connect()
         return self._thread_local.connection
         
-    def setup_database(self):
-        """Create database tables if they don't exist"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def write(self, write):
+        """Run a write on the writer thread and wait for its commit
         
-        # Create followers table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS followers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                target_username TEXT NOT NULL,
-                display_name TEXT NOT NULL,
-                username TEXT NOT NULL,
-                first_seen TIMESTAMP NOT NULL,
-                last_seen TIMESTAMP NOT NULL,
-                is_active BOOLEAN NOT NULL DEFAULT 1,
-                api_synced BOOLEAN NOT NULL DEFAULT 0,
-                UNIQUE(target_username, username)
-            )
-        """)
+        Args:
+            write: Function taking a connection and returning a result; it must not commit
+            
+        Returns:
+            The write function's result; its exception is raised here
+        """
+        return self.writer.submit(write)
+        
+    def writer_stats(self) -> Dict[str, Any]:
+        """Get commit latency, batch size and queue statistics of the writer"""
+        return self.writer.metrics()
+        
+    def follower_index(self, target_username: str) -> FollowerIndex:
+        """Get the process-wide follower index of a target, loading it on first use
+        
+        The index is rebuilt from the database when another process, such as
+        an import, changed the target's followers since it was loaded.
         
-        # Create scans table
+        Args:
+            target_username: Twitter username being tracked
+            
+        Returns:
+            FollowerIndex kept up to date by this manager's writes
+        """
+        with self._index_lock:
+            index = self._follower_indexes.get(target_username)
+            if index is None:
+                index = FollowerIndex(target_username, self, self.index_mode)
+                self._follower_indexes[target_username] = index
+                
+        cursor = self.get_connection().cursor()
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS scans (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                target_username TEXT NOT NULL,
-                timestamp TIMESTAMP NOT NULL,
-                total_followers INTEGER NOT NULL,
-                new_followers INTEGER NOT NULL,
-                batch_number INTEGER NOT NULL
-            )
-        """)
+            SELECT w.version, w.writer FROM follower_writes w
+            JOIN accounts a ON a.id = w.target_id
+            WHERE a.username = ?
+        """, (target_username,))
+        last_write = cursor.fetchone()
+        version = last_write['version'] if last_write else None
+        external = last_write is not None and last_write['writer'] != self.writer_token
         
-        conn.commit()
+        if not index.loaded or index.stale or (external and version != index.version):
+            index.load()
+        index.version = version
+        return index
+        
+    def _note_follower_write(self, conn: sqlite3.Connection, target_id: int, target_username: str):
+        """Record a change to a target's followers made by this process
+        
+        Called inside every write that changes follows. If another process
+        wrote since the index last looked, the index is rebuilt on next use.
+        """
+        last_write = conn.execute("""
+            SELECT version, writer FROM follower_writes WHERE target_id = ?
+        """, (target_id,)).fetchone()
+        if last_write and last_write['writer'] != self.writer_token:
+            index = self._follower_indexes.get(target_username)
+            if index is not None and index.version != last_write['version']:
+                index.stale = True
+                
+        conn.execute("""
+            INSERT INTO follower_writes (target_id, version, writer) VALUES (?, 1, ?)
+            ON CONFLICT(target_id) DO UPDATE SET version = version + 1, writer = excluded.writer
+        """, (target_id, self.writer_token))
+        
+    def _refresh_index_status(self, target_username: str):
+        """Resync a loaded index after followers changed status in bulk"""
+        index = self._follower_indexes.get(target_username)
+        if index is not None and index.loaded:
+            index.refresh_inactive()
+            
+    def setup_database(self):
+        """Create database tables if they don't exist and apply pending migrations"""
+        setup_schema(self.get_connection())
+        
+    def schema_version(self) -> int:
+        """Get the version of the last applied migration, 0 if none"""
+        return schema_version(self.get_connection())
+        
+    def check_query_plans(self) -> Dict[str, List[str]]:
+        """Find hot queries that miss their index, scan a table or sort results in a temporary B-tree
+        
+        Grouping in a temporary B-tree is allowed, since the index bounds the rows grouped,
+        and so is scanning a materialized CTE, which holds only rows found through an index,
+        or a full-text table through a MATCH.
+        
+        Returns:
+            dict: EXPLAIN QUERY PLAN lines of every offending query by name, empty if none
+        """
+        cursor = self.get_connection().cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        tables = {row['name'] for row in cursor.fetchall()}
+        problems = {}
+        
+        for name, (index, query) in HOT_QUERIES.items():
+            cursor.execute(f"EXPLAIN QUERY PLAN {query}", [None] * query.count('?'))
+            plan = [row['detail'] for row in cursor.fetchall()]
+            uses_index = any(f" INDEX {index} " in f"{detail} " for detail in plan)
+            scans = any(
+                (detail.startswith('SCAN ') and detail.split()[1] in tables and 'VIRTUAL TABLE INDEX 0:M' not in detail)
+                or 'TEMP B-TREE FOR ORDER BY' in detail
+                for detail in plan
+            )
+            if not uses_index or scans:
+                problems[name] = plan
+                
+        return problems
         
     def add_followers(self, target_username: str, followers: List[Dict[str, str]], batch_num: int) -> int:
         """Add new followers to database
         
         Args:
             target_username: Twitter username being tracked
-            followers: List of follower dictionaries with display_name and username
+            followers: List of follower dictionaries with display_name and username,
+                and user_id when the scan read account ids
             batch_num: Batch number for this group of followers
             
         Returns:
             int: Number of new followers added
+            
+        Followers whose account id was imported from a follower.js file are
+        stored as imported instead: synced, and first seen at the import.
         """
-        try:
-            conn = self.get_connection()
+        # Loaded before writing so the batch is added to it exactly once
+        index = self.follower_index(target_username)
+        
+        def write(conn):
             cursor = conn.cursor()
             
-            # Get existing followers
+            # Stage the batch in a per-connection temp table, last display name wins
             cursor.execute("""
-                SELECT username FROM followers
-                WHERE target_username = ?
-            """, (target_username,))
-            existing = {row['username'] for row in cursor.fetchall()}
-            
-            # Add new followers
-            now = datetime.now().isoformat()
-            new_count = 0
-            
-            for follower in followers:
-                if follower['username'] not in existing:
-                    cursor.execute("""
-                        INSERT INTO followers (
-                            target_username, display_name, username,
-                            first_seen, last_seen, is_active, api_synced
-                        ) VALUES (?, ?, ?, ?, ?, 1, 0)
-                    """, (
-                        target_username,
-                        follower['display_name'],
-                        follower['username'],
-                        now,
-                        now
-                    ))
-                    new_count += 1
-                else:
-                    # Update last_seen for existing followers
-                    cursor.execute("""
-                        UPDATE followers
-                        SET last_seen = ?, is_active = 1
-                        WHERE target_username = ? AND username = ?
-                    """, (now, target_username, follower['username']))
+                CREATE TEMP TABLE IF NOT EXISTS incoming_followers (
+                    username TEXT PRIMARY KEY,
+                    display_name TEXT,
+                    user_id TEXT
+                ) WITHOUT ROWID
+            """)
+            cursor.execute("DELETE FROM incoming_followers")
+            cursor.executemany("""
+                INSERT OR REPLACE INTO incoming_followers (username, display_name, user_id) VALUES (?, ?, ?)
+            """, ((follower['username'], follower['display_name'], follower.get('user_id')) for follower in followers))
+            
+            # Create unseen accounts and keep the latest display name of known ones
+            target_id = self._account_id(conn, target_username)
+            cursor.execute("""
+                INSERT INTO accounts (username, display_name)
+                SELECT username, display_name FROM incoming_followers WHERE true
+                ON CONFLICT(username) DO UPDATE SET display_name = excluded.display_name
+                WHERE accounts.display_name IS NOT excluded.display_name
+            """)
+            
+            # New followers are the staged accounts without a follows row, found
+            # through the (target_id, account_id) unique index. CROSS JOIN keeps
+            # SQLite from scanning all accounts for the unanalyzed temp table.
+            cursor.execute("""
+                SELECT a.username FROM incoming_followers i
+                CROSS JOIN accounts a ON a.username = i.username
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM follows f WHERE f.target_id = ? AND f.account_id = a.id
+                )
+            """, (target_id,))
+            inserted = [row[0] for row in cursor.fetchall()]
+            
+            # New followers whose account id was imported, with the import's time
+            has_user_ids = any(follower.get('user_id') for follower in followers)
+            resolved = {}
+            if has_user_ids:
+                cursor.execute("""
+                    SELECT i.username, p.first_seen FROM incoming_followers i
+                    CROSS JOIN pending_followers p ON p.target_id = ? AND p.user_id = i.user_id
+                """, (target_id,))
+                new_usernames = set(inserted)
+                resolved = {username: first_seen for username, first_seen in cursor.fetchall() if username in new_usernames}
+            new_count = len(inserted) - len(resolved)
+            
+            # Log a follow for every new follower and every inactive one seen again
+            now = int(time.time())
+            cursor.execute("""
+                INSERT INTO follow_events (target_id, account_id, followed, occurred_at)
+                SELECT ?, a.id, 1, COALESCE((
+                    SELECT p.first_seen FROM pending_followers p
+                    WHERE p.target_id = ? AND p.user_id = i.user_id AND f.id IS NULL
+                ), ?)
+                FROM incoming_followers i
+                CROSS JOIN accounts a ON a.username = i.username
+                LEFT JOIN follows f ON f.target_id = ? AND f.account_id = a.id
+                WHERE f.id IS NULL OR f.is_active = 0
+            """, (target_id, target_id, now, target_id))
+            self._record_follower_stats(conn, target_id, now, new_followers=new_count,
+                                        refollowers=cursor.rowcount - len(inserted))
+            for first_seen, count in Counter(resolved.values()).items():
+                self._record_follower_stats(conn, target_id, first_seen, new_followers=count, synced=count)
+                
+            # Insert new followers and refresh last_seen of existing ones in one statement
+            cursor.execute("""
+                INSERT INTO follows (target_id, account_id, first_seen, last_seen, is_active, api_synced, imported)
+                SELECT ?, a.id, COALESCE(p.first_seen, ?), ?, 1, p.user_id IS NOT NULL, p.user_id IS NOT NULL
+                FROM incoming_followers i
+                CROSS JOIN accounts a ON a.username = i.username
+                LEFT JOIN pending_followers p ON p.target_id = ? AND p.user_id = i.user_id
+                WHERE true
+                ON CONFLICT(target_id, account_id) DO UPDATE SET
+                    last_seen = excluded.last_seen,
+                    is_active = 1
+            """, (target_id, now, now, target_id))
+            self._note_follower_write(conn, target_id, target_username)
+            
+            if has_user_ids:
+                cursor.execute("""
+                    DELETE FROM pending_followers
+                    WHERE target_id = ? AND user_id IN (SELECT user_id FROM incoming_followers WHERE user_id IS NOT NULL)
+                """, (target_id,))
+            cursor.execute("DELETE FROM incoming_followers")
             
             # Record scan
             if followers:
@@ -134,46 +1007,913 @@ class DatabaseManager:
                     new_count,
                     batch_num
                 ))
+            return inserted, new_count
             
-            conn.commit()
+        try:
+            inserted, new_count = self.write(write)
+            new_usernames = set(inserted)
+            index.add(inserted)
+            index.mark_active(follower['username'] for follower in followers if follower['username'] not in new_usernames)
             return new_count
             
         except Exception as e:
             print(f"Error adding followers to database: {str(e)}")
             return 0
             
-    def mark_unfollowers(self, target_username: str):
-        """Mark followers not seen in latest scan as inactive
+    def import_followers(self, target_username: str, followers: List[Dict[str, Any]]) -> int:
+        """Load one chunk of an existing follower list in a single transaction
+        
+        Followers already stored are left as they are. New ones are flagged as
+        imported and as synced, so the API sync does not announce followers
+        that predate tracking. They get a follow event at their first_seen
+        time, and inactive ones an unfollow event at their unfollowed_at time;
+        finish_import() rebuilds the rollups once the import is done.
         
         Args:
             target_username: Twitter username being tracked
+            followers: Follower dictionaries with username, and optionally
+                display_name, first_seen (epoch seconds, default now),
+                last_seen, is_active (default True) and unfollowed_at
+                
+        Returns:
+            int: Number of followers added
+            
+        Raises:
+            sqlite3.Error: The chunk could not be written; earlier chunks stay committed
         """
+        index = self.follower_index(target_username)
+        now = int(time.time())
+        
+        def staged(follower):
+            first_seen = follower.get('first_seen') or now
+            last_seen = max(follower.get('last_seen') or first_seen, first_seen)
+            is_active = follower.get('is_active', True) is not False
+            unfollowed_at = None if is_active else max(follower.get('unfollowed_at') or last_seen, first_seen)
+            return (follower['username'], follower.get('display_name'), first_seen, last_seen,
+                    int(is_active), unfollowed_at)
+            
+        def write(conn):
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS imported_followers (
+                    username TEXT PRIMARY KEY,
+                    display_name TEXT,
+                    first_seen INTEGER NOT NULL,
+                    last_seen INTEGER NOT NULL,
+                    is_active INTEGER NOT NULL,
+                    unfollowed_at INTEGER
+                ) WITHOUT ROWID
+            """)
+            cursor.execute("DELETE FROM imported_followers")
+            cursor.executemany("""
+                INSERT OR REPLACE INTO imported_followers (
+                    username, display_name, first_seen, last_seen, is_active, unfollowed_at
+                ) VALUES (?, ?, ?, ?, ?, ?)
+            """, (staged(follower) for follower in followers))
+            
+            # Unknown accounts are created; known display names are only filled in
+            target_id = self._account_id(conn, target_username)
+            cursor.execute("""
+                INSERT INTO accounts (username, display_name)
+                SELECT username, display_name FROM imported_followers WHERE true
+                ON CONFLICT(username) DO UPDATE SET display_name = excluded.display_name
+                WHERE accounts.display_name IS NULL AND excluded.display_name IS NOT NULL
+            """)
+            
+            inserted = cursor.execute("""
+                INSERT INTO follows (target_id, account_id, first_seen, last_seen, is_active, api_synced, imported)
+                SELECT ?, a.id, i.first_seen, i.last_seen, i.is_active, 1, 1
+                FROM imported_followers i
+                CROSS JOIN accounts a ON a.username = i.username
+                WHERE true
+                ON CONFLICT(target_id, account_id) DO NOTHING
+                RETURNING account_id
+            """, (target_id,)).fetchall()
+            inserted_ids = json.dumps([row[0] for row in inserted])
+            
+            # Follow and unfollow events of the followers added, in time order
+            cursor.execute("""
+                INSERT INTO follow_events (target_id, account_id, followed, occurred_at)
+                SELECT ?, account_id, followed, occurred_at FROM (
+                    SELECT a.id AS account_id, 1 AS followed, i.first_seen AS occurred_at
+                    FROM imported_followers i CROSS JOIN accounts a ON a.username = i.username
+                    WHERE a.id IN (SELECT value FROM json_each(?))
+                    UNION ALL
+                    SELECT a.id, 0, i.unfollowed_at
+                    FROM imported_followers i CROSS JOIN accounts a ON a.username = i.username
+                    WHERE i.is_active = 0 AND a.id IN (SELECT value FROM json_each(?))
+                )
+                ORDER BY occurred_at
+            """, (target_id, inserted_ids, inserted_ids))
+            self._note_follower_write(conn, target_id, target_username)
+            
+            cursor.execute("""
+                SELECT a.username, i.is_active FROM imported_followers i
+                CROSS JOIN accounts a ON a.username = i.username
+                WHERE a.id IN (SELECT value FROM json_each(?))
+            """, (inserted_ids,))
+            added = cursor.fetchall()
+            cursor.execute("DELETE FROM imported_followers")
+            return [username for username, _ in added], any(not is_active for _, is_active in added)
+            
+        inserted, any_inactive = self.write(write)
+        index.add(inserted)
+        if any_inactive:
+            self._refresh_index_status(target_username)
+        return len(inserted)
+        
+    def import_follower_ids(self, target_username: str, user_ids: List[str]) -> int:
+        """Hold imported account ids until a scan finds their handles
+        
+        follower.js files of X data exports list account ids only, which
+        cannot be matched to the handles a scan reads. They are kept apart
+        from the followers; add_followers() stores an account as imported when
+        a scan in network mode reads its id, and other modes never match them.
+        
+        Args:
+            target_username: Twitter username being tracked
+            user_ids: Account ids (rest_id) of followers
+            
+        Returns:
+            int: Number of account ids added
+            
+        Raises:
+            sqlite3.Error: The chunk could not be written; earlier chunks stay committed
+        """
+        def write(conn):
+            target_id = self._account_id(conn, target_username)
+            cursor = conn.execute("""
+                INSERT INTO pending_followers (target_id, user_id, first_seen)
+                SELECT ?, value, ? FROM json_each(?) WHERE true
+                ON CONFLICT(target_id, user_id) DO NOTHING
+            """, (target_id, int(time.time()), json.dumps(user_ids)))
+            return cursor.rowcount
+            
+        return self.write(write)
+        
+    def finish_import(self, target_username: str, started_at: datetime, observed: int, new_followers: int,
+                      mode: str = 'import', status: str = 'complete'):
+        """Record an import and rebuild the target's rollups
+        
+        A complete import of followers is stored as a generation that the
+        tracker counts as a full sweep, so the next live scan runs
+        incrementally. Imports of account ids and failed imports are stored
+        under a mode or status it ignores.
+        
+        Args:
+            target_username: Twitter username being tracked
+            started_at: When the import started
+            observed: Rows read from the import
+            new_followers: Followers or account ids the import added
+            mode: 'import' for followers, 'id_import' for account ids
+            status: 'complete', or 'failed' when the import stopped on an error
+        """
+        def write(conn):
+            conn.execute("""
+                INSERT INTO scan_generations (target_username, mode, started_at, finished_at, status, observed, new_followers)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (target_username, mode, started_at.isoformat(), datetime.now().isoformat(), status, observed, new_followers))
+            if mode == 'import' and new_followers:
+                rebuild_follower_stats(conn, [self._account_id(conn, target_username)])
+                
+        self.write(write)
+        
+    def start_generation(self, target_username: str, mode: str = 'full') -> int:
+        """Open a scan generation that collects every username observed by a sweep
+        
+        Args:
+            target_username: Twitter username being tracked
+            mode: Kind of scan that owns the generation
+            
+        Returns:
+            int: Generation ID, or None on error
+        """
+        def write(conn):
+            cursor = conn.cursor()
+            
+            # Only one sweep per target can be running at a time
+            cursor.execute("""
+                DELETE FROM scan_observations WHERE generation_id IN (
+                    SELECT id FROM scan_generations
+                    WHERE target_username = ? AND status = 'running'
+                )
+            """, (target_username,))
+            cursor.execute("""
+                UPDATE scan_generations
+                SET status = 'abandoned', finished_at = ?
+                WHERE target_username = ? AND status = 'running'
+            """, (datetime.now().isoformat(), target_username))
+            cursor.execute("DELETE FROM scan_checkpoints WHERE target_username = ?", (target_username,))
+            
+            cursor.execute("""
+                INSERT INTO scan_generations (target_username, mode, started_at, status)
+                VALUES (?, ?, ?, 'running')
+            """, (target_username, mode, datetime.now().isoformat()))
+            return cursor.lastrowid
+            
         try:
-            conn = self.get_connection()
+            return self.write(write)
+            
+        except Exception as e:
+            print(f"Error starting scan generation: {str(e)}")
+            return None
+            
+    def record_observations(self, generation_id: int, usernames: List[str]):
+        """Stage usernames observed by a sweep
+        
+        Args:
+            generation_id: Generation the usernames belong to
+            usernames: Usernames seen on the followers page
+        """
+        def write(conn):
+            conn.executemany("""
+                INSERT OR IGNORE INTO scan_observations (generation_id, username)
+                VALUES (?, ?)
+            """, [(generation_id, username) for username in usernames])
+            
+        try:
+            self.write(write)
+            
+        except Exception as e:
+            print(f"Error recording scan observations: {str(e)}")
+            
+    def finish_generation(self, generation_id: int, min_coverage: float = 0.5) -> Dict[str, Any]:
+        """Reconcile a completed sweep against the stored followers
+        
+        The set difference between stored active followers and the staged
+        observations is computed in SQL, so no follower list is loaded into
+        Python. When a sweep observed fewer than ``min_coverage`` of the active
+        followers it is assumed to be broken (e.g. a selector change) and no
+        one is marked as unfollowed.
+        
+        Args:
+            generation_id: Generation to reconcile
+            min_coverage: Smallest observed/active ratio trusted for unfollows
+            
+        Returns:
+            dict: observed, new_followers, refollowers and unfollowers counts,
+            or None on error
+        """
+        def write(conn):
             cursor = conn.cursor()
             
-            # Get timestamp of latest scan
             cursor.execute("""
-                SELECT MAX(timestamp) as last_scan
-                FROM scans
-                WHERE target_username = ?
+                SELECT target_username, started_at FROM scan_generations WHERE id = ?
+            """, (generation_id,))
+            generation = cursor.fetchone()
+            target_username = generation['target_username']
+            
+            cursor.execute("""
+                SELECT COUNT(*) FROM scan_observations WHERE generation_id = ?
+            """, (generation_id,))
+            observed = cursor.fetchone()[0]
+            
+            cursor.execute("""
+                SELECT COUNT(*) FROM followers WHERE target_username = ? AND is_active = 1
             """, (target_username,))
-            result = cursor.fetchone()
+            active = cursor.fetchone()[0]
             
-            if result and result['last_scan']:
-                # Mark followers not seen in latest scan as inactive
-                cursor.execute("""
-                    UPDATE followers
-                    SET is_active = 0
-                    WHERE target_username = ?
-                    AND last_seen < ?
-                    AND is_active = 1
-                """, (target_username, result['last_scan']))
+            cursor.execute("""
+                SELECT COUNT(*) FROM followers
+                WHERE target_username = ? AND first_seen >= ?
+            """, (target_username, iso_to_epoch(generation['started_at'])))
+            new_followers = cursor.fetchone()[0]
+            
+            # Followers that came back after being marked inactive
+            cursor.execute("""
+                SELECT COUNT(*) FROM followers
+                WHERE target_username = ? AND is_active = 0
+                AND username IN (SELECT username FROM scan_observations WHERE generation_id = ?)
+            """, (target_username, generation_id))
+            refollowers = cursor.fetchone()[0]
+            
+            now = datetime.now()
+            target_id = self._account_id(conn, target_username)
+            cursor.execute("""
+                INSERT INTO follow_events (target_id, account_id, followed, occurred_at)
+                SELECT target_id, account_id, 1, ? FROM follows
+                WHERE target_id = ? AND is_active = 0
+                AND account_id IN (
+                    SELECT a.id FROM scan_observations o
+                    JOIN accounts a ON a.username = o.username
+                    WHERE o.generation_id = ?
+                )
+            """, (int(now.timestamp()), target_id, generation_id))
+            self._record_follower_stats(conn, target_id, int(now.timestamp()), refollowers=cursor.rowcount)
+            cursor.execute("""
+                UPDATE follows
+                SET last_seen = ?, is_active = 1
+                WHERE target_id = ?
+                AND account_id IN (
+                    SELECT a.id FROM scan_observations o
+                    JOIN accounts a ON a.username = o.username
+                    WHERE o.generation_id = ?
+                )
+            """, (int(now.timestamp()), target_id, generation_id))
+            self._note_follower_write(conn, target_id, target_username)
+            
+            if observed >= active * min_coverage:
+                unfollowers = self._mark_unfollowers(conn, target_username, generation_id)
+                status = 'complete'
+            else:
+                print(f"Sweep observed {observed} of {active} active followers, not marking unfollowers")
+                unfollowers = 0
+                status = 'incomplete'
                 
-                conn.commit()
+            cursor.execute("""
+                UPDATE scan_generations
+                SET finished_at = ?, status = ?, observed = ?,
+                    new_followers = ?, refollowers = ?, unfollowers = ?
+                WHERE id = ?
+            """, (now.isoformat(), status, observed, new_followers, refollowers, unfollowers, generation_id))
+            
+            cursor.execute("DELETE FROM scan_observations WHERE generation_id = ?", (generation_id,))
+            cursor.execute("DELETE FROM scan_checkpoints WHERE generation_id = ?", (generation_id,))
+            
+            return target_username, {
+                'status': status,
+                'observed': observed,
+                'new_followers': new_followers,
+                'refollowers': refollowers,
+                'unfollowers': unfollowers
+            }
+            
+        try:
+            target_username, result = self.write(write)
+            self._refresh_index_status(target_username)
+            return result
+            
+        except Exception as e:
+            print(f"Error finishing scan generation: {str(e)}")
+            return None
+            
+    def abandon_generation(self, generation_id: int):
+        """Close a sweep that did not reach the end of the followers list
+        
+        Args:
+            generation_id: Generation to abandon
+        """
+        def write(conn):
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                UPDATE scan_generations
+                SET finished_at = ?, status = 'abandoned'
+                WHERE id = ?
+            """, (datetime.now().isoformat(), generation_id))
+            cursor.execute("DELETE FROM scan_observations WHERE generation_id = ?", (generation_id,))
+            cursor.execute("DELETE FROM scan_checkpoints WHERE generation_id = ?", (generation_id,))
+            
+        try:
+            self.write(write)
+            
+        except Exception as e:
+            print(f"Error abandoning scan generation: {str(e)}")
+            
+    def get_generation(self, generation_id: int) -> Dict[str, Any]:
+        """Get a scan generation by ID
+        
+        Args:
+            generation_id: Generation to look up
+            
+        Returns:
+            Generation dictionary, or None if it does not exist
+        """
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT * FROM scan_generations WHERE id = ?", (generation_id,))
+            row = cursor.fetchone()
+            
+            return dict(row) if row else None
+            
+        except Exception as e:
+            print(f"Error getting scan generation: {str(e)}")
+            return None
+            
+    def save_checkpoint(self, target_username: str, generation_id: int, scroll_offset: int,
+                        last_usernames: List[str], followers_seen: int):
+        """Persist the resume point of a running sweep
+        
+        Args:
+            target_username: Twitter username being tracked
+            generation_id: Sweep generation being scanned
+            scroll_offset: Page offset reached
+            last_usernames: Most recently seen usernames, used to find the spot again
+            followers_seen: Followers processed so far
+        """
+        def write(conn):
+            conn.execute("""
+                INSERT OR REPLACE INTO scan_checkpoints (
+                    target_username, generation_id, scroll_offset,
+                    last_usernames, followers_seen, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+                target_username,
+                generation_id,
+                scroll_offset,
+                json.dumps(last_usernames),
+                followers_seen,
+                datetime.now().isoformat()
+            ))
+            
+        try:
+            self.write(write)
+            
+        except Exception as e:
+            print(f"Error saving scan checkpoint: {str(e)}")
+            
+    def get_checkpoint(self, target_username: str) -> Dict[str, Any]:
+        """Get the saved resume point of a target's sweep
+        
+        Args:
+            target_username: Twitter username being tracked
+            
+        Returns:
+            Checkpoint dictionary with last_usernames decoded, or None
+        """
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT * FROM scan_checkpoints WHERE target_username = ?
+            """, (target_username,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+                
+            checkpoint = dict(row)
+            checkpoint['last_usernames'] = json.loads(checkpoint['last_usernames'])
+            return checkpoint
+            
+        except Exception as e:
+            print(f"Error getting scan checkpoint: {str(e)}")
+            return None
+            
+    def get_last_generation(self, target_username: str, mode: str = 'full') -> Dict[str, Any]:
+        """Get the most recent finished generation of a target
+        
+        Args:
+            target_username: Twitter username being tracked
+            mode: Kind of scan that owns the generation
+            
+        Returns:
+            Generation dictionary, or None if no sweep has finished yet
+        """
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute(HOT_QUERIES['last_generation'][1], (target_username, mode))
+            row = cursor.fetchone()
+            
+            return dict(row) if row else None
+            
+        except Exception as e:
+            print(f"Error getting last scan generation: {str(e)}")
+            return None
+            
+    def get_new_follower_rate(self, target_username: str, window_hours: float) -> float:
+        """Get the rate at which scans found new followers in a recent window
+        
+        Counting starts after the target's first finished full sweep or
+        follower import, so the initial load of the whole followers list is not
+        taken for arrivals. An import of account ids does not load the list and
+        is no baseline.
+        
+        Args:
+            target_username: Twitter username being tracked
+            window_hours: Length of the window to look back over
+            
+        Returns:
+            float: New followers per hour, or None if no full sweep has finished yet
+        """
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT MIN(finished_at) AS baseline FROM scan_generations
+                WHERE target_username = ? AND mode IN ('full', 'import') AND status IN ('complete', 'incomplete')
+            """, (target_username,))
+            baseline = cursor.fetchone()['baseline']
+            if not baseline:
+                return None
                 
+            now = datetime.now()
+            since = max(datetime.fromisoformat(baseline), now - timedelta(hours=window_hours))
+            
+            cursor.execute(HOT_QUERIES['new_follower_rate'][1], (target_username, int(since.timestamp())))
+            new_followers = cursor.fetchone()['new_followers']
+            
+            # Short histories are stretched to an hour so one lucky scan does not spike the rate
+            hours = max((now - since).total_seconds() / 3600, 1.0)
+            return new_followers / hours
+            
+        except Exception as e:
+            print(f"Error getting new follower rate: {str(e)}")
+            return None
+            
+    def mark_unfollowers(self, target_username: str, generation_id: int) -> int:
+        """Mark active followers not observed by a sweep generation as inactive
+        
+        Args:
+            target_username: Twitter username being tracked
+            generation_id: Completed sweep whose observations are staged
+            
+        Returns:
+            int: Number of followers marked inactive
+        """
+        try:
+            unfollowers = self.write(lambda conn: self._mark_unfollowers(conn, target_username, generation_id))
+            self._refresh_index_status(target_username)
+            return unfollowers
+            
         except Exception as e:
             print(f"Error marking unfollowers: {str(e)}")
+            return 0
+            
+    def _mark_unfollowers(self, conn: sqlite3.Connection, target_username: str, generation_id: int) -> int:
+        cursor = conn.cursor()
+        target_id = self._account_id(conn, target_username)
+        cursor.execute("""
+            INSERT INTO follow_events (target_id, account_id, followed, occurred_at)
+            SELECT target_id, account_id, 0, ? FROM follows
+            WHERE target_id = ?
+            AND is_active = 1
+            AND account_id NOT IN (
+                SELECT a.id FROM scan_observations o
+                JOIN accounts a ON a.username = o.username
+                WHERE o.generation_id = ?
+            )
+        """, (int(time.time()), target_id, generation_id))
+        self._record_follower_stats(conn, target_id, int(time.time()), unfollowers=cursor.rowcount)
+        cursor.execute("""
+            UPDATE follows
+            SET is_active = 0
+            WHERE target_id = ?
+            AND is_active = 1
+            AND account_id NOT IN (
+                SELECT a.id FROM scan_observations o
+                JOIN accounts a ON a.username = o.username
+                WHERE o.generation_id = ?
+            )
+        """, (target_id, generation_id))
+        unfollowers = cursor.rowcount
+        self._note_follower_write(conn, target_id, target_username)
+        return unfollowers
+        
+    def _account_id(self, conn: sqlite3.Connection, username: str) -> int:
+        """Get the ID of an account, creating it if needed"""
+        conn.execute("INSERT OR IGNORE INTO accounts (username) VALUES (?)", (username,))
+        return conn.execute("SELECT id FROM accounts WHERE username = ?", (username,)).fetchone()[0]
+        
+    def _record_follower_stats(self, conn: sqlite3.Connection, target_id: int, at: int, new_followers: int = 0,
+                               refollowers: int = 0, unfollowers: int = 0, synced: int = 0):
+        """Add changes to the hourly and daily rollups of a target, in the caller's transaction"""
+        if not (new_followers or refollowers or unfollowers or synced):
+            return
+        change = new_followers + refollowers - unfollowers
+        for period in STAT_PERIODS:
+            bucket = stat_bucket(at, period)
+            # A new bucket starts from the active count at the end of the previous one
+            conn.execute("""
+                INSERT INTO follower_stats (
+                    target_id, period, bucket, new_followers, refollowers, unfollowers, synced, active
+                )
+                SELECT ?, ?, ?, ?, ?, ?, ?, ? + COALESCE((
+                    SELECT active FROM follower_stats
+                    WHERE target_id = ? AND period = ? AND bucket < ?
+                    ORDER BY bucket DESC LIMIT 1
+                ), 0)
+                WHERE true
+                ON CONFLICT(target_id, period, bucket) DO UPDATE SET
+                    new_followers = new_followers + excluded.new_followers,
+                    refollowers = refollowers + excluded.refollowers,
+                    unfollowers = unfollowers + excluded.unfollowers,
+                    synced = synced + excluded.synced,
+                    active = active + ?
+            """, (target_id, period, bucket, new_followers, refollowers, unfollowers, synced, change,
+                  target_id, period, bucket, change))
+            # Changes back-dated into an earlier bucket carry over to the active count of later ones
+            if change:
+                conn.execute("""
+                    UPDATE follower_stats SET active = active + ?
+                    WHERE target_id = ? AND period = ? AND bucket > ?
+                """, (change, target_id, period, bucket))
+            
+    def record_scan_metrics(self, metrics: Dict[str, Any]):
+        """Store the performance metrics of one scan
+        
+        Args:
+            metrics: Values keyed by SCAN_METRIC_COLUMNS; missing keys are stored as NULL
+        """
+        def write(conn):
+            conn.execute(f"""
+                INSERT INTO scan_metrics ({', '.join(SCAN_METRIC_COLUMNS)})
+                VALUES ({', '.join('?' for _ in SCAN_METRIC_COLUMNS)})
+            """, [metrics.get(column) for column in SCAN_METRIC_COLUMNS])
+            
+        try:
+            self.write(write)
+            
+        except Exception as e:
+            print(f"Error recording scan metrics: {str(e)}")
+            
+    def get_scan_metrics(self, target_username: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get the most recent scan metrics of a target, oldest first
+        
+        Args:
+            target_username: Twitter username being tracked
+            limit: Number of scans to return
+            
+        Returns:
+            List of scan metrics dictionaries
+        """
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute(f"SELECT * FROM ({HOT_QUERIES['scan_metrics'][1]}) ORDER BY started_at", (target_username, limit))
+            
+            return [dict(row) for row in cursor.fetchall()]
+            
+        except Exception as e:
+            print(f"Error getting scan metrics: {str(e)}")
+            return []
+            
+    def get_followers_gained(self, target_username: str, since: datetime, bucket_seconds: int = 3600) -> List[Dict[str, Any]]:
+        """Count followers first seen in each time bucket since a point in time
+        
+        Buckets are aligned to local time, so daily buckets start at midnight.
+        Empty buckets are left out.
+        
+        Args:
+            target_username: Twitter username being tracked
+            since: Start of the range
+            bucket_seconds: Bucket length, e.g. 3600 for hourly counts
+            
+        Returns:
+            List of dictionaries with bucket (epoch seconds of its start) and followers
+        """
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            offset = time.localtime().tm_gmtoff
+            cursor.execute(HOT_QUERIES['followers_gained'][1], (
+                offset, bucket_seconds, bucket_seconds, offset, target_username, int(since.timestamp())
+            ))
+            
+            return [dict(row) for row in cursor.fetchall()]
+            
+        except Exception as e:
+            print(f"Error getting followers gained: {str(e)}")
+            return []
+            
+    def get_follower_stats(self, target_username: str, period: int = 86400, since: datetime = None) -> List[Dict[str, Any]]:
+        """Get the hourly or daily follower rollups of a target
+        
+        Buckets without changes are left out; their active count is that of the
+        previous bucket.
+        
+        Args:
+            target_username: Twitter username being tracked
+            period: 3600 for hourly or 86400 for daily rollups
+            since: Start of the range, None for all history
+            
+        Returns:
+            List of dictionaries with bucket (epoch seconds of its start), new_followers,
+            refollowers, unfollowers, synced and active
+        """
+        try:
+            cursor = self.get_connection().cursor()
+            cursor.execute(HOT_QUERIES['follower_stats'][1], (
+                target_username, period, stat_bucket(int(since.timestamp()), period) if since else 0
+            ))
+            
+            return [dict(row) for row in cursor.fetchall()]
+            
+        except Exception as e:
+            print(f"Error getting follower stats: {str(e)}")
+            return []
+            
+    def rebuild_follower_stats(self, target_username: str = None, missing_only: bool = False) -> int:
+        """Recompute follower rollups from the follows table and follow event log
+        
+        Args:
+            target_username: Target to rebuild, None for all of them
+            missing_only: Only fill in targets that have no rollups yet
+            
+        Returns:
+            int: Number of targets rebuilt
+        """
+        def write(conn):
+            query = "SELECT DISTINCT target_id FROM follows"
+            if missing_only:
+                query += " WHERE target_id NOT IN (SELECT target_id FROM follower_stats)"
+            target_ids = [row[0] for row in conn.execute(query)]
+            if target_username is not None:
+                target_id = self._account_id(conn, target_username)
+                target_ids = [target_id] if target_id in target_ids or not missing_only else []
+            rebuild_follower_stats(conn, target_ids)
+            return len(target_ids)
+            
+        try:
+            return self.write(write)
+            
+        except Exception as e:
+            print(f"Error rebuilding follower stats: {str(e)}")
+            return 0
+            
+    def _follow_checkpoint(self, cursor: sqlite3.Cursor, target_id: int, at: int) -> int:
+        """Get the time of the latest follower checkpoint at or before a point in time, -1 if none"""
+        cursor.execute("""
+            SELECT COALESCE(MAX(taken_at), -1) FROM follow_checkpoints WHERE target_id = ? AND taken_at <= ?
+        """, (target_id, at))
+        return cursor.fetchone()[0]
+        
+    def get_followers_as_of(self, target_username: str, at: datetime) -> List[str]:
+        """Get the usernames following a target at a point in time
+        
+        Exact back to the oldest event kept; before that, compaction leaves the
+        follower set of the last checkpoint taken at or before the given time.
+        
+        Args:
+            target_username: Twitter username being tracked
+            at: Point in time
+            
+        Returns:
+            List of usernames
+        """
+        try:
+            cursor = self.get_connection().cursor()
+            cursor.execute("SELECT id FROM accounts WHERE username = ?", (target_username,))
+            row = cursor.fetchone()
+            if row is None:
+                return []
+                
+            target_id, at = row[0], int(at.timestamp())
+            checkpoint = self._follow_checkpoint(cursor, target_id, at)
+            cursor.execute(HOT_QUERIES['followers_as_of'][1], (target_id, checkpoint, at, target_id, checkpoint))
+            
+            return [row[0] for row in cursor.fetchall()]
+            
+        except Exception as e:
+            print(f"Error getting followers as of {at}: {str(e)}")
+            return []
+            
+    def get_follower_changes(self, target_username: str, start: datetime, end: datetime) -> Dict[str, List[str]]:
+        """Get who started and stopped following a target between two points in time
+        
+        Only net changes are reported: an account that followed and unfollowed
+        again within the interval is left out.
+        
+        Args:
+            target_username: Twitter username being tracked
+            start: Start of the interval (exclusive)
+            end: End of the interval (inclusive)
+            
+        Returns:
+            dict: Usernames under followed and unfollowed
+        """
+        changes = {'followed': [], 'unfollowed': []}
+        try:
+            cursor = self.get_connection().cursor()
+            cursor.execute("SELECT id FROM accounts WHERE username = ?", (target_username,))
+            row = cursor.fetchone()
+            if row is None:
+                return changes
+                
+            target_id, start, end = row[0], int(start.timestamp()), int(end.timestamp())
+            checkpoint = self._follow_checkpoint(cursor, target_id, start)
+            cursor.execute(HOT_QUERIES['follower_changes'][1], (
+                target_id, start, end, target_id, start, target_id, checkpoint
+            ))
+            
+            for username, followed, was_following in cursor.fetchall():
+                if followed and not was_following:
+                    changes['followed'].append(username)
+                elif not followed and was_following:
+                    changes['unfollowed'].append(username)
+            return changes
+            
+        except Exception as e:
+            print(f"Error getting follower changes: {str(e)}")
+            return changes
+            
+    def compact_follow_events(self, target_username: str, before: datetime, period: timedelta = timedelta(days=7)) -> Dict[str, int]:
+        """Fold follow events older than a point in time into periodic checkpoints
+        
+        A checkpoint holding the whole follower set is written at the end of
+        every period that has events, then the events up to the last
+        checkpoint are deleted. Afterwards, as-of queries before that point
+        are answered at the resolution of the period.
+        
+        Args:
+            target_username: Twitter username being tracked
+            before: Events after this point are kept
+            period: Time between checkpoints
+            
+        Returns:
+            dict: Number of checkpoints written and events deleted
+        """
+        step = int(period.total_seconds())
+        cutoff = int(before.timestamp())
+        
+        def write(conn):
+            cursor = conn.cursor()
+            target_id = self._account_id(conn, target_username)
+            cursor.execute("""
+                SELECT COALESCE(MAX(taken_at), -1) FROM follow_checkpoints WHERE target_id = ?
+            """, (target_id,))
+            taken = cursor.fetchone()[0]
+            checkpoints = 0
+            
+            while True:
+                cursor.execute("""
+                    SELECT MIN(occurred_at) FROM follow_events WHERE target_id = ? AND occurred_at > ?
+                """, (target_id, taken))
+                first = cursor.fetchone()[0]
+                # Periods end on multiples of the period length
+                boundary = -(-first // step) * step if first is not None else None
+                if boundary is None or boundary > cutoff:
+                    break
+                    
+                cursor.execute(f"""
+                    INSERT INTO follow_checkpoints (target_id, taken_at, account_id)
+                    SELECT ?, ?, account_id FROM ({FOLLOWER_SET_AS_OF})
+                """, (target_id, boundary, target_id, taken, boundary, target_id, taken))
+                taken = boundary
+                checkpoints += 1
+                
+            cursor.execute("""
+                DELETE FROM follow_events WHERE target_id = ? AND occurred_at <= ?
+            """, (target_id, taken))
+            return {'checkpoints': checkpoints, 'events_removed': cursor.rowcount}
+            
+        try:
+            return self.write(write)
+            
+        except Exception as e:
+            print(f"Error compacting follow events: {str(e)}")
+            return {'checkpoints': 0, 'events_removed': 0}
+            
+    def search_followers(self, target_username: str, text: str, limit: int = 25, offset: int = 0) -> Dict[str, Any]:
+        """Find active followers by username or display name, newest first
+        
+        Terms of three or more characters match anywhere in the username or
+        display name, ignoring case; with a leading @ only usernames starting
+        with the term match. Shorter terms match the start of the username.
+        
+        Args:
+            target_username: Twitter username being tracked
+            text: Search term, optionally starting with @
+            limit: Followers to return
+            offset: Followers to skip
+            
+        Returns:
+            dict: Matching followers (id, username, display_name, first_seen, last_seen,
+            is_synced) and the total number of matches
+        """
+        text = text.strip()
+        prefix = text.startswith('@')
+        term = text.lstrip('@')
+        if len(term) >= 3:
+            phrase = '"' + term.replace('"', '""') + '"'
+            search = FOLLOWER_SEARCH
+            params = [target_username, f"username : {phrase}" if prefix else phrase]
+            if prefix:
+                escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                search += " AND a.username LIKE ? ESCAPE '\\'"
+                params.append(f"{escaped}%")
+        else:
+            # Too short for trigrams: a range over the case-insensitive username index
+            search = FOLLOWER_PREFIX_SEARCH
+            term = term.lower()
+            params = [target_username, term, term + '\U0010ffff']
+            
+        try:
+            cursor = self.get_connection().cursor()
+            cursor.execute(f"SELECT COUNT(*) {search}", params)
+            total = cursor.fetchone()[0]
+            
+            cursor.execute(f"""
+                SELECT f.id, a.username, a.display_name,
+                    {DISPLAY_TIMESTAMP.format('f.first_seen')} AS first_seen,
+                    {DISPLAY_TIMESTAMP.format('f.last_seen')} AS last_seen,
+                    f.api_synced AS is_synced
+                {search}
+                ORDER BY f.first_seen DESC LIMIT ? OFFSET ?
+            """, params + [limit, offset])
+            
+            return {'followers': [dict(row) for row in cursor.fetchall()], 'total': total}
+            
+        except Exception as e:
+            print(f"Error searching followers: {str(e)}")
+            return {'followers': [], 'total': 0}
             
     def get_all_followers(self, target_username: str) -> List[Dict[str, Any]]:
         """Get all followers for a target username
@@ -188,11 +1928,14 @@ class DatabaseManager:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            cursor.execute("""
-                SELECT id, display_name, username, first_seen, last_seen, is_active, api_synced
+            cursor.execute(f"""
+                SELECT id, display_name, username,
+                    {ISO_TIMESTAMP.format('first_seen')} AS first_seen,
+                    {ISO_TIMESTAMP.format('last_seen')} AS last_seen,
+                    is_active, api_synced
                 FROM followers
                 WHERE target_username = ?
-                ORDER BY last_seen DESC
+                ORDER BY followers.last_seen DESC
             """, (target_username,))
             
             return [dict(row) for row in cursor.fetchall()]
@@ -214,13 +1957,7 @@ class DatabaseManager:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            cursor.execute("""
-                SELECT id, display_name, username, first_seen
-                FROM followers
-                WHERE target_username = ?
-                AND api_synced = 0
-                AND is_active = 1
-            """, (target_username,))
+            cursor.execute(HOT_QUERIES['unsynced_followers'][1], (target_username,))
             
             return [dict(row) for row in cursor.fetchall()]
             
@@ -237,19 +1974,48 @@ class DatabaseManager:
         Returns:
             bool: True if successful
         """
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+        return self.mark_followers_synced([follower_id]).get(follower_id, False)
+        
+    def mark_followers_synced(self, follower_ids: List[int]) -> Dict[int, bool]:
+        """Mark many followers as synced in one statement and one commit
+        
+        Args:
+            follower_ids: IDs of the followers to mark as synced
             
-            cursor.execute("""
-                UPDATE followers
+        Returns:
+            dict: For every ID, True if the follower is now synced (including ones
+            synced before), False if it does not exist or the write failed
+        """
+        follower_ids = list(dict.fromkeys(follower_ids))
+        if not follower_ids:
+            return {}
+            
+        def write(conn):
+            ids = json.dumps(follower_ids)
+            marked = conn.execute("""
+                UPDATE follows
                 SET api_synced = 1
-                WHERE id = ?
-            """, (follower_id,))
+                WHERE id IN (SELECT value FROM json_each(?)) AND api_synced = 0
+                RETURNING id, target_id
+            """, (ids,)).fetchall()
             
-            conn.commit()
-            return True
+            synced_per_target = {}
+            for _, target_id in marked:
+                synced_per_target[target_id] = synced_per_target.get(target_id, 0) + 1
+            now = int(time.time())
+            for target_id, synced in synced_per_target.items():
+                self._record_follower_stats(conn, target_id, now, synced=synced)
+                
+            # Followers synced earlier count as acknowledged too
+            found = conn.execute("""
+                SELECT id FROM follows WHERE id IN (SELECT value FROM json_each(?)) AND api_synced = 1
+            """, (ids,)).fetchall()
+            return {row[0] for row in found}
+            
+        try:
+            synced = self.write(write)
+            return {follower_id: follower_id in synced for follower_id in follower_ids}
             
         except Exception as e:
-            print(f"Error marking follower as synced: {str(e)}")
-            return False 
\ No newline at end of file
+            print(f"Error marking followers as synced: {str(e)}")
+            return {follower_id: False for follower_id in follower_ids}
@@ -0,0 +1,174 @@
+import time
+import queue
+import sqlite3
+import threading
+from collections import deque
+from typing import Callable, Dict, Any
+
+class WriteRequest:
+    """One write handed to the writer thread and the caller waiting on it"""
+
+    def __init__(self, write: Callable[[sqlite3.Connection], Any]):
+        self.write = write
+        self.submitted = time.time()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class DatabaseWriter:
+    """Single thread that owns every write to the database
+
+    Writes from the checker, API sync and web viewer are queued here and run
+    on one connection. Whatever has queued up while the previous commit was
+    running goes into the next transaction, so many small writes share one
+    commit (group commit) instead of each waiting for its own fsync. Every
+    write runs in its own savepoint: a failing write is rolled back and its
+    error raised in the caller without affecting the rest of the group.
+
+    Callers block until their write is committed, so a returned write is
+    durable and visible to readers on other connections. If the writer
+    thread cannot open its connection or dies, waiting and later callers get
+    its error instead of blocking forever.
+    """
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], max_batch: int = 256, linger_ms: float = 0,
+                 history: int = 1000):
+        """Initialize the writer and start its thread
+
+        Args:
+            connect: Opens a configured connection for the writer thread
+            max_batch: Most writes committed together
+            linger_ms: Time to wait for more writes after the first one arrives
+            history: Commits kept for latency and batch size statistics
+        """
+        self.connect = connect
+        self.max_batch = max_batch
+        self.linger_ms = linger_ms
+        self.queue = queue.Queue()
+        self.commits = 0
+        self.writes = 0
+        self.failed_writes = 0
+        self.failed_commits = 0
+        self.max_queue_depth = 0
+        self.commit_ms = deque(maxlen=history)
+        self.wait_ms = deque(maxlen=history)
+        self.batch_sizes = deque(maxlen=history)
+        # Error that stopped the writer thread, raised to every caller after it
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name='database-writer')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def submit(self, write: Callable[[sqlite3.Connection], Any], timeout: float = None) -> Any:
+        """Run a write on the writer thread and wait until it is committed
+
+        Args:
+            write: Function taking the writer's connection; it must not commit
+            timeout: Seconds to wait before giving up, None to wait as long as
+                the writer thread is alive. A write that timed out may still
+                be committed later.
+
+        Returns:
+            Whatever the write function returned
+        """
+        # A write issued from inside another write joins that transaction
+        if threading.current_thread() is self._thread:
+            return write(self._conn)
+
+        self._check_alive()
+        request = WriteRequest(write)
+        self.queue.put(request)
+        deadline = time.time() + timeout if timeout is not None else None
+        while not request.done.wait(1 if deadline is None else max(0, min(1, deadline - time.time()))):
+            self._check_alive()
+            if deadline is not None and time.time() >= deadline:
+                raise TimeoutError(f"Database write not committed within {timeout} seconds")
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _check_alive(self):
+        if self.error is not None:
+            raise RuntimeError(f"Database writer stopped: {str(self.error)}") from self.error
+        if not self._thread.is_alive():
+            raise RuntimeError("Database writer stopped")
+
+    def _run(self):
+        try:
+            self._conn = self.connect()
+            # Transactions are opened and committed explicitly below
+            self._conn.isolation_level = None
+            self._write_loop()
+        except Exception as e:
+            print(f"Error in database writer, stopping: {str(e)}")
+            self.error = e
+            # Fail whatever is still queued; later submits raise the stored error
+            while True:
+                try:
+                    request = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                request.error = RuntimeError(f"Database writer stopped: {str(e)}")
+                request.done.set()
+
+    def _write_loop(self):
+        while True:
+            batch = [self.queue.get()]
+            if self.linger_ms:
+                time.sleep(self.linger_ms / 1000)
+            self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize() + 1)
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            started = time.time()
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                for request in batch:
+                    self._conn.execute("SAVEPOINT write")
+                    try:
+                        request.result = request.write(self._conn)
+                        self._conn.execute("RELEASE write")
+                    except Exception as e:
+                        self._conn.execute("ROLLBACK TO write")
+                        self._conn.execute("RELEASE write")
+                        request.error = e
+                        self.failed_writes += 1
+                self._conn.execute("COMMIT")
+                self.commits += 1
+
+            except Exception as e:
+                print(f"Error committing database writes: {str(e)}")
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                self.failed_commits += 1
+                for request in batch:
+                    if request.error is None:
+                        request.error = e
+
+            finished = time.time()
+            self.writes += len(batch)
+            self.batch_sizes.append(len(batch))
+            self.commit_ms.append((finished - started) * 1000)
+            for request in batch:
+                self.wait_ms.append((finished - request.submitted) * 1000)
+                request.done.set()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Get commit latency, batch size and queue statistics"""
+        commit_ms = sorted(self.commit_ms)
+        return {
+            'commits': self.commits,
+            'writes': self.writes,
+            'failed_writes': self.failed_writes,
+            'failed_commits': self.failed_commits,
+            'queue_depth': self.queue.qsize(),
+            'max_queue_depth': self.max_queue_depth,
+            'avg_batch_size': round(sum(self.batch_sizes) / len(self.batch_sizes), 1) if self.batch_sizes else None,
+            'max_batch_size': max(self.batch_sizes) if self.batch_sizes else None,
+            'avg_commit_ms': round(sum(commit_ms) / len(commit_ms), 2) if commit_ms else None,
+            'p95_commit_ms': round(commit_ms[int(len(commit_ms) * 0.95)], 2) if commit_ms else None,
+            'avg_wait_ms': round(sum(self.wait_ms) / len(self.wait_ms), 2) if self.wait_ms else None
+        }
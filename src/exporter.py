@@ -0,0 +1,207 @@
+import io
+import csv
+import json
+from datetime import datetime
+from typing import Iterator, List, Any
+from database import DatabaseManager, ISO_TIMESTAMP
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+
+# What can be exported for a target: query, time column filtered by since/until,
+# and whether it can be filtered by active status. Every query is read in the
+# order of an index, so SQLite never sorts or buffers the result.
+EXPORT_QUERIES = {
+    'followers': (f"""
+        SELECT f.id, a.username, a.display_name,
+            {ISO_TIMESTAMP.format('f.first_seen')} AS first_seen,
+            {ISO_TIMESTAMP.format('f.last_seen')} AS last_seen,
+            f.is_active, f.api_synced, f.imported
+        FROM follows f
+        CROSS JOIN accounts a ON a.id = f.account_id
+        WHERE f.target_id = (SELECT id FROM accounts WHERE username = ?) {{filters}}
+        ORDER BY f.first_seen
+    """, 'f.first_seen', 'f.is_active'),
+    'scans': (f"""
+        SELECT {ISO_TIMESTAMP.format('timestamp')} AS timestamp, total_followers, new_followers, batch_number
+        FROM scans
+        WHERE target_username = ? {{filters}}
+        ORDER BY scans.timestamp
+    """, 'timestamp', None),
+    'events': (f"""
+        SELECT a.username, CASE e.followed WHEN 1 THEN 'follow' ELSE 'unfollow' END AS event,
+            {ISO_TIMESTAMP.format('e.occurred_at')} AS occurred_at
+        FROM follow_events e
+        CROSS JOIN accounts a ON a.id = e.account_id
+        WHERE e.target_id = (SELECT id FROM accounts WHERE username = ?) {{filters}}
+        ORDER BY e.occurred_at
+    """, 'e.occurred_at', None)
+}
+
+# Column types of every export, in query order, as pyarrow type names. Parquet
+# files are written with these rather than types inferred from the first batch,
+# where a column of only NULLs would get the null type.
+EXPORT_COLUMNS = {
+    'followers': (
+        ('id', 'int64'), ('username', 'string'), ('display_name', 'string'), ('first_seen', 'string'),
+        ('last_seen', 'string'), ('is_active', 'int64'), ('api_synced', 'int64'),
+        ('imported', 'int64')
+    ),
+    'scans': (
+        ('timestamp', 'string'), ('total_followers', 'int64'), ('new_followers', 'int64'), ('batch_number', 'int64')
+    ),
+    'events': (
+        ('username', 'string'), ('event', 'string'), ('occurred_at', 'string')
+    )
+}
+
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+class StreamSink(io.RawIOBase):
+    """Write-only file that hands on what was written since the last take()
+    
+    Keeps counting bytes across takes, so writers that record file offsets,
+    like Parquet's, see the position in the whole stream.
+    """
+    
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        
+    def writable(self) -> bool:
+        return True
+        
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+        
+    def tell(self) -> int:
+        return self.position
+        
+    def take(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def export_query(kind: str, target_username: str, since: datetime = None, until: datetime = None,
+                 active: bool = None):
+    """Build the SQL and parameters of one export
+    
+    Args:
+        kind: One of EXPORT_QUERIES
+        target_username: Twitter username being tracked
+        since: Only rows at or after this time
+        until: Only rows before this time
+        active: Only active (True) or inactive (False) followers, None for both
+        
+    Returns:
+        tuple: SQL and its parameters
+    """
+    if kind not in EXPORT_QUERIES:
+        raise ValueError(f"Unknown export: {kind}")
+    query, time_column, active_column = EXPORT_QUERIES[kind]
+    if active is not None and active_column is None:
+        raise ValueError(f"{kind} cannot be filtered by active status")
+        
+    filters = []
+    params = [target_username]
+    if since is not None:
+        filters.append(f"AND {time_column} >= ?")
+        params.append(int(since.timestamp()))
+    if until is not None:
+        filters.append(f"AND {time_column} < ?")
+        params.append(int(until.timestamp()))
+    if active is not None:
+        filters.append(f"AND {active_column} = ?")
+        params.append(int(active))
+    return query.format(filters=' '.join(filters)), params
+
+def export_rows(db: DatabaseManager, query: str, params: List[Any], batch_size: int = 5000) -> Iterator[List[Any]]:
+    """Stream the rows of one export from its own connection
+    
+    Yields the column names first, then lists of up to batch_size rows read
+    with fetchmany. The connection is closed when the generator finishes or
+    is closed early, e.g. when a download is cancelled.
+    """
+    # A read transaction of its own keeps a consistent snapshot while writes go on
+    conn = db.connect()
+    try:
+        cursor = conn.execute(query, params)
+        yield [column[0] for column in cursor.description]
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        conn.close()
+
+def export(db: DatabaseManager, kind: str, fmt: str, target_username: str, since: datetime = None,
+           until: datetime = None, active: bool = None, batch_size: int = 5000) -> Iterator[bytes]:
+    """Stream an export as encoded chunks, one per batch of rows
+    
+    Arguments are checked before anything is read, so a bad request fails
+    before a download starts.
+    
+    Args:
+        db: DatabaseManager to read from
+        kind: One of EXPORT_QUERIES
+        fmt: One of EXPORT_FORMATS; parquet needs pyarrow
+        target_username: Twitter username being tracked
+        since: Only rows at or after this time
+        until: Only rows before this time
+        active: Only active (True) or inactive (False) followers, None for both
+        batch_size: Rows read and encoded per chunk
+        
+    Returns:
+        Iterator of bytes
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    query, params = export_query(kind, target_username, since, until, active)
+    if fmt == 'parquet':
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ValueError("Parquet export needs pyarrow (pip install pyarrow)")
+        schema = pyarrow.schema([(name, getattr(pyarrow, type_name)()) for name, type_name in EXPORT_COLUMNS[kind]])
+        return _parquet_chunks(export_rows(db, query, params, batch_size), pyarrow, schema)
+    if fmt == 'csv':
+        return _csv_chunks(export_rows(db, query, params, batch_size))
+    return _jsonl_chunks(export_rows(db, query, params, batch_size))
+
+def _csv_chunks(batches: Iterator[List[Any]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(next(batches))
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+def _jsonl_chunks(batches: Iterator[List[Any]]) -> Iterator[bytes]:
+    columns = next(batches)
+    for rows in batches:
+        yield ''.join(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + '\n' for row in rows).encode('utf-8')
+
+def _parquet_chunks(batches: Iterator[List[Any]], pyarrow, schema) -> Iterator[bytes]:
+    # One row group per batch, handed on as soon as it is written
+    columns = next(batches)
+    if columns != schema.names:
+        raise ValueError(f"Export columns {columns} do not match the Parquet schema {schema.names}")
+    sink = StreamSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema)
+    for rows in batches:
+        table = pyarrow.table({column: [row[i] for row in rows] for i, column in enumerate(columns)}, schema=schema)
+        writer.write_table(table)
+        yield sink.take()
+    writer.close()
+    yield sink.take()
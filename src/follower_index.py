@@ -0,0 +1,208 @@
+import sys
+import math
+import hashlib
+import threading
+from typing import Iterable, Dict, Any
+
+INDEX_MODES = ('set', 'intern', 'bloom')
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings
+    
+    Answers "definitely not present" or "probably present" using about
+    ten bits per item at a 1% false positive rate.
+    """
+    
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.size = max(1024, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+        
+    def add(self, item: str) -> bool:
+        """Add an item, True if it was not (probably) present before"""
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                added = True
+        return added
+            
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+class FollowerIndex:
+    """Usernames stored for one target, kept in memory for the whole process
+    
+    Loaded from the database once and then updated by DatabaseManager on
+    every write, so scans, writes and the web viewer can check membership
+    and counts without querying the followers table. DatabaseManager rebuilds
+    it when another process changed the followers. Every stored follower,
+    active or not, counts as known; the usually small set of inactive ones
+    is kept exactly so the active count stays correct.
+    
+    Modes:
+    - ``set``: plain set of usernames
+    - ``intern``: set of interned usernames, shared with the scan's own strings
+    - ``bloom``: Bloom filter only; a miss is definite, a hit is confirmed
+      with an indexed lookup. Uses a few percent of the memory of a set.
+    """
+    
+    def __init__(self, target_username: str, db, mode: str = 'set'):
+        """Initialize the follower index
+        
+        Args:
+            target_username: Twitter username being tracked
+            db: DatabaseManager used to load the index and confirm Bloom filter hits
+            mode: Storage mode, one of INDEX_MODES
+        """
+        if mode not in INDEX_MODES:
+            raise ValueError(f"Unknown follower index mode: {mode}")
+        self.target_username = target_username
+        self.db = db
+        self.mode = mode
+        self.known = None
+        self.bloom = None
+        self.inactive = set()
+        self.count = 0
+        self.loaded = False
+        # follower_writes version of the last external write the index reflects
+        self.version = None
+        # Set when another process's write is found under one of this process's writes
+        self.stale = False
+        self.bloom_hits = 0
+        self.bloom_false_positives = 0
+        self._lock = threading.RLock()
+        
+    def load(self):
+        """(Re)build the index from the followers table"""
+        with self._lock:
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT COUNT(*) FROM followers WHERE target_username = ?
+            """, (self.target_username,))
+            count = cursor.fetchone()[0]
+            
+            known = set() if self.mode != 'bloom' else None
+            bloom = BloomFilter(max(2 * count, 10000)) if self.mode == 'bloom' else None
+            inactive = set()
+            
+            cursor.execute("""
+                SELECT username, is_active FROM followers WHERE target_username = ?
+            """, (self.target_username,))
+            while True:
+                rows = cursor.fetchmany(5000)
+                if not rows:
+                    break
+                for username, is_active in rows:
+                    if self.mode == 'intern':
+                        username = sys.intern(username)
+                    if bloom is not None:
+                        bloom.add(username)
+                    else:
+                        known.add(username)
+                    if not is_active:
+                        inactive.add(username)
+                        
+            self.known = known
+            self.bloom = bloom
+            self.inactive = inactive
+            self.count = count
+            self.loaded = True
+            self.stale = False
+            
+    def ensure_loaded(self):
+        if not self.loaded:
+            self.load()
+            
+    def __contains__(self, username: str) -> bool:
+        if self.bloom is None:
+            return username in self.known
+        if username not in self.bloom:
+            return False
+            
+        # Possible hit: confirm with the (target_username, username) unique index
+        self.bloom_hits += 1
+        cursor = self.db.get_connection().cursor()
+        cursor.execute("""
+            SELECT 1 FROM followers WHERE target_username = ? AND username = ?
+        """, (self.target_username, username))
+        if cursor.fetchone():
+            return True
+        self.bloom_false_positives += 1
+        return False
+        
+    def __len__(self) -> int:
+        return self.count
+        
+    @property
+    def active_count(self) -> int:
+        with self._lock:
+            return self.count - len(self.inactive)
+        
+    def add(self, usernames: Iterable[str]):
+        """Record newly inserted followers"""
+        with self._lock:
+            for username in usernames:
+                if self.mode == 'intern':
+                    username = sys.intern(username)
+                if self.bloom is not None:
+                    if not self.bloom.add(username):
+                        # Already picked up by a reload that raced this write,
+                        # or a false positive that leaves the count one short
+                        continue
+                elif username in self.known:
+                    # Already picked up by a reload that raced this write
+                    continue
+                else:
+                    self.known.add(username)
+                self.count += 1
+                
+            # Keep the false positive rate near its target as the list grows
+            if self.bloom is not None and self.count > self.bloom.capacity:
+                self.load()
+                
+    def mark_active(self, usernames: Iterable[str]):
+        """Record followers seen again"""
+        with self._lock:
+            if self.inactive:
+                self.inactive.difference_update(usernames)
+                
+    def refresh_inactive(self):
+        """Reload the inactive usernames after a set-based status change"""
+        with self._lock:
+            cursor = self.db.get_connection().cursor()
+            cursor.execute("""
+                SELECT username FROM followers WHERE target_username = ? AND is_active = 0
+            """, (self.target_username,))
+            self.inactive = {row[0] for row in cursor.fetchall()}
+            
+    def stats(self) -> Dict[str, Any]:
+        """Size and memory use of the index"""
+        # Writes update the sets from other threads, so iterate them under the lock
+        with self._lock:
+            if self.bloom is not None:
+                memory = len(self.bloom.bits)
+            elif self.known is not None:
+                memory = sys.getsizeof(self.known) + sum(sys.getsizeof(username) for username in self.known)
+            else:
+                memory = 0
+            return {
+                'target_username': self.target_username,
+                'mode': self.mode,
+                'known': self.count,
+                'active': self.active_count,
+                'memory_bytes': memory,
+                'bloom_hits': self.bloom_hits if self.bloom is not None else None,
+                'bloom_false_positives': self.bloom_false_positives if self.bloom is not None else None
+            }
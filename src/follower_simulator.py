@@ -0,0 +1,342 @@
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from typing import List, Dict, Any
+
+# Infinite-scroll followers page using the markup the tracker's selectors
+# expect. Pages are fetched from a GraphQL-shaped Followers endpoint and, like
+# the real timeline, cells far above the viewport are removed and replaced by
+# a spacer so only a window of cells stays rendered.
+FOLLOWERS_PAGE_HTML = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>People following @%(username)s</title>
+    <style>
+        body { margin: 0; font-family: sans-serif; }
+        [data-testid="cellInnerDiv"] { height: %(cell_height)dpx; box-sizing: border-box; padding: 12px; border-bottom: 1px solid #eee; }
+        [data-testid="UserCell"] a { color: inherit; text-decoration: none; }
+        .r-1wvb978 { color: #536471; }
+        #loader { padding: 20px; text-align: center; }
+    </style>
+</head>
+<body>
+    <main>
+        <div id="timeline"><div id="spacer"></div></div>
+        <div id="loader">Loading...</div>
+    </main>
+    <script>
+        var CELL_HEIGHT = %(cell_height)d;
+        var PAGE_SIZE = %(page_size)d;
+        var MAX_RENDERED = %(max_rendered)d;
+        var timeline = document.getElementById('timeline');
+        var spacer = document.getElementById('spacer');
+        var loader = document.getElementById('loader');
+        var cursor = null;
+        var loading = false;
+        var finished = false;
+        var rendered = 0;
+        var removed = 0;
+        
+        function escapeHtml(text) {
+            return text.replace(/[&<>"']/g, function (c) {
+                return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c];
+            });
+        }
+        
+        function renderUser(user) {
+            var cell = document.createElement('div');
+            cell.setAttribute('data-testid', 'cellInnerDiv');
+            cell.innerHTML =
+                '<div data-testid="UserCell"><a href="/' + escapeHtml(user.screen_name) + '">' +
+                '<div dir="ltr"><span class="css-1jxf684"><span class="css-1jxf684">' +
+                escapeHtml(user.name) + '</span></span></div>' +
+                '<div dir="ltr" class="r-1wvb978"><span class="css-1jxf684">@' +
+                escapeHtml(user.screen_name) + '</span></div></a></div>';
+            timeline.appendChild(cell);
+            rendered++;
+        }
+        
+        function virtualize() {
+            while (rendered > MAX_RENDERED) {
+                timeline.removeChild(spacer.nextSibling);
+                rendered--;
+                removed++;
+            }
+            spacer.style.height = (removed * CELL_HEIGHT) + 'px';
+        }
+        
+        function readPage(payload) {
+            var users = [];
+            var next = null;
+            var instructions = payload.data.user.result.timeline.timeline.instructions;
+            instructions.forEach(function (instruction) {
+                (instruction.entries || []).forEach(function (entry) {
+                    var content = entry.content;
+                    if (content.cursorType === 'Bottom') {
+                        next = content.value;
+                    } else if (content.itemContent) {
+                        var result = content.itemContent.user_results.result;
+                        users.push({name: result.core.name, screen_name: result.core.screen_name});
+                    }
+                });
+            });
+            return {users: users, cursor: next};
+        }
+        
+        function nearBottom() {
+            return window.pageYOffset + 2 * window.innerHeight >= document.body.scrollHeight;
+        }
+        
+        function loadMore() {
+            if (loading || finished) {
+                return;
+            }
+            loading = true;
+            var variables = JSON.stringify({screen_name: '%(username)s', count: PAGE_SIZE, cursor: cursor});
+            fetch('/i/api/graphql/SimFollowers/Followers?variables=' + encodeURIComponent(variables))
+                .then(function (response) { return response.json(); })
+                .then(function (payload) {
+                    var page = readPage(payload);
+                    page.users.forEach(renderUser);
+                    virtualize();
+                    cursor = page.cursor;
+                    if (!page.users.length) {
+                        finished = true;
+                        loader.textContent = '';
+                    }
+                    loading = false;
+                    if (nearBottom()) {
+                        loadMore();
+                    }
+                })
+                .catch(function () {
+                    loading = false;
+                });
+        }
+        
+        window.addEventListener('scroll', function () {
+            if (nearBottom()) {
+                loadMore();
+            }
+        });
+        loadMore();
+    </script>
+</body>
+</html>
+"""
+
+HOME_PAGE_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Home</title></head><body><main>Follower simulator</main></body></html>
+"""
+
+class FollowerPopulation:
+    """Synthetic followers list, newest first
+    
+    Churn is applied every time the followers page is loaded, so each scan
+    sees a slightly different list while a single scan reads a stable one.
+    """
+    
+    def __init__(self, count: int, arrivals: int = 0, unfollows: int = 0, seed: int = 0):
+        """Initialize the follower population
+        
+        Args:
+            count: Followers in the initial list
+            arrivals: New followers added to the top on every page load
+            unfollows: Random followers removed on every page load
+            seed: Random seed for the unfollow choice
+        """
+        self.arrivals = arrivals
+        self.unfollows = unfollows
+        self.random = random.Random(seed)
+        self.next_id = count
+        self.followers = list(range(count - 1, -1, -1))
+        self.page_loads = 0
+        self._lock = threading.Lock()
+        
+    @staticmethod
+    def user(user_id: int) -> Dict[str, Any]:
+        username = f"sim_user{user_id}"
+        name = f"Simulated Follower {user_id}"
+        return {
+            '__typename': 'User',
+            'rest_id': str(1000000000 + user_id),
+            'core': {'name': name, 'screen_name': username},
+            'legacy': {'name': name, 'screen_name': username}
+        }
+        
+    def reload(self):
+        """Apply one page load worth of churn"""
+        with self._lock:
+            self.page_loads += 1
+            if self.page_loads == 1:
+                return
+            for _ in range(min(self.unfollows, len(self.followers))):
+                self.followers.pop(self.random.randrange(len(self.followers)))
+            new_ids = list(range(self.next_id, self.next_id + self.arrivals))
+            self.next_id += self.arrivals
+            self.followers[:0] = reversed(new_ids)
+            
+    def page(self, cursor: int, count: int):
+        """Return the user IDs after a cursor and the cursor of the next page"""
+        with self._lock:
+            return self.followers[cursor:cursor + count], cursor + count
+            
+    def usernames(self) -> List[str]:
+        """Usernames currently in the list"""
+        with self._lock:
+            return [self.user(user_id)['core']['screen_name'] for user_id in self.followers]
+
+def followers_response(users: List[Dict[str, Any]], next_cursor: int) -> Dict[str, Any]:
+    """Wrap users in the timeline layout of X's Followers GraphQL response"""
+    entries = [{
+        'entryId': f"user-{user['rest_id']}",
+        'content': {
+            'entryType': 'TimelineTimelineItem',
+            'itemContent': {
+                'itemType': 'TimelineUser',
+                'user_results': {'result': user}
+            }
+        }
+    } for user in users]
+    entries.append({
+        'entryId': f"cursor-bottom-{next_cursor}",
+        'content': {
+            'entryType': 'TimelineTimelineCursor',
+            'cursorType': 'Bottom',
+            'value': str(next_cursor)
+        }
+    })
+    
+    return {
+        'data': {'user': {'result': {'timeline': {'timeline': {
+            'instructions': [{'type': 'TimelineAddEntries', 'entries': entries}]
+        }}}}}
+    }
+
+class FollowerSimulator:
+    """Local HTTP server standing in for x.com followers pages
+    
+    Serves ``/<username>/followers`` and the Followers API it scrolls
+    through, so TwitterFollowerTracker can run against it with
+    ``base_url=simulator.base_url``. Every target shares the same list.
+    """
+    
+    def __init__(self, followers: int = 1000, latency_ms: int = 0, page_size: int = 20, arrivals: int = 0,
+                 unfollows: int = 0, max_rendered: int = 100, host: str = '127.0.0.1', port: int = 0):
+        """Initialize the simulator
+        
+        Args:
+            followers: Followers in the initial list
+            latency_ms: Delay added to every Followers API response
+            page_size: Followers per API response
+            arrivals: New followers added to the top on every page load
+            unfollows: Random followers removed on every page load
+            max_rendered: Cells kept in the DOM before older ones are removed
+            host: Interface to listen on
+            port: Port to listen on, 0 picks a free one
+        """
+        self.population = FollowerPopulation(followers, arrivals, unfollows)
+        self.latency_ms = latency_ms
+        self.page_size = page_size
+        self.max_rendered = max_rendered
+        self.host = host
+        self.port = port
+        self.api_requests = 0
+        self.bytes_sent = 0
+        self.server = None
+        self._thread = None
+        
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+        
+    def start(self):
+        """Start serving in a background thread"""
+        simulator = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                simulator.handle(self)
+                
+            def log_message(self, format, *args):
+                pass
+                
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        print(f"Follower simulator serving {len(self.population.followers)} followers at {self.base_url}")
+        
+    def stop(self):
+        """Stop the server"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+            
+    def handle(self, request: BaseHTTPRequestHandler):
+        """Answer a GET request"""
+        url = urlparse(request.path)
+        parts = [part for part in url.path.split('/') if part]
+        
+        if url.path.endswith('/Followers'):
+            self.api_requests += 1
+            if self.latency_ms:
+                time.sleep(self.latency_ms / 1000)
+            variables = json.loads(parse_qs(url.query).get('variables', ['{}'])[0])
+            cursor = int(variables.get('cursor') or 0)
+            count = int(variables.get('count') or self.page_size)
+            user_ids, next_cursor = self.population.page(cursor, count)
+            payload = followers_response([FollowerPopulation.user(user_id) for user_id in user_ids], next_cursor)
+            self.send(request, json.dumps(payload), 'application/json')
+        elif len(parts) == 2 and parts[1] == 'followers':
+            self.population.reload()
+            self.send(request, FOLLOWERS_PAGE_HTML % {
+                'username': parts[0],
+                'cell_height': 80,
+                'page_size': self.page_size,
+                'max_rendered': self.max_rendered
+            }, 'text/html')
+        elif url.path == '/favicon.ico':
+            self.send(request, '', 'text/plain', status=404)
+        else:
+            self.send(request, HOME_PAGE_HTML, 'text/html')
+            
+    def send(self, request: BaseHTTPRequestHandler, body: str, content_type: str, status: int = 200):
+        data = body.encode('utf-8')
+        self.bytes_sent += len(data)
+        request.send_response(status)
+        request.send_header('Content-Type', f"{content_type}; charset=utf-8")
+        request.send_header('Content-Length', str(len(data)))
+        request.end_headers()
+        request.wfile.write(data)
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic followers page for offline scans")
+    parser.add_argument('--followers', type=int, default=1000)
+    parser.add_argument('--latency', type=int, default=0, help="Milliseconds added to every API response")
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--arrivals', type=int, default=0, help="New followers per page load")
+    parser.add_argument('--unfollows', type=int, default=0, help="Unfollows per page load")
+    parser.add_argument('--port', type=int, default=8400)
+    args = parser.parse_args()
+    
+    simulator = FollowerSimulator(args.followers, args.latency, args.page_size, args.arrivals, args.unfollows,
+                                  port=args.port)
+    simulator.start()
+    print(f"Open {simulator.base_url}/example/followers, press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        simulator.stop()
+
+if __name__ == "__main__":
+    main()
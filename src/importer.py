@@ -0,0 +1,150 @@
+import re
+import csv
+import json
+import time
+from datetime import datetime
+from typing import Iterator, Dict, Any, Callable
+from database import DatabaseManager
+
+IMPORT_FORMATS = ('csv', 'jsonl', 'followerjs')
+
+# follower.js of an X data export lists account IDs only
+FOLLOWER_JS_ACCOUNT = re.compile(r'"accountId"\s*:\s*"(\d+)"')
+
+def parse_time(value) -> int:
+    """Read epoch seconds or an ISO timestamp, None if empty"""
+    if value in (None, ''):
+        return None
+    if isinstance(value, (int, float)) or str(value).isdigit():
+        return int(value)
+    return int(datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp())
+
+def parse_flag(value) -> bool:
+    """Read a 1/0, true/false or yes/no column, None if empty"""
+    if value in (None, ''):
+        return None
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() not in ('0', 'false', 'no')
+
+def follower_from_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a CSV row or JSON object to a follower, accepting export and X column names
+    
+    Followers exports of this tool carry last_seen and is_active, so
+    unfollowers stay inactive when an export is imported again.
+    """
+    username = (record.get('username') or record.get('screen_name') or '').strip().lstrip('@')
+    if not username:
+        return None
+    follower = {
+        'username': username,
+        'display_name': record.get('display_name') or record.get('name') or None,
+        'first_seen': parse_time(record.get('first_seen')),
+        'last_seen': parse_time(record.get('last_seen'))
+    }
+    is_active = parse_flag(record.get('is_active'))
+    if is_active is not None:
+        follower['is_active'] = is_active
+        follower['unfollowed_at'] = parse_time(record.get('unfollowed_at'))
+    return follower
+
+def detect_format(path: str) -> str:
+    """Guess the import format from the file name"""
+    name = path.lower()
+    if name.endswith('.js'):
+        return 'followerjs'
+    if name.endswith('.jsonl') or name.endswith('.ndjson'):
+        return 'jsonl'
+    if name.endswith('.csv'):
+        return 'csv'
+    raise ValueError(f"Cannot tell the format of {path}, pass one of {', '.join(IMPORT_FORMATS)}")
+
+def read_followers(path: str, fmt: str = None) -> Iterator[Dict[str, Any]]:
+    """Stream followers from a file without loading it
+    
+    Args:
+        path: CSV with a header, JSON lines, or follower.js from an X data export
+        fmt: One of IMPORT_FORMATS, guessed from the file name if None
+        
+    Yields:
+        Follower dictionaries as made by follower_from_record, or for
+        follower.js dictionaries with the user_id only
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Unknown import format: {fmt}")
+        
+    with open(path, encoding='utf-8', newline='') as source:
+        if fmt == 'followerjs':
+            # One account ID per entry, usually on its own line; read line by line
+            for line in source:
+                for account_id in FOLLOWER_JS_ACCOUNT.findall(line):
+                    yield {'user_id': account_id}
+            return
+            
+        if fmt == 'csv':
+            records = csv.DictReader(source)
+        else:
+            records = (json.loads(line) for line in source if line.strip())
+        for record in records:
+            follower = follower_from_record(record)
+            if follower:
+                yield follower
+
+def import_followers(db: DatabaseManager, target_username: str, path: str, fmt: str = None,
+                     chunk_size: int = 10000, progress: Callable[[int, int, float], None] = None) -> Dict[str, int]:
+    """Load a follower list into the database in chunked transactions
+    
+    A follower.js file only holds account ids; those are kept until a scan
+    in network mode reads the same ids, and the import does not stand in for
+    a full sweep. If a chunk fails the import stops, is recorded as failed and
+    the error is raised; chunks written before stay, and running the import
+    again skips them.
+    
+    Args:
+        db: DatabaseManager to write to
+        target_username: Twitter username being tracked
+        path: File to import
+        fmt: One of IMPORT_FORMATS, guessed from the file name if None
+        chunk_size: Followers written per transaction
+        progress: Called after every chunk with rows read, followers added and seconds elapsed
+        
+    Returns:
+        dict: Rows read and followers (or account ids) added
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Unknown import format: {fmt}")
+    mode = 'id_import' if fmt == 'followerjs' else 'import'
+    started_at = datetime.now()
+    started = time.time()
+    read = added = 0
+    chunk = []
+    
+    def flush():
+        nonlocal added
+        if mode == 'id_import':
+            added += db.import_follower_ids(target_username, [follower['user_id'] for follower in chunk])
+        else:
+            added += db.import_followers(target_username, chunk)
+        chunk.clear()
+        if progress:
+            progress(read, added, time.time() - started)
+            
+    try:
+        for follower in read_followers(path, fmt):
+            chunk.append(follower)
+            read += 1
+            if len(chunk) >= chunk_size:
+                flush()
+        if chunk:
+            flush()
+    except Exception:
+        try:
+            db.finish_import(target_username, started_at, read, added, mode, 'failed')
+        except Exception as e:
+            print(f"Error recording failed import: {str(e)}")
+        raise
+        
+    db.finish_import(target_username, started_at, read, added, mode)
+    return {'read': read, 'added': added}
@@ -1,6 +1,7 @@
 import os
 from dotenv import load_dotenv
 from web_viewer import FollowerWebViewer
+from scan_scheduler import parse_targets
 
 def main():
     # Load environment variables
@@ -9,15 +10,26 @@ def main():
     # Get configuration
     target_username = os.getenv('TARGET_USERNAME')
     web_port = int(os.getenv('WEB_PORT', '3000'))
+    scan_interval = int(float(os.getenv('SCAN_INTERVAL_MINUTES', '5')) * 60)
+    targets = parse_targets(os.getenv('TARGET_USERNAMES', ''), scan_interval)
     
+    if not target_username and targets:
+        target_username = targets[0].username
+        
     if not target_username:
         print("Error: TARGET_USERNAME not set in .env file")
         return
         
+    if not targets:
+        targets = parse_targets(target_username, scan_interval)
+        
     try:
         # Start web viewer only
-        print(f"Starting web viewer for @{target_username}")
-        web_viewer = FollowerWebViewer(target_username, web_port)
+        if len(targets) > 1:
+            print(f"Starting web viewer for {len(targets)} targets")
+        else:
+            print(f"Starting web viewer for @{target_username}")
+        web_viewer = FollowerWebViewer(target_username, web_port, targets)
         web_viewer.run()
         
     except KeyboardInterrupt:
@@ -0,0 +1,144 @@
+import os
+import sys
+import argparse
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from database import DatabaseManager, MIGRATIONS
+from exporter import export, EXPORT_FORMATS, EXPORT_QUERIES
+from importer import import_followers, detect_format, IMPORT_FORMATS
+
+def migrate():
+    """Apply pending migrations and report the schema version"""
+    # Opening the database applies pending migrations
+    db = DatabaseManager()
+    version = db.schema_version()
+    latest = MIGRATIONS[-1][0] if MIGRATIONS else 0
+    print(f"Database {db.db_path} is at schema version {version} (latest {latest})")
+    return 0 if version == latest else 1
+
+def check_plans():
+    """Fail if a hot query no longer uses its index"""
+    problems = DatabaseManager().check_query_plans()
+    for name, plan in problems.items():
+        print(f"{name}:")
+        for detail in plan:
+            print(f"    {detail}")
+    if problems:
+        print(f"{len(problems)} hot queries are not served by their index")
+        return 1
+    print("All hot queries use their indexes")
+    return 0
+
+def compact_events(target_username: str, keep_days: float, period_days: float):
+    """Fold follow events older than the retention window into checkpoints"""
+    result = DatabaseManager().compact_follow_events(
+        target_username, datetime.now() - timedelta(days=keep_days), timedelta(days=period_days)
+    )
+    print(f"Wrote {result['checkpoints']} checkpoints and removed {result['events_removed']} events")
+    return 0
+    
+def rebuild_stats(target_username: str = None, missing_only: bool = False):
+    """Recompute the hourly and daily follower rollups"""
+    rebuilt = DatabaseManager().rebuild_follower_stats(target_username, missing_only)
+    print(f"Rebuilt follower rollups of {rebuilt} targets")
+    return 0
+    
+def export_data(kind: str, fmt: str, target_username: str, since: str = None, until: str = None,
+                active: bool = None, output: str = None):
+    """Stream an export to a file or stdout"""
+    try:
+        chunks = export(
+            DatabaseManager(), kind, fmt, target_username,
+            datetime.fromisoformat(since) if since else None,
+            datetime.fromisoformat(until) if until else None,
+            active
+        )
+    except ValueError as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+        
+    out = open(output, 'wb') if output else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if output:
+            out.close()
+    return 0
+    
+def import_data(target_username: str, path: str, fmt: str = None, chunk_size: int = 10000):
+    """Load an existing follower list for a target"""
+    def report(read, added, seconds):
+        print(f"Read {read} rows, added {added} ({read / max(seconds, 1e-6):,.0f} rows/s)")
+        
+    try:
+        result = import_followers(DatabaseManager(), target_username, path, fmt, chunk_size, report)
+    except Exception as e:
+        print(f"Error importing followers: {str(e)}")
+        return 1
+        
+    if (fmt or detect_format(path)) == 'followerjs':
+        print(f"Stored {result['added']} of {result['read']} account ids of @{target_username}'s followers. "
+              f"Scans with EXTRACTION_MODE=network match them to handles; other modes cannot.")
+    else:
+        print(f"Imported {result['added']} of {result['read']} followers of @{target_username}")
+    return 0
+    
+def main():
+    load_dotenv()
+    
+    parser = argparse.ArgumentParser(description="Follower tracker database maintenance")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('migrate', help="Apply pending schema migrations")
+    subparsers.add_parser('check-plans', help="Run EXPLAIN QUERY PLAN on every hot query")
+    compact = subparsers.add_parser('compact-events', help="Fold old follow events into periodic checkpoints")
+    compact.add_argument('--target', default=os.getenv('TARGET_USERNAME'))
+    compact.add_argument('--keep-days', type=float, default=90, help="Keep every event of the last days")
+    compact.add_argument('--period-days', type=float, default=7, help="Days between checkpoints of older history")
+    backfill = subparsers.add_parser('backfill-stats', help="Build follower rollups for targets that have none")
+    backfill.add_argument('--target')
+    rebuild = subparsers.add_parser('rebuild-stats', help="Recompute follower rollups from the follow history")
+    rebuild.add_argument('--target')
+    exporter = subparsers.add_parser('export', help="Stream followers, scans or follow events of a target")
+    exporter.add_argument('kind', choices=list(EXPORT_QUERIES))
+    exporter.add_argument('--target', default=os.getenv('TARGET_USERNAME'))
+    exporter.add_argument('--format', choices=EXPORT_FORMATS, default='csv')
+    exporter.add_argument('--since', help="Only rows at or after this date or ISO time")
+    exporter.add_argument('--until', help="Only rows before this date or ISO time")
+    status = exporter.add_mutually_exclusive_group()
+    status.add_argument('--active', dest='active', action='store_const', const=True, help="Only active followers")
+    status.add_argument('--inactive', dest='active', action='store_const', const=False, help="Only unfollowers")
+    exporter.add_argument('--output', '-o', help="File to write, stdout if omitted")
+    importer = subparsers.add_parser('import', help="Load followers from CSV, JSONL or an X data export's follower.js")
+    importer.add_argument('path')
+    importer.add_argument('--target', default=os.getenv('TARGET_USERNAME'))
+    importer.add_argument('--format', choices=IMPORT_FORMATS, help="Guessed from the file name if omitted")
+    importer.add_argument('--chunk-size', type=int, default=10000, help="Followers written per transaction")
+    args = parser.parse_args()
+    
+    if args.command == 'migrate':
+        sys.exit(migrate())
+    elif args.command == 'check-plans':
+        sys.exit(check_plans())
+    elif args.command == 'compact-events':
+        if not args.target:
+            print("Error: pass --target or set TARGET_USERNAME in .env file")
+            sys.exit(1)
+        sys.exit(compact_events(args.target, args.keep_days, args.period_days))
+    elif args.command == 'export':
+        if not args.target:
+            print("Error: pass --target or set TARGET_USERNAME in .env file", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(export_data(args.kind, args.format, args.target, args.since, args.until, args.active, args.output))
+    elif args.command == 'import':
+        if not args.target:
+            print("Error: pass --target or set TARGET_USERNAME in .env file")
+            sys.exit(1)
+        sys.exit(import_data(args.target, args.path, args.format, args.chunk_size))
+    elif args.command == 'backfill-stats':
+        sys.exit(rebuild_stats(args.target, missing_only=True))
+    elif args.command == 'rebuild-stats':
+        sys.exit(rebuild_stats(args.target))
+
+if __name__ == "__main__":
+    main()
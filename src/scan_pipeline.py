@@ -0,0 +1,257 @@
+import time
+import queue
+import threading
+from collections import deque
+from typing import List, Dict, Any
+
+# Seconds stop() waits for a scan to flush its pipeline before closing Chrome
+PIPELINE_DRAIN_TIMEOUT = 20
+
+class PipelineStage:
+    """Throughput and queue depth counters of one pipeline stage"""
+    
+    def __init__(self, name: str, input_queue: queue.Queue = None):
+        self.name = name
+        self.queue = input_queue
+        self.items = 0
+        self.busy = 0.0
+        self.max_depth = 0
+        self.started = time.time()
+        
+    def record(self, items: int, seconds: float):
+        self.items += items
+        self.busy += seconds
+        if self.queue is not None:
+            self.max_depth = max(self.max_depth, self.queue.qsize())
+            
+    def metrics(self) -> Dict[str, Any]:
+        elapsed = max(time.time() - self.started, 1e-6)
+        return {
+            'stage': self.name,
+            'items': self.items,
+            'items_per_sec': round(self.items / elapsed, 2),
+            'busy_pct': round(100 * self.busy / elapsed, 1),
+            'queue_depth': self.queue.qsize() if self.queue is not None else None,
+            'max_queue_depth': self.max_depth if self.queue is not None else None
+        }
+
+class ScanPipeline:
+    """Moves followers read by the scroll loop to the database on background threads
+    
+    Three stages are connected by bounded queues:
+    
+    - extraction: the scroll loop itself, handing each step's rows to ``submit``
+    - normalization: cleans rows and classifies them with the scan's ScanIndex
+    - persistence: writes follower batches, sweep observations and checkpoints
+    
+    The browser keeps scrolling while a batch is being committed; when the
+    database falls behind the queues fill up and the scroll loop waits.
+    Checkpoints travel through both queues, so one is only saved after
+    everything read before it.
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, db, target_username: str, scan_index, generation_id: int = None, batch_size: int = 100,
+                 observation_batch_size: int = 500, stop_after_existing: int = None, queue_size: int = 64,
+                 recent_size: int = 20, resumed_seen: int = 0):
+        """Initialize the pipeline
+        
+        Args:
+            db: DatabaseManager used by the persistence stage
+            target_username: Twitter username being tracked
+            scan_index: ScanIndex owned by the normalization stage
+            generation_id: Full sweep generation that observed usernames are staged for
+            batch_size: New followers per add_followers call
+            observation_batch_size: Usernames per record_observations call
+            stop_after_existing: Consecutive existing followers after which the
+                scan has caught up with earlier scans, None to never stop
+            queue_size: Steps buffered between extraction and normalization
+            recent_size: Recently seen usernames kept for checkpoints
+            resumed_seen: Followers already processed before a resumed sweep
+        """
+        self.db = db
+        self.target_username = target_username
+        self.scan_index = scan_index
+        self.generation_id = generation_id
+        self.batch_size = batch_size
+        self.observation_batch_size = observation_batch_size
+        self.stop_after_existing = stop_after_existing
+        self.resumed_seen = resumed_seen
+        
+        self.normalize_queue = queue.Queue(maxsize=queue_size)
+        self.write_queue = queue.Queue(maxsize=max(2, queue_size // 8))
+        self.extraction = PipelineStage('extraction')
+        self.normalization = PipelineStage('normalization', self.normalize_queue)
+        self.persistence = PipelineStage('persistence', self.write_queue)
+        
+        self.followers_seen = 0
+        self.new_followers = 0
+        self.consecutive_existing = 0
+        self.reached_known = False
+        self.recent_usernames = deque(maxlen=recent_size)
+        self.observed_batch = []
+        self.closed = threading.Event()
+        self._closing = False
+        self._lock = threading.Lock()
+        
+        self._normalizer = threading.Thread(target=self._normalize_loop, name=f"normalize:{target_username}")
+        self._writer = threading.Thread(target=self._persist_loop, name=f"persist:{target_username}")
+        for thread in (self._normalizer, self._writer):
+            thread.daemon = True
+            thread.start()
+            
+    def submit(self, rows: List[tuple], position: int, seconds: float = 0.0):
+        """Hand one scroll step's (display_name, username[, user_id]) rows to the pipeline
+        
+        Blocks while the normalization queue is full.
+        """
+        if self._closing:
+            return
+        self.extraction.record(len(rows), seconds)
+        self.normalize_queue.put(('rows', rows, position))
+        
+    def checkpoint(self, position: int):
+        """Save a sweep checkpoint once everything submitted so far is written"""
+        if self._closing or self.generation_id is None:
+            return
+        self.normalize_queue.put(('checkpoint', position))
+        
+    def progress(self):
+        """Return (followers_seen, new_followers) as normalized so far"""
+        with self._lock:
+            return self.followers_seen, self.new_followers
+            
+    def wait_normalized(self):
+        """Wait until every submitted step has been classified"""
+        self.normalize_queue.join()
+        
+    def close(self):
+        """Flush the last batches and stop both worker threads"""
+        with self._lock:
+            already_closing, self._closing = self._closing, True
+            
+        if not already_closing:
+            self.normalize_queue.put(self._STOP)
+        self._normalizer.join()
+        self._writer.join()
+        self.closed.set()
+        
+    def metrics(self) -> List[Dict[str, Any]]:
+        """Throughput and queue depth of every stage"""
+        return [stage.metrics() for stage in (self.extraction, self.normalization, self.persistence)]
+        
+    def _normalize_loop(self):
+        while True:
+            item = self.normalize_queue.get()
+            try:
+                if item is self._STOP:
+                    try:
+                        self._flush(final=True)
+                    except Exception as e:
+                        print(f"Error flushing followers: {str(e)}")
+                    self.write_queue.put(self._STOP)
+                    return
+                    
+                started = time.time()
+                if item[0] == 'rows':
+                    processed = self._normalize(item[1], item[2])
+                    self.normalization.record(processed, time.time() - started)
+                elif item[0] == 'checkpoint':
+                    self._flush()
+                    with self._lock:
+                        followers_seen = self.resumed_seen + self.followers_seen
+                    self.write_queue.put(('checkpoint', item[1], list(self.recent_usernames), followers_seen))
+                    
+            except Exception as e:
+                print(f"Error normalizing followers: {str(e)}")
+            finally:
+                self.normalize_queue.task_done()
+                
+    def _normalize(self, rows: List[tuple], position: int) -> int:
+        """Classify one step's rows and queue full batches for writing"""
+        fresh_count = 0
+        
+        for row in rows:
+            display_name, username = row[0], row[1]
+            if self.reached_known:
+                break
+            if not username or not display_name:
+                continue
+                
+            username = username.lstrip('@')
+            follower_info = {
+                'display_name': display_name,
+                'username': username
+            }
+            # Account ids from network mode match ids imported from follower.js
+            if len(row) > 2 and row[2]:
+                follower_info['user_id'] = row[2]
+            status = self.scan_index.observe(follower_info)
+            if status == self.scan_index.DUPLICATE:
+                continue
+                
+            fresh_count += 1
+            self.recent_usernames.append(username)
+            with self._lock:
+                self.followers_seen += 1
+                if status == self.scan_index.NEW:
+                    self.new_followers += 1
+            
+            # Stream observed usernames to the sweep's staging set
+            if self.generation_id is not None:
+                self.observed_batch.append(username)
+                if len(self.observed_batch) >= self.observation_batch_size:
+                    self.write_queue.put(('observations', self.observed_batch))
+                    self.observed_batch = []
+                    
+            if status == self.scan_index.NEW:
+                print(f"[NEW] Found follower: {display_name} (@{username})")
+                self.consecutive_existing = 0
+                if self.scan_index.pending_count >= self.batch_size:
+                    self.write_queue.put(('followers', self.scan_index.take_pending()))
+            else:
+                print(f"[EXISTING] Found follower: {display_name} (@{username})")
+                self.consecutive_existing += 1
+                
+                if self.stop_after_existing and self.consecutive_existing >= self.stop_after_existing:
+                    print(f"\nFound {self.stop_after_existing} consecutive existing followers")
+                    print("Assuming we've reached previously scanned followers, stopping scan...")
+                    self.reached_known = True
+                    
+        if fresh_count:
+            print(f"Found {fresh_count} new visible followers at position {position}")
+        return len(rows)
+        
+    def _flush(self, final: bool = False):
+        """Queue whatever is pending, however small"""
+        if self.scan_index.pending_count:
+            batch = self.scan_index.take_pending()
+            if final:
+                print(f"Saving final batch of {len(batch)} followers...")
+            self.write_queue.put(('followers', batch))
+        if self.observed_batch:
+            self.write_queue.put(('observations', self.observed_batch))
+            self.observed_batch = []
+            
+    def _persist_loop(self):
+        while True:
+            item = self.write_queue.get()
+            try:
+                if item is self._STOP:
+                    return
+                    
+                started = time.time()
+                if item[0] == 'followers':
+                    self.db.add_followers(self.target_username, item[1], int(time.time()))
+                    print(f"Saved batch of {len(item[1])} followers")
+                elif item[0] == 'observations':
+                    self.db.record_observations(self.generation_id, item[1])
+                elif item[0] == 'checkpoint':
+                    self.db.save_checkpoint(self.target_username, self.generation_id, item[1], item[2], item[3])
+                self.persistence.record(len(item[1]) if item[0] != 'checkpoint' else 0, time.time() - started)
+                
+            except Exception as e:
+                print(f"Error persisting followers: {str(e)}")
+            finally:
+                self.write_queue.task_done()
@@ -0,0 +1,415 @@
+import os
+import time
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any
+from twitter_checker import TwitterFollowerTracker
+from database import DatabaseManager
+from browser_session import ProfileLock
+
+# Chrome files that must not be copied into a worker profile
+PROFILE_COPY_IGNORE = shutil.ignore_patterns(
+    'Singleton*', 'lockfile', 'LOCK', 'Cache', 'Code Cache', 'GPUCache', 'Service Worker'
+)
+
+# Profile files that change when the user logs in again
+PROFILE_STATE_FILES = ('Local State', 'Default/Cookies', 'Default/Network/Cookies', 'Default/Login Data')
+
+# Written into a worker profile, holds the base profile's state time it was copied at
+PROFILE_COPY_MARKER = '.copied_from'
+
+def profile_state_time(profile_dir: Path) -> float:
+    """Latest modification time of a profile's login state files"""
+    times = [(profile_dir / name).stat().st_mtime for name in PROFILE_STATE_FILES if (profile_dir / name).exists()]
+    return max(times, default=0.0)
+
+class ScanTarget:
+    """A tracked account and its scheduling state"""
+    
+    def __init__(self, username: str, interval: int, priority: int = 0, adaptive: bool = True):
+        """Initialize the scan target
+        
+        Args:
+            username: Twitter username being tracked
+            interval: Seconds between scans of this target, the starting point
+                when the interval is adaptive
+            priority: Targets with a higher priority are scanned first when several are due
+            adaptive: Let the scheduler's policy change the interval
+        """
+        self.username = username
+        self.base_interval = interval
+        self.interval = interval
+        self.desired_interval = interval
+        self.priority = priority
+        self.adaptive = adaptive
+        self.rate_per_hour = None
+        self.decision = 'fixed interval' if not adaptive else 'waiting for first scan'
+        self.next_due = time.time()
+        self.last_finished = None
+        self.status = 'queued'
+        self.worker = None
+        self.last_scan = None
+        self.last_duration = None
+        self.last_new_followers = None
+        self.last_followers_per_sec = None
+        self.last_error = None
+        self.scan_count = 0
+        
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'username': self.username,
+            'interval': self.interval,
+            'adaptive': self.adaptive,
+            'rate_per_hour': round(self.rate_per_hour, 2) if self.rate_per_hour is not None else None,
+            'decision': self.decision,
+            'priority': self.priority,
+            'status': self.status,
+            'worker': self.worker,
+            'next_scan': datetime.fromtimestamp(self.next_due).strftime('%Y-%m-%d %H:%M:%S'),
+            'last_scan': self.last_scan,
+            'last_duration': self.last_duration,
+            'last_new_followers': self.last_new_followers,
+            'last_followers_per_sec': self.last_followers_per_sec,
+            'last_error': self.last_error,
+            'scan_count': self.scan_count
+        }
+
+def parse_targets(spec: str, default_interval: int) -> List[ScanTarget]:
+    """Parse a TARGET_USERNAMES value
+    
+    Entries are comma separated as ``username[:interval_minutes[:priority]]``,
+    e.g. ``alice,bob:10,carol:30:2``. Targets given an explicit interval keep
+    it; the others start at the default and are scheduled adaptively.
+    
+    Args:
+        spec: Target list from the environment
+        default_interval: Seconds between scans when an entry has no interval
+        
+    Returns:
+        List of scan targets
+    """
+    targets = []
+    for entry in spec.split(','):
+        parts = [part.strip() for part in entry.strip().split(':')]
+        if not parts[0]:
+            continue
+        fixed = len(parts) > 1 and bool(parts[1])
+        interval = int(float(parts[1]) * 60) if fixed else default_interval
+        priority = int(parts[2]) if len(parts) > 2 and parts[2] else 0
+        targets.append(ScanTarget(parts[0].lstrip('@'), interval, priority, adaptive=not fixed))
+    return targets
+    
+class AdaptiveScanPolicy:
+    """Picks scan intervals from each target's observed new-follower rate
+    
+    A target is scanned about as often as it takes to gain ``target_new``
+    followers, within the min/max bounds. The rate is the higher of a short
+    and a long window, so a burst shortens the interval straight away while
+    a quiet day lengthens it gradually. When the scans of all targets would
+    need more browser time than the budget allows, every interval is
+    stretched by the same factor.
+    """
+    
+    def __init__(self, min_interval: int = None, max_interval: int = None, target_new: float = None,
+                 budget_minutes: float = None, short_window: float = 1, long_window: float = 24):
+        """Initialize the policy
+        
+        Args:
+            min_interval: Shortest interval in seconds
+            max_interval: Longest interval in seconds
+            target_new: New followers a scan should find on average
+            budget_minutes: Browser-minutes per hour all targets may use, 0 for no limit
+            short_window: Hours of history for the burst rate
+            long_window: Hours of history for the baseline rate
+        """
+        if min_interval is None:
+            min_interval = int(float(os.getenv('SCAN_MIN_INTERVAL_MINUTES', '2')) * 60)
+        if max_interval is None:
+            max_interval = int(float(os.getenv('SCAN_MAX_INTERVAL_MINUTES', '60')) * 60)
+        if target_new is None:
+            target_new = float(os.getenv('SCAN_TARGET_NEW_FOLLOWERS', '5'))
+        if budget_minutes is None:
+            budget_minutes = float(os.getenv('SCAN_BUDGET_MINUTES_PER_HOUR', '0'))
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.target_new = target_new
+        self.budget_minutes = budget_minutes
+        self.short_window = short_window
+        self.long_window = long_window
+        self.demand_minutes = 0.0
+        self.budget_factor = 1.0
+        self.db = DatabaseManager()
+        
+    def estimate_rate(self, username: str) -> float:
+        """New followers per hour, or None before the first full sweep has finished"""
+        short_rate = self.db.get_new_follower_rate(username, self.short_window)
+        long_rate = self.db.get_new_follower_rate(username, self.long_window)
+        if short_rate is None or long_rate is None:
+            return None
+        return max(short_rate, long_rate)
+        
+    def choose_interval(self, target: ScanTarget, rate: float):
+        """Work out a target's interval before the budget is applied
+        
+        Returns:
+            tuple: (interval in seconds, human readable reason)
+        """
+        if not target.adaptive:
+            return target.base_interval, 'fixed interval'
+        if rate is None:
+            interval = min(max(target.base_interval, self.min_interval), self.max_interval)
+            return interval, 'default interval until the first full sweep finishes'
+        if rate <= 0:
+            return self.max_interval, f"no new followers in {self.long_window:g}h, using the maximum"
+            
+        ideal = int(self.target_new / rate * 3600)
+        interval = min(max(ideal, self.min_interval), self.max_interval)
+        reason = f"{rate:.1f} new/h, about {self.target_new:g} per scan"
+        if ideal < self.min_interval:
+            reason += ", held at the minimum"
+        elif ideal > self.max_interval:
+            reason += ", held at the maximum"
+        return interval, reason
+        
+    def apply_budget(self, targets: List[ScanTarget]):
+        """Stretch all intervals when the expected browser time exceeds the budget
+        
+        A target's cost is its last scan duration, or a minute before it has one.
+        """
+        self.demand_minutes = sum(
+            (target.last_duration or 60) / 60 * 3600 / target.desired_interval
+            for target in targets
+        )
+        self.budget_factor = 1.0
+        if self.budget_minutes > 0 and self.demand_minutes > self.budget_minutes:
+            self.budget_factor = self.demand_minutes / self.budget_minutes
+            
+        for target in targets:
+            target.interval = int(target.desired_interval * self.budget_factor)
+            
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'min_interval': self.min_interval,
+            'max_interval': self.max_interval,
+            'target_new': self.target_new,
+            'budget_minutes': self.budget_minutes,
+            'demand_minutes': round(self.demand_minutes, 1),
+            'budget_factor': round(self.budget_factor, 2)
+        }
+
+class ScanScheduler:
+    def __init__(self, targets: List[ScanTarget], workers: int = 2, profile_dir: str = "data/chrome_profiles",
+                 policy: AdaptiveScanPolicy = None):
+        """Initialize the scan scheduler
+        
+        Args:
+            targets: Accounts to scan
+            workers: Maximum number of concurrent browser sessions
+            profile_dir: Logged-in Chrome profile; extra workers get copies of it
+            policy: Chooses intervals after every scan; None keeps the configured intervals
+        """
+        self.targets = targets
+        self.policy = policy
+        for target in self.targets:
+            target.worker = None
+            target.status = 'queued'
+        self.worker_count = max(1, min(workers, len(targets)))
+        self.profile_dir = profile_dir
+        self.should_exit = False
+        self.trackers = {}
+        self._condition = threading.Condition()
+        
+    def worker_profile_dir(self, worker_id: int) -> str:
+        """Return the Chrome profile directory for a worker
+        
+        Chrome locks a profile directory while it runs, so every worker after
+        the first gets its own copy of the logged-in profile. The copy is made
+        again when the base profile's login state is newer than the copy, but
+        only while no browser holds the base profile.
+        """
+        if worker_id == 0:
+            return self.profile_dir
+            
+        base_dir = Path(self.profile_dir)
+        worker_dir = base_dir.parent / f"{base_dir.name}_worker{worker_id}"
+        if not base_dir.exists():
+            return str(worker_dir)
+            
+        base_time = profile_state_time(base_dir)
+        marker = worker_dir / PROFILE_COPY_MARKER
+        try:
+            copied_time = float(marker.read_text())
+        except (OSError, ValueError):
+            copied_time = None
+        if copied_time is not None and copied_time >= base_time:
+            return str(worker_dir)
+            
+        action = "Refreshing" if worker_dir.exists() else "Copying"
+        print(f"{action} Chrome profile for worker {worker_id}...")
+        if ProfileLock.for_profile(self.profile_dir).copy_to(str(worker_dir), PROFILE_COPY_IGNORE):
+            marker.write_text(str(base_time))
+        else:
+            kept = "keeping its old copy" if worker_dir.exists() else "it has no copy"
+            print(f"Chrome profile {self.profile_dir} is in use, not copied for worker {worker_id}; {kept}")
+        return str(worker_dir)
+        
+    def get_status(self) -> List[Dict[str, Any]]:
+        """Get scheduling state and latest results for every target"""
+        with self._condition:
+            targets = sorted(self.targets, key=lambda target: (-target.priority, target.username))
+            return [target.to_dict() for target in targets]
+            
+    def get_policy_status(self) -> Dict[str, Any]:
+        """Get the bounds and budget use of the scheduling policy, or None"""
+        with self._condition:
+            return self.policy.to_dict() if self.policy else None
+            
+    def reschedule(self, rates: Dict[str, float]):
+        """Apply the policy to every target's interval
+        
+        Must be called with the condition held. Idle targets that have been
+        scanned before are moved to their last scan plus the new interval.
+        
+        Args:
+            rates: Latest new-follower rate per username
+        """
+        for target in self.targets:
+            if target.username in rates:
+                target.rate_per_hour = rates[target.username]
+            target.desired_interval, target.decision = self.policy.choose_interval(target, target.rate_per_hour)
+            
+        self.policy.apply_budget(self.targets)
+        if self.policy.budget_factor > 1:
+            for target in self.targets:
+                target.decision += f", stretched x{self.policy.budget_factor:.1f} by the scan budget"
+                
+        for target in self.targets:
+            if target.worker is None and target.last_finished is not None:
+                target.next_due = target.last_finished + target.interval
+        self._condition.notify_all()
+        
+    def _next_target(self, worker_id: int):
+        """Wait for the next due target and claim it for a worker
+        
+        Among due targets the highest priority wins, then the most overdue.
+        """
+        with self._condition:
+            while not self.should_exit:
+                now = time.time()
+                idle = [target for target in self.targets if target.worker is None]
+                due = [target for target in idle if target.next_due <= now]
+                
+                if due:
+                    target = max(due, key=lambda target: (target.priority, now - target.next_due))
+                    target.worker = worker_id
+                    target.status = 'scanning'
+                    return target
+                    
+                wait = min((target.next_due for target in idle), default=now + 60) - now
+                self._condition.wait(timeout=max(0.1, min(wait, 60)))
+                
+            return None
+            
+    def _finish(self, target: ScanTarget, started: float, new_followers: int = None, error: str = None,
+                stats: Dict[str, Any] = None):
+        """Record a scan result and schedule the target again"""
+        rate = self.policy.estimate_rate(target.username) if self.policy else None
+        
+        with self._condition:
+            target.worker = None
+            target.scan_count += 1
+            target.last_scan = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            target.last_duration = round(time.time() - started, 1)
+            target.last_error = error
+            target.status = 'error' if error else 'idle'
+            if new_followers is not None:
+                target.last_new_followers = new_followers
+            if stats:
+                target.last_followers_per_sec = stats.get('followers_per_sec')
+            target.last_finished = time.time()
+            if self.policy:
+                self.reschedule({target.username: rate})
+            target.next_due = target.last_finished + target.interval
+            self._condition.notify_all()
+            
+    def _worker_loop(self, worker_id: int, profile_dir: str):
+        """Scan due targets with one browser session until stopped"""
+        tracker = TwitterFollowerTracker(
+            self.targets[0].username,
+            profile_dir=profile_dir
+        )
+        self.trackers[worker_id] = tracker
+        
+        if not tracker.setup_driver():
+            print(f"Worker {worker_id}: failed to set up WebDriver")
+            return
+        if not tracker.check_login():
+            print(f"Worker {worker_id}: not logged in")
+            tracker.stop()
+            return
+            
+        while not self.should_exit:
+            target = self._next_target(worker_id)
+            if target is None:
+                break
+                
+            print(f"\nWorker {worker_id}: scanning @{target.username}")
+            tracker.target_username = target.username
+            last_stats = tracker.scan_stats[-1] if tracker.scan_stats else None
+            started = time.time()
+            
+            try:
+                new_followers = tracker.scan_followers()
+                stats = tracker.scan_stats[-1] if tracker.scan_stats and tracker.scan_stats[-1] is not last_stats else None
+                self._finish(target, started, new_followers=new_followers, stats=stats)
+                
+            except Exception as e:
+                print(f"Worker {worker_id}: error scanning @{target.username}: {str(e)}")
+                self._finish(target, started, error=str(e))
+                if self.should_exit:
+                    break
+                if not tracker.recover_driver() or not tracker.check_login():
+                    print(f"Worker {worker_id}: failed to recover WebDriver")
+                    break
+                    
+        if not tracker.should_exit:
+            tracker.stop()
+            
+    def stop(self):
+        """Stop all workers"""
+        print("Stopping scan scheduler...")
+        with self._condition:
+            self.should_exit = True
+            self._condition.notify_all()
+        for tracker in list(self.trackers.values()):
+            try:
+                tracker.stop()
+            except:
+                pass
+                
+    def run(self):
+        """Run scans across the worker pool until stopped"""
+        print(f"Starting scan scheduler for {len(self.targets)} targets with {self.worker_count} workers")
+        
+        if self.policy:
+            rates = {target.username: self.policy.estimate_rate(target.username) for target in self.targets}
+            with self._condition:
+                self.reschedule(rates)
+        
+        # Copy profiles before worker 0's Chrome takes the base profile
+        profile_dirs = [self.worker_profile_dir(worker_id) for worker_id in range(self.worker_count)]
+        
+        workers = []
+        for worker_id in range(self.worker_count):
+            worker = threading.Thread(target=self._worker_loop, args=(worker_id, profile_dirs[worker_id]))
+            worker.daemon = True
+            worker.start()
+            workers.append(worker)
+            
+        for worker in workers:
+            worker.join()
+            
+        self.should_exit = True
+        print("Scan scheduler stopped.")
@@ -1,273 +1,873 @@
 import os
+import re
+import json
 import time
+import base64
+from collections import deque, OrderedDict, defaultdict
+from contextlib import contextmanager
 from datetime import datetime
-from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException, StaleElementReferenceException
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
 from database import DatabaseManager
+from browser_session import BrowserSession
+from scan_pipeline import ScanPipeline, PIPELINE_DRAIN_TIMEOUT
 from pathlib import Path
 
+# Viewport visibility test used by the per-element extraction mode. Cells
+# that are only partly on screen count as visible so that scrolling a whole
+# viewport at a time does not skip cells straddling the edges.
+IS_VISIBLE_JS = """
+    var elem = arguments[0];
+    var rect = elem.getBoundingClientRect();
+    return (
+        rect.bottom > 0 &&
+        rect.right > 0 &&
+        rect.top < (window.innerHeight || document.documentElement.clientHeight) &&
+        rect.left < (window.innerWidth || document.documentElement.clientWidth)
+    );
+"""
+
+# Reads every visible follower cell in a single round trip. Returns the total
+# number of rendered cells and a [display_name, username] row per visible
+# cell, using the same selectors as the per-element extraction mode.
+EXTRACT_VISIBLE_CELLS_JS = """
+    var cells = document.querySelectorAll('[data-testid="UserCell"]');
+    var viewHeight = window.innerHeight || document.documentElement.clientHeight;
+    var viewWidth = window.innerWidth || document.documentElement.clientWidth;
+    var rows = [];
+    for (var i = 0; i < cells.length; i++) {
+        var rect = cells[i].getBoundingClientRect();
+        if (rect.bottom <= 0 || rect.right <= 0 || rect.top >= viewHeight || rect.left >= viewWidth) {
+            continue;
+        }
+        var nameElem = cells[i].querySelector('div[dir="ltr"] span.css-1jxf684 span.css-1jxf684');
+        var userElem = cells[i].querySelector('div[dir="ltr"][class*="r-1wvb978"] span.css-1jxf684');
+        rows.push([
+            nameElem ? nameElem.innerText.trim() : '',
+            userElem ? userElem.innerText.trim() : ''
+        ]);
+    }
+    return {total: cells.length, rows: rows};
+"""
+
+# Followers timeline requests issued by the page while it scrolls
+FOLLOWERS_API_PATTERN = re.compile(r'/i/api/graphql/[^/]+/Followers(\?|$)')
+
+# Counts timeline cells added to the page. Installed once per page load.
+INSTALL_CELL_OBSERVER_JS = """
+    if (!window.__followerCellObserver) {
+        var firstCell = document.querySelector('[data-testid="cellInnerDiv"]');
+        var timeline = firstCell ? firstCell.parentElement : document.body;
+        window.__followerCellsAdded = 0;
+        window.__followerCellObserver = new MutationObserver(function (mutations) {
+            for (var i = 0; i < mutations.length; i++) {
+                var nodes = mutations[i].addedNodes;
+                for (var j = 0; j < nodes.length; j++) {
+                    var node = nodes[j];
+                    if (node.nodeType === 1 && (node.matches('[data-testid="cellInnerDiv"]') ||
+                            node.querySelector('[data-testid="cellInnerDiv"]'))) {
+                        window.__followerCellsAdded++;
+                    }
+                }
+            }
+        });
+        window.__followerCellObserver.observe(timeline, {childList: true, subtree: timeline === document.body});
+    }
+    return window.__followerCellsAdded;
+"""
+
+# Scrolls one viewport down and resolves as soon as the observer sees new
+# cells, or when the timeout passes. Runs as an async script so a whole
+# scroll step costs a single round trip.
+SCROLL_AND_WAIT_JS = """
+    var timeoutMs = arguments[0];
+    var done = arguments[arguments.length - 1];
+    var baseline = window.__followerCellsAdded || 0;
+    var started = performance.now();
+    window.scrollBy(0, window.innerHeight);
+    (function poll() {
+        var added = (window.__followerCellsAdded || 0) - baseline;
+        var waited = performance.now() - started;
+        if (added > 0 || waited >= timeoutMs) {
+            var height = document.body.scrollHeight;
+            done({
+                added: added,
+                waited_ms: Math.round(waited),
+                position: window.pageYOffset,
+                height: height,
+                at_bottom: window.pageYOffset + window.innerHeight >= height - 2
+            });
+            return;
+        }
+        setTimeout(poll, 25);
+    })();
+"""
+
+# Requests blocked in lean mode: we only need the text of follower cells
+LEAN_BLOCKED_URLS = [
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.avif', '*.ico',
+    '*.mp4', '*.m3u8', '*.m4s', '*.webm',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*pbs.twimg.com/*', '*video.twimg.com/*', '*abs-0.twimg.com/emoji/*',
+    '*google-analytics.com/*', '*googletagmanager.com/*', '*doubleclick.net/*',
+    '*ads-twitter.com/*', '*ads-api.x.com/*', '*/i/api/1.1/jot/*', '*/1.1/jot/*'
+]
+
+# Chrome features a text-only headless scan does not need
+LEAN_CHROME_ARGS = [
+    '--headless=new',
+    '--blink-settings=imagesEnabled=false',
+    '--mute-audio',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-notifications',
+    '--disable-domain-reliability',
+    '--disable-client-side-phishing-detection',
+    '--metrics-recording-only',
+    '--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication,InterestFeedContentSuggestions'
+]
+
+# Jumps towards a saved scroll offset without reading any cells and resolves
+# once the page has loaded more of the timeline, one of the usernames last
+# seen before the checkpoint is rendered, or the timeout passes.
+FAST_FORWARD_STEP_JS = """
+    var targetOffset = arguments[0];
+    var usernames = arguments[1];
+    var timeoutMs = arguments[2];
+    var done = arguments[arguments.length - 1];
+    var goal = Math.max(0, targetOffset - window.innerHeight);
+    var startHeight = document.body.scrollHeight;
+    var started = performance.now();
+    window.scrollTo(0, Math.min(goal, startHeight));
+    function findMarker() {
+        var links = document.querySelectorAll('[data-testid="UserCell"] a[href^="/"]');
+        for (var i = 0; i < links.length; i++) {
+            var handle = links[i].getAttribute('href').slice(1).toLowerCase();
+            if (usernames.indexOf(handle) !== -1) {
+                return handle;
+            }
+        }
+        return null;
+    }
+    (function poll() {
+        var height = document.body.scrollHeight;
+        var marker = findMarker();
+        if (marker || height > startHeight || performance.now() - started >= timeoutMs) {
+            done({
+                marker: marker,
+                position: window.pageYOffset,
+                reached: window.pageYOffset >= goal,
+                grew: height > startHeight
+            });
+            return;
+        }
+        setTimeout(poll, 50);
+    })();
+"""
+
+AT_BOTTOM_JS = "return window.pageYOffset + window.innerHeight >= document.body.scrollHeight - 2"
+
+EXTRACTION_MODES = ('script', 'element', 'network')
+OBSERVATION_BATCH_SIZE = 500
+PACING_MODES = ('adaptive', 'fixed')
+CHECKPOINT_INTERVAL = 30  # Seconds between saved resume points of a full sweep
+CHECKPOINT_USERNAMES = 20
+# Phases timed for scan_metrics; the database phase overlaps scrolling
+# because the scan pipeline writes in the background
+SCAN_PHASES = ('driver_setup', 'login_check', 'navigation', 'scroll', 'extraction', 'database', 'sleep')
+
+def parse_followers_response(payload) -> list:
+    """Extract users from a followers timeline GraphQL response
+    
+    Args:
+        payload: Decoded JSON body of a Followers request
+        
+    Returns:
+        List of follower dictionaries with user_id, display_name and username,
+        in timeline order
+    """
+    followers = []
+    pending = [payload]
+    
+    # Walk the response depth first, keeping document order, and pick up every
+    # user_results entry regardless of which timeline layout wraps it
+    while pending:
+        node = pending.pop()
+        if isinstance(node, dict):
+            user_results = node.get('user_results')
+            user = user_results.get('result') if isinstance(user_results, dict) else None
+            if user and user.get('__typename', 'User') == 'User':
+                legacy = user.get('legacy', {})
+                core = user.get('core', {})
+                username = core.get('screen_name') or legacy.get('screen_name')
+                display_name = core.get('name') or legacy.get('name')
+                if username:
+                    followers.append({
+                        'user_id': user.get('rest_id'),
+                        'display_name': display_name or username,
+                        'username': username
+                    })
+                continue
+            pending.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            pending.extend(reversed(node))
+            
+    return followers
+
+class ScrollPacer:
+    """Advances the followers timeline one viewport at a time
+    
+    Waits only until the page renders new cells. The wait timeout doubles
+    while steps keep timing out (slow network) and shrinks back to the base
+    timeout once cells arrive promptly again.
+    """
+    
+    def __init__(self, driver, base_timeout: float = 1.0, max_timeout: float = 8.0):
+        self.driver = driver
+        self.base_timeout = base_timeout
+        self.max_timeout = max_timeout
+        self.timeout = base_timeout
+        self.waited = 0.0
+        
+    def install(self):
+        """Install the cell observer on the current page"""
+        self.driver.set_script_timeout(self.max_timeout + 5)
+        self.driver.execute_script(INSTALL_CELL_OBSERVER_JS)
+        self.timeout = self.base_timeout
+        
+    def advance(self) -> dict:
+        """Scroll one viewport down and wait for new cells
+        
+        Returns:
+            dict: added, waited_ms, position, height and at_bottom for the step
+        """
+        step = self.driver.execute_async_script(SCROLL_AND_WAIT_JS, int(self.timeout * 1000))
+        self.waited += step['waited_ms'] / 1000
+        
+        if step['added']:
+            self.timeout = max(self.base_timeout, self.timeout / 2)
+        else:
+            self.timeout = min(self.max_timeout, self.timeout * 2)
+            
+        return step
+        
+class ScanIndex:
+    """Username-keyed working state for a single scan
+    
+    Every lookup is a hash probe, so per-cell work stays constant however
+    many followers the scan has already passed. The recently-seen window is
+    bounded: the virtualized timeline only re-renders cells near the
+    viewport, so older usernames can be forgotten. Only usernames that are
+    new to the database are kept for the whole scan.
+    """
+    
+    NEW = 'new'
+    EXISTING = 'existing'
+    DUPLICATE = 'duplicate'
+    
+    def __init__(self, known_usernames, window: int = 2000):
+        """Initialize the scan index
+        
+        Args:
+            known_usernames: Usernames already stored for the target (a set or FollowerIndex)
+            window: Number of recently seen usernames kept for deduplication
+        """
+        self.known = known_usernames
+        self.window = window
+        self.seen = OrderedDict()
+        self.new = set()
+        self.pending = {}
+        
+    def observe(self, follower: dict) -> str:
+        """Classify a follower read from the page
+        
+        New followers are queued for the next batch write.
+        
+        Returns:
+            str: ScanIndex.NEW, ScanIndex.EXISTING or ScanIndex.DUPLICATE
+        """
+        username = follower['username']
+        
+        if username in self.seen:
+            self.seen.move_to_end(username)
+            return self.DUPLICATE
+        if username in self.new:
+            return self.DUPLICATE
+            
+        self.seen[username] = None
+        if len(self.seen) > self.window:
+            self.seen.popitem(last=False)
+            
+        if username in self.known:
+            return self.EXISTING
+            
+        self.new.add(username)
+        self.pending[username] = follower
+        return self.NEW
+        
+    @property
+    def pending_count(self) -> int:
+        return len(self.pending)
+        
+    @property
+    def new_count(self) -> int:
+        return len(self.new)
+        
+    def take_pending(self) -> list:
+        """Return the followers waiting to be saved and clear the batch"""
+        batch = list(self.pending.values())
+        self.pending = {}
+        return batch
+        
 class TwitterFollowerTracker:
-    def __init__(self, target_username: str, scan_interval: int = 60):
+    def __init__(self, target_username: str, scan_interval: int = 60, extraction_mode: str = None, pacing: str = None,
+                 profile_dir: str = "data/chrome_profiles", lean: bool = None, base_url: str = "https://x.com"):
         self.target_username = target_username
+        self.base_url = base_url.rstrip('/')
+        self.profile_dir = profile_dir
+        if lean is None:
+            lean = os.getenv('LEAN_BROWSER', '').lower() in ('1', 'true', 'yes')
+        self.lean = lean
         self.scan_interval = scan_interval
+        self.extraction_mode = extraction_mode or os.getenv('EXTRACTION_MODE', 'script')
+        if self.extraction_mode not in EXTRACTION_MODES:
+            raise ValueError(f"Unknown extraction mode: {self.extraction_mode}")
+        self.pacing = pacing or os.getenv('SCROLL_PACING', 'adaptive')
+        if self.pacing not in PACING_MODES:
+            raise ValueError(f"Unknown scroll pacing: {self.pacing}")
+        self.scan_stats = deque(maxlen=100)
         self.should_exit = False
-        self.driver = None
+        self.session = None
+        self.webdriver_calls = 0
+        self.pending_responses = {}
+        self.network_logging = self.extraction_mode == 'network' or self.lean
+        self.scan_bytes = 0
+        self.page_load_ms = None
+        self.full_sweep_interval = float(os.getenv('FULL_SWEEP_INTERVAL_HOURS', '24')) * 3600
+        self.scan_complete = False
+        self.last_sweep = None
+        self.pipeline = None
+        self.phase_ms = defaultdict(float)
+        self.metric_calls = 0
         self.db = DatabaseManager()
         
-    def setup_driver(self):
-        """Set up Chrome WebDriver with necessary options"""
+    @property
+    def driver(self):
+        """WebDriver of the current browser session, or None"""
+        return self.session.driver if self.session else None
+        
+    @contextmanager
+    def phase(self, name: str):
+        """Add the time spent in the block to a scan phase
+        
+        Phases accumulate until the next scan's metrics are saved, so browser
+        setup and login checks between scans count towards the following scan.
+        """
+        started = time.time()
         try:
-            options = Options()
-            
-            # Use Chrome profile directory
-            profile_dir = Path("data/chrome_profiles")
-            if not profile_dir.exists():
-                profile_dir.mkdir(parents=True, exist_ok=True)
-                
-            # Profile settings
-            options.add_argument(f'--user-data-dir={profile_dir.absolute()}')
-            options.add_argument('--profile-directory=Default')
+            yield
+        finally:
+            self.phase_ms[name] += (time.time() - started) * 1000
             
-            # Mobile emulation settings
-            mobile_emulation = {
-                "deviceMetrics": {
-                    "width": 360,
-                    "height": 640,
-                    "pixelRatio": 3.0
-                },
-                "userAgent": "Mozilla/5.0 (Linux; Android 12; SM-G991B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Mobile Safari/537.36"
-            }
-            options.add_experimental_option("mobileEmulation", mobile_emulation)
+    def setup_driver(self):
+        """Set up Chrome WebDriver with necessary options
+        
+        Starts the browser session on first use and restarts it afterwards.
+        """
+        with self.phase('driver_setup'):
+            if self.session is None:
+                self.session = BrowserSession(
+                    f"checker:{Path(self.profile_dir).name}",
+                    self.profile_dir,
+                    self.build_options,
+                    on_start=self.configure_driver
+                )
+                return self.session.start()
+            if self.session.driver is None:
+                return self.session.start()
+            return self.session.restart()
             
-            # Other necessary options
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_experimental_option('excludeSwitches', ['enable-automation'])
-            options.add_experimental_option('useAutomationExtension', False)
-            options.add_argument('--disable-extensions')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--no-first-run')
-            options.add_argument('--no-service-autorun')
-            options.add_argument('--password-store=basic')
+    def recover_driver(self):
+        """Recover the browser after an error, restarting Chrome only if needed"""
+        if self.session is None or self.session.driver is None:
+            return self.setup_driver()
+        with self.phase('driver_setup'):
+            return self.session.recover()
+        
+    def build_options(self) -> Options:
+        """Build Chrome options for the checker browser"""
+        options = Options()
+        
+        # Use Chrome profile directory
+        profile_dir = Path(self.profile_dir)
+        if not profile_dir.exists():
+            profile_dir.mkdir(parents=True, exist_ok=True)
             
-            if self.driver:
-                try:
-                    self.driver.quit()
-                except:
-                    pass
-                    
-            self.driver = webdriver.Chrome(options=options)
+        # Profile settings
+        options.add_argument(f'--user-data-dir={profile_dir.absolute()}')
+        options.add_argument('--profile-directory=Default')
+        
+        # Mobile emulation settings
+        mobile_emulation = {
+            "deviceMetrics": {
+                "width": 360,
+                "height": 640,
+                "pixelRatio": 3.0
+            },
+            "userAgent": "Mozilla/5.0 (Linux; Android 12; SM-G991B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Mobile Safari/537.36"
+        }
+        options.add_experimental_option("mobileEmulation", mobile_emulation)
+        
+        # Other necessary options
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_experimental_option('excludeSwitches', ['enable-automation'])
+        options.add_experimental_option('useAutomationExtension', False)
+        options.add_argument('--disable-extensions')
+        options.add_argument('--disable-gpu')
+        options.add_argument('--no-first-run')
+        options.add_argument('--no-service-autorun')
+        options.add_argument('--password-store=basic')
+        
+        # Headless text-only profile
+        if self.lean:
+            for argument in LEAN_CHROME_ARGS:
+                options.add_argument(argument)
+                
+        # Network capture mode reads follower pages from DevTools network events,
+        # lean mode uses them to count transferred bytes
+        if self.network_logging:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
             
-            # Additional settings to avoid detection
-            self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-                "userAgent": "Mozilla/5.0 (Linux; Android 12; SM-G991B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Mobile Safari/537.36"
-            })
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        return options
+        
+    def configure_driver(self, driver):
+        """Apply per-session settings to a freshly started browser"""
+        self._install_call_counter(driver)
+        
+        # Additional settings to avoid detection
+        driver.execute_cdp_cmd('Network.setUserAgentOverride', {
+            "userAgent": "Mozilla/5.0 (Linux; Android 12; SM-G991B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Mobile Safari/537.36"
+        })
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        
+        # Lets each scan read Chrome's JS heap size and DOM node count
+        driver.execute_cdp_cmd('Performance.enable', {})
+        
+        if self.network_logging:
+            driver.execute_cdp_cmd('Network.enable', {})
+            self.pending_responses = {}
             
+        if self.lean:
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+            print("Started headless Chrome in lean mode with saved profile")
+        else:
             print("Started Chrome in mobile mode with saved profile")
-            return True
             
-        except Exception as e:
-            print(f"Error setting up WebDriver: {str(e)}")
-            return False
+    def _install_call_counter(self, driver):
+        """Count every WebDriver command sent to the browser
+        
+        All driver and element commands go through ``driver.execute``, so
+        wrapping it gives the number of HTTP round trips to chromedriver.
+        """
+        original_execute = driver.execute
+        
+        def counting_execute(driver_command, params=None):
+            self.webdriver_calls += 1
+            return original_execute(driver_command, params)
             
+        driver.execute = counting_execute
+        
     def check_login(self):
         """Check if user is logged in"""
-        try:
-            current_url = self.driver.current_url
-            
-            # Check if we're on a logout URL
-            if "logout=" in current_url:
-                print("[INFO] Detected logout URL, attempting to re-login...")
-                self.driver.get("https://x.com/home")
-                time.sleep(2)
+        with self.phase('login_check'):
+            try:
+                current_url = self.driver.current_url
+                
+                # Check if we're on a logout URL
+                if "logout=" in current_url:
+                    print("[INFO] Detected logout URL, attempting to re-login...")
+                    self.driver.get(f"{self.base_url}/home")
+                    time.sleep(2)
+                
+                # Try to find login button
+                login_button = self.driver.find_elements(By.CSS_SELECTOR, '[data-testid="loginButton"]')
+                if login_button:
+                    print("[WARNING] Not logged in. Please log in manually...")
+                    # Wait for manual login
+                    while True:
+                        time.sleep(5)
+                        if not self.driver.find_elements(By.CSS_SELECTOR, '[data-testid="loginButton"]'):
+                            print("[INFO] Successfully logged in!")
+                            return True
+                        
+                        # Check if we're still on a logout URL
+                        current_url = self.driver.current_url
+                        if "logout=" in current_url:
+                            print("[INFO] Still on logout URL, redirecting to home...")
+                            self.driver.get(f"{self.base_url}/home")
+                            time.sleep(2)
+                            
+                return True
+                
+            except Exception as e:
+                print(f"[ERROR] Error checking login status: {str(e)}")
+                return False
             
-            # Try to find login button
-            login_button = self.driver.find_elements(By.CSS_SELECTOR, '[data-testid="loginButton"]')
-            if login_button:
-                print("[WARNING] Not logged in. Please log in manually...")
-                # Wait for manual login
-                while True:
-                    time.sleep(5)
-                    if not self.driver.find_elements(By.CSS_SELECTOR, '[data-testid="loginButton"]'):
-                        print("[INFO] Successfully logged in!")
-                        return True
+    def collect_visible_followers(self):
+        """Read the follower cells currently visible in the viewport
+        
+        Cells seen in earlier steps are returned again; deduplication is left
+        to the scan's ScanIndex.
+        
+        Returns:
+            tuple: (number of rendered cells, list of (display_name, username)),
+            in network mode (display_name, username, user_id)
+        """
+        if self.extraction_mode == 'element':
+            return self._collect_with_elements()
+        if self.extraction_mode == 'network':
+            return self._collect_from_network()
+        return self._collect_with_script()
+        
+    def drain_network_log(self) -> list:
+        """Drain DevTools network events
+        
+        Adds the size of every finished response to ``scan_bytes`` and, in
+        network capture mode, decodes finished followers responses.
+        
+        Returns:
+            List of decoded followers JSON payloads, in the order the requests finished
+        """
+        payloads = []
+        
+        for entry in self.driver.get_log('performance'):
+            try:
+                message = json.loads(entry['message'])['message']
+                method = message.get('method')
+                params = message.get('params', {})
+                
+                if method == 'Network.loadingFinished':
+                    self.scan_bytes += int(params.get('encodedDataLength', 0))
                     
-                    # Check if we're still on a logout URL
-                    current_url = self.driver.current_url
-                    if "logout=" in current_url:
-                        print("[INFO] Still on logout URL, redirecting to home...")
-                        self.driver.get("https://x.com/home")
-                        time.sleep(2)
+                if method == 'Network.responseReceived':
+                    if self.extraction_mode == 'network' and FOLLOWERS_API_PATTERN.search(params['response']['url']):
+                        self.pending_responses[params['requestId']] = params['response']['url']
                         
-            return True
-            
-        except Exception as e:
-            print(f"[ERROR] Error checking login status: {str(e)}")
-            return False
+                elif method == 'Network.loadingFinished' and params.get('requestId') in self.pending_responses:
+                    request_id = params['requestId']
+                    self.pending_responses.pop(request_id)
+                    response = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+                    body = response['body']
+                    if response.get('base64Encoded'):
+                        body = base64.b64decode(body).decode('utf-8')
+                    payloads.append(json.loads(body))
+                    
+                elif method == 'Network.loadingFailed':
+                    self.pending_responses.pop(params.get('requestId'), None)
+                    
+            except Exception as e:
+                print(f"Error reading followers response: {str(e)}")
+                continue
+                
+        return payloads
+        
+    def _collect_from_network(self):
+        """Take followers from the timeline responses the page downloaded"""
+        visible_followers = []
+        for payload in self.drain_network_log():
+            for follower in parse_followers_response(payload):
+                visible_followers.append((follower['display_name'], follower['username'], follower['user_id']))
+        return len(visible_followers), visible_followers
+        
+    def _collect_with_script(self):
+        """Extract visible cells with one injected script per scroll step"""
+        result = self.driver.execute_script(EXTRACT_VISIBLE_CELLS_JS) or {}
+        visible_followers = [(display_name, username) for display_name, username in result.get('rows', [])]
+        return result.get('total', 0), visible_followers
+        
+    def _collect_with_elements(self):
+        """Extract visible cells with separate WebDriver calls per cell"""
+        cells = self.driver.find_elements(By.CSS_SELECTOR, '[data-testid="UserCell"]')
+        
+        # Process only cells that are currently visible
+        visible_cells = []
+        for cell in cells:
+            try:
+                if self.driver.execute_script(IS_VISIBLE_JS, cell):
+                    visible_cells.append(cell)
+            except:
+                continue
+                
+        visible_followers = []
+        for cell in visible_cells:
+            try:
+                # Get display name and username using correct selectors
+                display_name_element = cell.find_element(
+                    By.CSS_SELECTOR,
+                    'div[dir="ltr"] span.css-1jxf684 span.css-1jxf684'
+                )
+                display_name = display_name_element.text.strip()
+                
+                username_element = cell.find_element(
+                    By.CSS_SELECTOR,
+                    'div[dir="ltr"][class*="r-1wvb978"] span.css-1jxf684'
+                )
+                username = username_element.text.strip()
+                visible_followers.append((display_name, username))
+            except Exception as e:
+                print(f"Error processing follower: {str(e)}")
+                continue
+                
+        return len(cells), visible_followers
+        
+    def scroll_to_bottom(self, generation_id: int = None, checkpoint: dict = None):
+        """Scroll to bottom of page and wait for content to load
         
-    def scroll_to_bottom(self):
-        """Scroll to bottom of page and wait for content to load"""
+        Followers read at each step go through a ScanPipeline, so cleaning,
+        deduplication and database writes run alongside the scrolling.
+        
+        Args:
+            generation_id: Full sweep generation; when set every observed username
+                is staged for reconciliation and the scan does not stop at
+                previously seen followers
+            checkpoint: Saved resume point of the sweep; the page is fast-forwarded
+                to it before reading followers
+                
+        Returns:
+            int: Number of new followers found
+        """
         print("Starting to scroll and load followers...")
+        full_sweep = generation_id is not None
+        self.scan_complete = False
         last_height = self.driver.execute_script("return document.body.scrollHeight")
-        processed_positions = set()  # Track processed positions
+        steps = 0
+        seen_any = False
         max_count = 0
         no_new_count = 0
-        consecutive_existing = 0  # Count consecutive existing followers
         MAX_NO_NEW = 5
         MAX_CONSECUTIVE_EXISTING = 10  # Stop after finding 10 consecutive existing followers
+        MAX_IDLE_AT_BOTTOM = 3  # Adaptive pacing: empty waits at the bottom before stopping
         scroll_pause_time = 2
         scroll_step = 300
+        idle_at_bottom = 0
+        last_seen = 0
+        last_new = 0
+        started = time.time()
         
-        # Initialize batch variables
-        current_batch = []
-        batch_size = 100
-        all_followers = []
+        # Resume points are only kept for full sweeps: an incremental scan
+        # has to start from the top, where new followers appear
+        current_position = 0
+        last_checkpoint = time.time()
+        if checkpoint:
+            with self.phase('scroll'):
+                self.fast_forward(checkpoint)
+            current_position = self.driver.execute_script("return window.pageYOffset")
+            last_height = self.driver.execute_script("return document.body.scrollHeight")
         
-        # Load existing followers from database for comparison
-        existing_followers = {f['username'] for f in self.db.get_all_followers(self.target_username)}
-        print(f"Loaded {len(existing_followers)} existing followers from database")
+        pacer = None
+        if self.pacing == 'adaptive':
+            pacer = ScrollPacer(self.driver)
+            pacer.install()
         
-        while True:
-            if self.should_exit:
-                break
-                
-            try:
-                # Get current scroll position
-                current_position = self.driver.execute_script("return window.pageYOffset")
-                
-                # Get all visible followers at current position
-                cells = self.driver.find_elements(By.CSS_SELECTOR, '[data-testid="UserCell"]')
-                current_count = len(cells)
-                
-                # Process only cells that are currently visible and not processed
-                visible_cells = []
-                for cell in cells:
-                    try:
-                        # Check if cell is visible in viewport
-                        is_visible = self.driver.execute_script("""
-                            var elem = arguments[0];
-                            var rect = elem.getBoundingClientRect();
-                            return (
-                                rect.top >= 0 &&
-                                rect.left >= 0 &&
-                                rect.bottom <= (window.innerHeight || document.documentElement.clientHeight) &&
-                                rect.right <= (window.innerWidth || document.documentElement.clientWidth)
-                            );
-                        """, cell)
-                        
-                        if is_visible:
-                            cell_position = cell.location['y']
-                            if cell_position not in processed_positions:
-                                visible_cells.append(cell)
-                                processed_positions.add(cell_position)
-                    except:
-                        continue
-                
-                if visible_cells:
-                    print(f"Found {len(visible_cells)} new visible followers at position {current_position}")
+        # Compare against the process-wide index of stored followers
+        existing_followers = self.db.follower_index(self.target_username)
+        print(f"Follower index has {len(existing_followers)} existing followers")
+        scan_index = ScanIndex(existing_followers)
+        
+        pipeline = ScanPipeline(
+            self.db,
+            self.target_username,
+            scan_index,
+            generation_id=generation_id,
+            batch_size=100,
+            observation_batch_size=OBSERVATION_BATCH_SIZE,
+            stop_after_existing=None if full_sweep else MAX_CONSECUTIVE_EXISTING,
+            recent_size=CHECKPOINT_USERNAMES,
+            resumed_seen=checkpoint['followers_seen'] if checkpoint else 0
+        )
+        self.pipeline = pipeline
+        
+        try:
+            while True:
+                if self.should_exit:
+                    break
+                    
+                try:
+                    # Get current scroll position
+                    current_position = self.driver.execute_script("return window.pageYOffset")
+                    steps += 1
+                    
+                    # Get all visible followers at current position and hand them on
+                    extract_started = time.time()
+                    with self.phase('extraction'):
+                        current_count, visible_followers = self.collect_visible_followers()
+                    pipeline.submit(visible_followers, current_position, time.time() - extract_started)
                     max_count = max(max_count, current_count)
-                    no_new_count = 0
-                    found_new_in_batch = False
                     
-                    # Process visible cells
-                    for cell in visible_cells:
-                        try:
-                            # Get display name and username using correct selectors
-                            display_name_element = cell.find_element(
-                                By.CSS_SELECTOR,
-                                'div[dir="ltr"] span.css-1jxf684 span.css-1jxf684'
-                            )
-                            display_name = display_name_element.text.strip()
-                            
-                            username_element = cell.find_element(
-                                By.CSS_SELECTOR,
-                                'div[dir="ltr"][class*="r-1wvb978"] span.css-1jxf684'
-                            )
-                            username = username_element.text.strip()
-                            
-                            if username and display_name:
-                                username = username.lstrip('@')
-                                follower_info = {
-                                    'display_name': display_name,
-                                    'username': username
-                                }
-                                
-                                if username not in existing_followers and follower_info not in all_followers:
-                                    print(f"[NEW] Found follower: {display_name} (@{username})")
-                                    all_followers.append(follower_info)
-                                    current_batch.append(follower_info)
-                                    consecutive_existing = 0  # Reset counter when finding new follower
-                                    found_new_in_batch = True
-                                    
-                                    # Save batch if it reaches the size limit
-                                    if len(current_batch) >= batch_size:
-                                        batch_num = int(time.time())
-                                        self.db.add_followers(self.target_username, current_batch, batch_num)
-                                        print(f"Saved batch of {len(current_batch)} followers")
-                                        current_batch = []
-                                else:
-                                    print(f"[EXISTING] Found follower: {display_name} (@{username})")
-                                    consecutive_existing += 1
-                                    
-                                    if consecutive_existing >= MAX_CONSECUTIVE_EXISTING:
-                                        print(f"\nFound {MAX_CONSECUTIVE_EXISTING} consecutive existing followers")
-                                        print("Assuming we've reached previously scanned followers, stopping scan...")
-                                        break
-                                        
-                        except Exception as e:
-                            print(f"Error processing follower: {str(e)}")
-                            continue
-                            
-                    if consecutive_existing >= MAX_CONSECUTIVE_EXISTING:
+                    # Normalization runs behind the scroll loop; only wait for it
+                    # when nothing new shows up yet, before counting an empty step
+                    followers_seen, new_followers = pipeline.progress()
+                    if followers_seen == last_seen:
+                        pipeline.wait_normalized()
+                        followers_seen, new_followers = pipeline.progress()
+                        
+                    if pipeline.reached_known:
                         break
                         
-                    if not found_new_in_batch:
+                    # Persist everything read so far, then the point to resume from
+                    if full_sweep and time.time() - last_checkpoint >= CHECKPOINT_INTERVAL:
+                        pipeline.checkpoint(current_position)
+                        last_checkpoint = time.time()
+                        
+                    if followers_seen > last_seen:
+                        seen_any = True
+                        no_new_count = 0 if new_followers > last_new else 1
+                    else:
                         no_new_count += 1
-                        if no_new_count >= MAX_NO_NEW:
-                            print(f"No new followers found after {MAX_NO_NEW} attempts")
-                            break
-                else:
-                    no_new_count += 1
+                    last_seen, last_new = followers_seen, new_followers
+                    
                     if no_new_count >= MAX_NO_NEW:
                         print(f"No new followers found after {MAX_NO_NEW} attempts")
+                        self.scan_complete = self.driver.execute_script(AT_BOTTOM_JS)
                         break
+                        
+                    # Keep the DevTools log short when it is only used for byte counts
+                    if self.network_logging and self.extraction_mode != 'network' and steps % 10 == 0:
+                        with self.phase('extraction'):
+                            self.drain_network_log()
+                        
+                    # A rendered timeline without any captured responses means the
+                    # API request pattern no longer matches what the page calls
+                    if self.extraction_mode == 'network' and not seen_any and steps == MAX_NO_NEW - 1:
+                        if self.driver.find_elements(By.CSS_SELECTOR, '[data-testid="UserCell"]'):
+                            print("[WARNING] Follower cells are rendered but no followers API responses were captured")
+                    
+                    if pacer:
+                        # Scroll a viewport and continue as soon as new cells render
+                        with self.phase('scroll'):
+                            step = pacer.advance()
+                        if step['at_bottom'] and not step['added'] and step['height'] == last_height:
+                            idle_at_bottom += 1
+                            if idle_at_bottom >= MAX_IDLE_AT_BOTTOM:
+                                self.scan_complete = True
+                                break
+                        else:
+                            idle_at_bottom = 0
+                        last_height = step['height']
+                        continue
+                        
+                    # Scroll down by step
+                    new_position = min(current_position + scroll_step, last_height)
+                    with self.phase('scroll'):
+                        self.driver.execute_script(f"window.scrollTo(0, {new_position});")
+                    with self.phase('sleep'):
+                        time.sleep(scroll_pause_time)
+                    
+                    # Check if we've reached the bottom
+                    new_height = self.driver.execute_script("return document.body.scrollHeight")
+                    if new_height == last_height and new_position >= last_height:
+                        self.scan_complete = True
+                        break
+                    
+                    last_height = new_height
+                    
+                except Exception as e:
+                    print(f"Error during scrolling: {str(e)}")
+                    # Scroll back a bit and retry
+                    current_position = self.driver.execute_script("return window.pageYOffset")
+                    self.driver.execute_script(f"window.scrollTo(0, {current_position - 200});")
+                    time.sleep(2)
+                    continue
+                    
+            if full_sweep and not self.scan_complete:
+                pipeline.checkpoint(current_position)
                 
-                # Scroll down by step
-                new_position = min(current_position + scroll_step, last_height)
-                self.driver.execute_script(f"window.scrollTo(0, {new_position});")
-                time.sleep(scroll_pause_time)
-                
-                # Check if we've reached the bottom
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height and new_position >= last_height:
-                    break
-                
-                last_height = new_height
-                
-            except Exception as e:
-                print(f"Error during scrolling: {str(e)}")
-                # Scroll back a bit and retry
-                current_position = self.driver.execute_script("return window.pageYOffset")
-                self.driver.execute_script(f"window.scrollTo(0, {current_position - 200});")
-                time.sleep(2)
-                continue
+        finally:
+            # Write the batch in flight and whatever is still queued
+            pipeline.close()
+            self.phase_ms['database'] += pipeline.persistence.busy * 1000
+            
+        followers_seen, _ = pipeline.progress()
+        total_followers = scan_index.new_count
+        print(f"Finished scrolling, found total of {total_followers} unique followers")
         
-        # Save any remaining followers in the last batch
-        if current_batch:
-            print(f"Saving final batch of {len(current_batch)} followers...")
-            batch_num = int(time.time())
-            self.db.add_followers(self.target_username, current_batch, batch_num)
+        if self.network_logging and self.extraction_mode != 'network':
+            with self.phase('extraction'):
+                self.drain_network_log()
+        
+        # Record achieved throughput so pacing changes can be compared
+        elapsed = time.time() - started
+        stats = {
+            'timestamp': datetime.now().isoformat(),
+            'pacing': self.pacing,
+            'followers_seen': followers_seen,
+            'new_followers': total_followers,
+            'steps': steps,
+            'seconds': round(elapsed, 2),
+            'wait_seconds': round(pacer.waited if pacer else steps * scroll_pause_time, 2),
+            'followers_per_sec': round(followers_seen / elapsed, 2) if elapsed > 0 else 0.0,
+            'full_sweep': full_sweep,
+            'resumed': checkpoint is not None,
+            'lean': self.lean,
+            'page_load_ms': self.page_load_ms,
+            'bytes_transferred': self.scan_bytes if self.network_logging else None,
+            'pipeline': pipeline.metrics()
+        }
+        self.scan_stats.append(stats)
+        print(f"Scan throughput: {stats['followers_per_sec']} followers/sec "
+              f"({followers_seen} followers in {stats['seconds']}s, {self.pacing} pacing)")
+        for stage in stats['pipeline']:
+            depth = f", max queue {stage['max_queue_depth']}" if stage['max_queue_depth'] is not None else ""
+            print(f"  {stage['stage']}: {stage['items']} items, {stage['items_per_sec']}/sec, "
+                  f"{stage['busy_pct']}% busy{depth}")
+        if self.network_logging:
+            print(f"Transferred {self.scan_bytes / 1024:.0f} KB, page load {self.page_load_ms} ms")
         
-        total_followers = len(all_followers)
-        print(f"Finished scrolling, found total of {total_followers} unique followers")
         return total_followers
         
+    def fast_forward(self, checkpoint: dict) -> bool:
+        """Scroll back to a sweep's saved resume point without reading followers
+        
+        The timeline is only loaded page by page, so this keeps jumping to the
+        end of the loaded content until the saved offset is reached or one of
+        the usernames seen last before the checkpoint is rendered. Followers
+        may have been added since, so the spot found is approximate; cells
+        read twice are deduplicated by the scan.
+        
+        Args:
+            checkpoint: Saved resume point from the database
+            
+        Returns:
+            bool: True if the resume point was reached
+        """
+        target_offset = checkpoint['scroll_offset']
+        markers = [username.lower() for username in checkpoint['last_usernames']]
+        print(f"Fast-forwarding to offset {target_offset} "
+              f"({checkpoint['followers_seen']} followers already swept)...")
+              
+        self.driver.set_script_timeout(15)
+        started = time.time()
+        stalled = 0
+        
+        while not self.should_exit and stalled < 5:
+            step = self.driver.execute_async_script(FAST_FORWARD_STEP_JS, target_offset, markers, 5000)
+            if step['marker'] or step['reached']:
+                reason = f"found @{step['marker']}" if step['marker'] else "reached saved offset"
+                print(f"Resumed at offset {step['position']} ({reason}) in {time.time() - started:.1f}s")
+                return True
+            stalled = 0 if step['grew'] else stalled + 1
+            
+        print("Timeline stopped loading before the saved offset, resuming from the end of it")
+        return False
+        
     def process_followers(self):
         """Process visible follower cells and save to database"""
         try:
@@ -324,13 +924,40 @@ class TwitterFollowerTracker:
             print(f"Error processing followers: {str(e)}")
             return 0
             
-    def scan_followers(self):
-        """Scan followers page and process new followers"""
+    def scan_followers(self) -> int:
+        """Scan followers page and process new followers
+        
+        The scan's phase timings and resource use are saved to scan_metrics,
+        whether it succeeds or fails.
+        
+        Returns:
+            int: Number of new followers found
+        """
+        started = time.time()
+        last_stats = self.scan_stats[-1] if self.scan_stats else None
+        error = None
+        
+        try:
+            return self._scan_followers()
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            stats = self.scan_stats[-1] if self.scan_stats and self.scan_stats[-1] is not last_stats else None
+            self.save_scan_metrics(started, stats, error)
+            
+    def _scan_followers(self) -> int:
+        """Navigate to the followers page and scroll through it"""
         try:
             # Navigate to followers page
-            followers_url = f"https://x.com/{self.target_username}/followers"
-            self.driver.get(followers_url)
-            time.sleep(2)
+            followers_url = f"{self.base_url}/{self.target_username}/followers"
+            self.scan_bytes = 0
+            load_started = time.time()
+            with self.phase('navigation'):
+                self.driver.get(followers_url)
+            self.page_load_ms = int((time.time() - load_started) * 1000)
+            with self.phase('sleep'):
+                time.sleep(2)
             
             # Check if we got redirected to a logout URL
             current_url = self.driver.current_url
@@ -338,27 +965,42 @@ class TwitterFollowerTracker:
                 print("[INFO] Redirected to logout URL, attempting to re-login...")
                 if not self.check_login():
                     print("[ERROR] Failed to re-login")
-                    return
+                    return 0
                 # Try navigating to followers page again
-                self.driver.get(followers_url)
-                time.sleep(2)
+                with self.phase('navigation'):
+                    self.driver.get(followers_url)
+                with self.phase('sleep'):
+                    time.sleep(2)
                 
             # Wait for followers to load
             try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="cellInnerDiv"]'))
-                )
+                with self.phase('navigation'):
+                    WebDriverWait(self.driver, 10).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="cellInnerDiv"]'))
+                    )
             except TimeoutException:
                 print("Timeout waiting for followers to load")
-                return
+                return 0
                 
+            # Periodically walk the whole list so unfollowers can be detected.
+            # A sweep that fails part way keeps its checkpoint and generation,
+            # so the next scan picks it up where it stopped.
+            with self.phase('database'):
+                generation_id, checkpoint = self.prepare_sweep()
+                    
             # Load and process followers while scrolling
-            total_followers = self.scroll_to_bottom()
+            total_followers = self.scroll_to_bottom(generation_id, checkpoint)
+                
+            if generation_id:
+                with self.phase('database'):
+                    self.finish_sweep(generation_id)
+                
             if total_followers == 0:
                 print("No followers found")
-                return
+                return 0
                 
             print(f"\nSuccessfully processed {total_followers} followers")
+            return total_followers
             
         except Exception as e:
             print(f"[ERROR] Error during follower scan: {str(e)}")
@@ -366,15 +1008,133 @@ class TwitterFollowerTracker:
                 print("[INFO] Exception occurred on logout URL, will retry after re-login")
                 if self.check_login():
                     print("[INFO] Successfully re-logged in, retrying scan...")
-                    return self.scan_followers()
+                    return self._scan_followers()
             raise
         
+    def save_scan_metrics(self, started: float, stats: dict = None, error: str = None):
+        """Store a scan's phase timings, WebDriver calls and Chrome memory
+        
+        Args:
+            started: Scan start time
+            stats: The scan's scan_stats entry, if it got as far as scrolling
+            error: Error that ended the scan, if any
+        """
+        calls = self.webdriver_calls - self.metric_calls
+        js_heap_bytes = None
+        dom_nodes = None
+        if self.driver and not self.should_exit:
+            try:
+                metrics = self.driver.execute_cdp_cmd('Performance.getMetrics', {})['metrics']
+                metrics = {metric['name']: metric['value'] for metric in metrics}
+                js_heap_bytes = int(metrics['JSHeapUsedSize']) if 'JSHeapUsedSize' in metrics else None
+                dom_nodes = int(metrics['Nodes']) if 'Nodes' in metrics else None
+            except Exception:
+                pass
+                
+        stats = stats or {}
+        if stats.get('resumed'):
+            scan_type = 'resumed'
+        elif stats.get('full_sweep'):
+            scan_type = 'full'
+        else:
+            scan_type = 'incremental'
+            
+        metrics = {
+            'target_username': self.target_username,
+            'started_at': datetime.fromtimestamp(started).isoformat(),
+            'duration_ms': int((time.time() - started) * 1000),
+            'scan_type': scan_type,
+            'extraction_mode': self.extraction_mode,
+            'pacing': self.pacing,
+            'lean': self.lean,
+            'steps': stats.get('steps'),
+            'webdriver_calls': calls,
+            'followers_seen': stats.get('followers_seen'),
+            'new_followers': stats.get('new_followers'),
+            'followers_per_sec': stats.get('followers_per_sec'),
+            'bytes_transferred': stats.get('bytes_transferred'),
+            'js_heap_bytes': js_heap_bytes,
+            'dom_nodes': dom_nodes,
+            'error': error
+        }
+        for name in SCAN_PHASES:
+            metrics[f"{name}_ms"] = int(self.phase_ms.get(name, 0))
+        self.db.record_scan_metrics(metrics)
+        
+        self.phase_ms = defaultdict(float)
+        self.metric_calls = self.webdriver_calls
+        
+    def prepare_sweep(self):
+        """Choose the full sweep generation for this scan, if any
+        
+        An interrupted sweep is resumed from its checkpoint unless it started
+        longer than the sweep interval ago, in which case it is dropped.
+        
+        Returns:
+            tuple: (generation_id, checkpoint), either of which may be None
+        """
+        checkpoint = self.db.get_checkpoint(self.target_username)
+        if checkpoint:
+            generation = self.db.get_generation(checkpoint['generation_id'])
+            age = (datetime.now() - datetime.fromisoformat(generation['started_at'])).total_seconds() if generation else None
+            if age is not None and age < self.full_sweep_interval:
+                print(f"Resuming full sweep (generation {checkpoint['generation_id']}, "
+                      f"checkpoint from {checkpoint['updated_at']})")
+                return checkpoint['generation_id'], checkpoint
+            print(f"Dropping stale full sweep (generation {checkpoint['generation_id']})")
+            self.db.abandon_generation(checkpoint['generation_id'])
+            
+        if self.full_sweep_due():
+            generation_id = self.db.start_generation(self.target_username)
+            if generation_id:
+                print(f"Starting full sweep (generation {generation_id})")
+                return generation_id, None
+                
+        return None, None
+        
+    def full_sweep_due(self) -> bool:
+        """Check whether the target's last full sweep is older than the sweep interval"""
+        if self.full_sweep_interval <= 0:
+            return False
+            
+        # An imported follower list counts as a sweep
+        last_sweep = self.db.get_last_generation(self.target_username)
+        last_import = self.db.get_last_generation(self.target_username, 'import')
+        if last_import and (not last_sweep or last_import['finished_at'] > last_sweep['finished_at']):
+            last_sweep = last_import
+        if not last_sweep:
+            return True
+        finished_at = datetime.fromisoformat(last_sweep['finished_at'])
+        return (datetime.now() - finished_at).total_seconds() >= self.full_sweep_interval
+        
+    def finish_sweep(self, generation_id: int):
+        """Reconcile a full sweep that reached the end of the followers list
+        
+        A sweep that stopped early stays open and resumes from its checkpoint
+        on the next scan.
+        """
+        if not self.scan_complete or self.should_exit:
+            print("Full sweep did not reach the end of the followers list, it will resume on the next scan")
+            return
+            
+        result = self.db.finish_generation(generation_id)
+        if result:
+            self.last_sweep = result
+            print(f"Full sweep finished: {result['observed']} observed, {result['new_followers']} new, "
+                  f"{result['refollowers']} returned, {result['unfollowers']} unfollowed")
+                  
     def stop(self):
         """Stop the tracker"""
         print("Stopping Twitter Follower Tracker...")
         self.should_exit = True
-        if self.driver:
-            self.driver.quit()
+        
+        # Let a running scan leave its loop and write what it has read
+        # before the browser goes away
+        pipeline = self.pipeline
+        if pipeline and not pipeline.closed.wait(PIPELINE_DRAIN_TIMEOUT):
+            print("Timed out waiting for the scan to save its followers")
+        if self.session:
+            self.session.close()
             
     def run(self):
         """Run the follower tracker"""
@@ -389,8 +1149,8 @@ class TwitterFollowerTracker:
             return
             
         # Load previous results
-        previous_followers = self.db.get_all_followers(self.target_username)
-        if previous_followers:
+        previous_followers = self.db.follower_index(self.target_username)
+        if len(previous_followers):
             print(f"Loaded {len(previous_followers)} followers from previous runs")
             
         while not self.should_exit:
@@ -409,7 +1169,7 @@ class TwitterFollowerTracker:
                 break
             except Exception as e:
                 print(f"Error in main loop: {str(e)}")
-                if not self.setup_driver():
+                if not self.recover_driver():
                     print("Failed to recover WebDriver")
                     break
                 if not self.check_login():
@@ -1,21 +1,80 @@
-from flask import Flask, render_template_string, request, redirect
-import sqlite3
+from flask import Flask, Response, render_template_string, request, redirect, stream_with_context
 import threading
-from database import DatabaseManager
+from database import DatabaseManager, HOT_QUERIES
+from exporter import export, EXPORT_CONTENT_TYPES
 import math
-from datetime import datetime
-from selenium import webdriver
+from datetime import datetime, timedelta
 from selenium.webdriver.chrome.options import Options
+from browser_session import BrowserSession
+from scan_scheduler import ScanScheduler, AdaptiveScanPolicy, parse_targets
 import os
 from pathlib import Path
 
+# Phase columns of scan_metrics and the colors they are charted in
+PHASE_COLORS = (
+    ('driver_setup_ms', '#6c757d'),
+    ('login_check_ms', '#17a2b8'),
+    ('navigation_ms', '#007bff'),
+    ('scroll_ms', '#28a745'),
+    ('extraction_ms', '#ffc107'),
+    ('database_ms', '#dc3545'),
+    ('sleep_ms', '#adb5bd')
+)
+
+def svg_line_chart(values, color: str = '#007bff', width: int = 560, height: int = 160) -> str:
+    """Render a series as an inline SVG line chart, ignoring missing values"""
+    points = [(i, value) for i, value in enumerate(values) if value is not None]
+    if not points:
+        return '<p>No data</p>'
+    top = max(value for _, value in points) or 1
+    step = (width - 20) / max(len(values) - 1, 1)
+    coords = ' '.join(
+        f"{10 + i * step:.1f},{height - 10 - value / top * (height - 30):.1f}" for i, value in points
+    )
+    return (
+        f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<line x1="10" y1="{height - 10}" x2="{width - 10}" y2="{height - 10}" stroke="#ddd"/>'
+        f'<text x="10" y="12" font-size="11" fill="#666">max {top:,.1f}</text>'
+        f'<polyline points="{coords}" fill="none" stroke="{color}" stroke-width="2"/>'
+        '</svg>'
+    )
+
+def svg_phase_chart(scans, width: int = 1160, height: int = 200) -> str:
+    """Render each scan's phase timings as a stacked SVG bar"""
+    if not scans:
+        return '<p>No data</p>'
+    top = max(sum(scan.get(column) or 0 for column, _ in PHASE_COLORS) for scan in scans) or 1
+    bar = (width - 20) / len(scans)
+    bars = []
+    for i, scan in enumerate(scans):
+        y = height - 10
+        for column, color in PHASE_COLORS:
+            size = (scan.get(column) or 0) / top * (height - 30)
+            if size <= 0:
+                continue
+            y -= size
+            bars.append(
+                f'<rect x="{10 + i * bar:.1f}" y="{y:.1f}" width="{max(bar - 2, 1):.1f}" height="{size:.1f}" '
+                f'fill="{color}"><title>{column[:-3]}: {scan.get(column)} ms</title></rect>'
+            )
+    return (
+        f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<text x="10" y="12" font-size="11" fill="#666">max {top / 1000:,.1f} s</text>'
+        + ''.join(bars) +
+        '</svg>'
+    )
+
 class FollowerWebViewer:
-    def __init__(self, target_username: str, port: int = 3000):
+    def __init__(self, target_username: str, port: int = 3000, targets=None):
         self.target_username = target_username
         self.port = port
+        # A single target is scheduled like any other, at SCAN_INTERVAL_MINUTES to start with
+        scan_interval = int(float(os.getenv('SCAN_INTERVAL_MINUTES', '5')) * 60)
+        self.targets = targets or parse_targets(target_username, scan_interval)
         self.db = DatabaseManager()
         self.follower_tracker = None
-        self.api_sync = None
+        # One API sync service per target
+        self.api_syncs = []
         self.login_browser = None
         
         # HTML template with login browser button
@@ -143,11 +202,73 @@ class FollowerWebViewer:
                 .login-button:hover {
                     background-color: #0056b3;
                 }
+                .target-status.scanning {
+                    color: #007bff;
+                }
+                .target-status.error {
+                    color: #dc3545;
+                }
             </style>
         </head>
         <body>
             <h1>Twitter Follower Tracker</h1>
             <h2>Target: @{{ target_username }}</h2>
+            <p>
+                <a href="/metrics?target={{ target_username }}">Scan performance &raquo;</a>
+                &middot; Export followers
+                <a href="/export/followers.csv?target={{ target_username }}">CSV</a>
+                <a href="/export/followers.jsonl?target={{ target_username }}">JSONL</a>
+                &middot; scans <a href="/export/scans.csv?target={{ target_username }}">CSV</a>
+                &middot; follow events <a href="/export/events.csv?target={{ target_username }}">CSV</a>
+            </p>
+            
+            {% if targets %}
+            <h3>Targets</h3>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Username</th>
+                        <th>Priority</th>
+                        <th>Interval</th>
+                        <th>New/hour</th>
+                        <th>Schedule Decision</th>
+                        <th>Status</th>
+                        <th>Last Scan</th>
+                        <th>New Followers</th>
+                        <th>Followers/sec</th>
+                        <th>Next Scan</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    {% for target in targets %}
+                    <tr>
+                        <td><a href="?target={{ target.username }}">@{{ target.username }}</a></td>
+                        <td>{{ target.priority }}</td>
+                        <td>{{ (target.interval / 60) | round(1) }} min</td>
+                        <td>{{ target.rate_per_hour if target.rate_per_hour is not none else '-' }}</td>
+                        <td><small>{{ target.decision }}</small></td>
+                        <td class="target-status {{ target.status }}">
+                            {{ target.status }}{% if target.worker is not none %} (worker {{ target.worker }}){% endif %}
+                            {% if target.last_error %}<br><small>{{ target.last_error }}</small>{% endif %}
+                        </td>
+                        <td>{{ target.last_scan or '-' }}{% if target.last_duration is not none %} ({{ target.last_duration }}s){% endif %}</td>
+                        <td>{{ target.last_new_followers if target.last_new_followers is not none else '-' }}</td>
+                        <td>{{ target.last_followers_per_sec if target.last_followers_per_sec is not none else '-' }}</td>
+                        <td>{{ target.next_scan if checker_running else '-' }}</td>
+                    </tr>
+                    {% endfor %}
+                </tbody>
+            </table>
+            {% if schedule_policy %}
+            <p>
+                Adaptive scheduling: {{ (schedule_policy.min_interval / 60) | round(1) }}-{{ (schedule_policy.max_interval / 60) | round(1) }} min,
+                aiming for {{ schedule_policy.target_new }} new followers per scan.
+                Expected browser time {{ schedule_policy.demand_minutes }} min/hour{% if schedule_policy.budget_minutes %}
+                of a {{ schedule_policy.budget_minutes }} min/hour budget{% if schedule_policy.budget_factor > 1 %}
+                (intervals stretched x{{ schedule_policy.budget_factor }}){% endif %}{% endif %}.
+            </p>
+            {% endif %}
+            {% endif %}
             
             <div class="control-box">
                 <div class="button-group">
@@ -164,7 +285,7 @@ class FollowerWebViewer:
                             <span class="status stopped">Checker is stopped</span>
                         {% endif %}
                     </form>
-
+                    
                     <form method="post" action="/toggle_api_sync">
                         {% if api_sync_running %}
                             <button type="submit" class="start-button stop-button">Stop API Sync</button>
@@ -181,12 +302,77 @@ class FollowerWebViewer:
                 {% endif %}
             </div>
             
+            {% if browser_sessions %}
+            <h3>Browser Sessions</h3>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Session</th>
+                        <th>Running</th>
+                        <th>Starts</th>
+                        <th>Restarts</th>
+                        <th>Soft Recoveries</th>
+                        <th>Failed Probes</th>
+                        <th>Cold Start (last / avg)</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    {% for session in browser_sessions %}
+                    <tr>
+                        <td>{{ session.name }}</td>
+                        <td>{{ 'Yes' if session.running else 'No' }}</td>
+                        <td>{{ session.starts }}</td>
+                        <td>{{ session.restarts }}</td>
+                        <td>{{ session.soft_recoveries }}</td>
+                        <td>{{ session.failed_probes }}</td>
+                        <td>
+                            {% if session.last_cold_start_ms is not none %}
+                                {{ session.last_cold_start_ms }} ms / {{ session.avg_cold_start_ms }} ms
+                            {% else %}-{% endif %}
+                        </td>
+                    </tr>
+                    {% endfor %}
+                </tbody>
+            </table>
+            {% endif %}
+            
+            <h3>Database Writer</h3>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Commits</th>
+                        <th>Writes</th>
+                        <th>Batch Size (avg / max)</th>
+                        <th>Commit (avg / p95)</th>
+                        <th>Write Wait (avg)</th>
+                        <th>Queue (now / max)</th>
+                        <th>Failed Writes</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    <tr>
+                        <td>{{ db_writer.commits }}</td>
+                        <td>{{ db_writer.writes }}</td>
+                        <td>{{ db_writer.avg_batch_size or '-' }} / {{ db_writer.max_batch_size or '-' }}</td>
+                        <td>
+                            {% if db_writer.avg_commit_ms is not none %}
+                                {{ db_writer.avg_commit_ms }} ms / {{ db_writer.p95_commit_ms }} ms
+                            {% else %}-{% endif %}
+                        </td>
+                        <td>{{ '%s ms'|format(db_writer.avg_wait_ms) if db_writer.avg_wait_ms is not none else '-' }}</td>
+                        <td>{{ db_writer.queue_depth }} / {{ db_writer.max_queue_depth }}</td>
+                        <td>{{ db_writer.failed_writes + db_writer.failed_commits }}</td>
+                    </tr>
+                </tbody>
+            </table>
+            
             <div class="filter-box">
                 <form method="get">
-                    <input type="text" name="username_filter" value="{{ username_filter }}" placeholder="Filter by username">
-                    <button type="submit">Filter</button>
+                    <input type="hidden" name="target" value="{{ target_username }}">
+                    <input type="text" name="username_filter" value="{{ username_filter }}" placeholder="Search username or name, @ for username prefix">
+                    <button type="submit">Search</button>
                     {% if username_filter %}
-                        <a href="?page=1">Clear Filter</a>
+                        <a href="?page=1&target={{ target_username }}">Clear Search</a>
                     {% endif %}
                 </form>
             </div>
@@ -218,22 +404,28 @@ class FollowerWebViewer:
             <div class="pagination">
                 {% if total_pages > 1 %}
                     {% if page > 1 %}
-                        <a href="?page={{ page - 1 }}&username_filter={{ username_filter }}">&laquo; Previous</a>
+                        <a href="?page={{ page - 1 }}&username_filter={{ username_filter }}&target={{ target_username }}">&laquo; Previous</a>
                     {% endif %}
                     
                     {% for p in range(1, total_pages + 1) %}
-                        <a href="?page={{ p }}&username_filter={{ username_filter }}" 
+                        <a href="?page={{ p }}&username_filter={{ username_filter }}&target={{ target_username }}" 
                            {% if p == page %}class="active"{% endif %}>
                             {{ p }}
                         </a>
                     {% endfor %}
                     
                     {% if page < total_pages %}
-                        <a href="?page={{ page + 1 }}&username_filter={{ username_filter }}">Next &raquo;</a>
+                        <a href="?page={{ page + 1 }}&username_filter={{ username_filter }}&target={{ target_username }}">Next &raquo;</a>
                     {% endif %}
                 {% endif %}
             </div>
             
+            <h3>Followers Gained per Hour (last 48 hours)</h3>
+            {{ gained_chart|safe }}
+            
+            <h3>Active Followers per Day (last year)</h3>
+            {{ active_chart|safe }}
+            
             <h3>Recent Scans</h3>
             <table>
                 <thead>
@@ -259,84 +451,238 @@ class FollowerWebViewer:
         </html>
         """
         
-    def get_follower_data(self, page=1, per_page=25, username_filter=None):
-        """Get follower data with pagination and filtering"""
-        conn = sqlite3.connect('data/followers.db')
-        conn.row_factory = sqlite3.Row
-        
-        try:
-            cursor = conn.cursor()
-            
-            # Base query
-            query = """
-                SELECT id, username, display_name, first_seen, last_seen, api_synced as is_synced
-                FROM followers 
-                WHERE target_username = ? AND is_active = 1
-            """
-            params = [self.target_username]
-            
-            # Add username filter if provided
-            if username_filter:
-                query += " AND username LIKE ?"
-                params.append(f"%{username_filter}%")
-                
-            # Get total count
-            count_query = f"SELECT COUNT(*) FROM ({query})"
-            cursor.execute(count_query, params)
-            total_count = cursor.fetchone()[0]
-            
-            # Add pagination
-            query += " ORDER BY first_seen DESC LIMIT ? OFFSET ?"
-            params.extend([per_page, (page - 1) * per_page])
+        # Scan performance timeline
+        self.metrics_template = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>Scan Performance - @{{ target_username }}</title>
+            <style>
+                body {
+                    font-family: Arial, sans-serif;
+                    max-width: 1200px;
+                    margin: 0 auto;
+                    padding: 20px;
+                }
+                table {
+                    width: 100%;
+                    border-collapse: collapse;
+                    margin: 20px 0;
+                }
+                th, td {
+                    padding: 6px;
+                    border: 1px solid #ddd;
+                    text-align: left;
+                    font-size: 13px;
+                }
+                th {
+                    background-color: #f5f5f5;
+                }
+                .charts {
+                    display: flex;
+                    flex-wrap: wrap;
+                    gap: 20px;
+                }
+                .legend span {
+                    display: inline-block;
+                    margin-right: 15px;
+                    font-size: 13px;
+                }
+                .swatch {
+                    width: 12px;
+                    height: 12px;
+                    margin-right: 4px;
+                    vertical-align: middle;
+                }
+            </style>
+        </head>
+        <body>
+            <h1>Scan Performance</h1>
+            <h2>Target: @{{ target_username }}</h2>
+            <p>
+                <a href="/?target={{ target_username }}">&laquo; Followers</a>
+                {% for target in targets %}
+                | <a href="?target={{ target.username }}">@{{ target.username }}</a>
+                {% endfor %}
+            </p>
             
-            # Get paginated results
-            cursor.execute(query, params)
-            followers = cursor.fetchall()
+            {% if scans %}
+            <h3>Phase Breakdown</h3>
+            <p class="legend">
+                {% for column, color in phase_colors %}
+                <span><span class="swatch" style="background-color: {{ color }}"></span>{{ column[:-3] }}</span>
+                {% endfor %}
+            </p>
+            {{ charts.phases|safe }}
+            <p><small>Database time is spent on the pipeline's writer thread and overlaps scrolling.</small></p>
             
-            # Format timestamps
-            formatted_followers = []
-            for follower in followers:
-                follower_dict = dict(follower)
-                # Convert timestamps to readable format
-                for field in ['first_seen', 'last_seen']:
-                    if follower_dict[field]:
-                        dt = datetime.fromisoformat(follower_dict[field].replace('Z', '+00:00'))
-                        follower_dict[field] = dt.strftime('%Y-%m-%d %H:%M:%S')
-                formatted_followers.append(follower_dict)
+            <div class="charts">
+                <div><h3>Followers/sec</h3>{{ charts.followers_per_sec|safe }}</div>
+                <div><h3>Duration (s)</h3>{{ charts.duration|safe }}</div>
+                <div><h3>WebDriver calls per 1k followers</h3>{{ charts.calls_per_1k|safe }}</div>
+                <div><h3>Chrome JS heap (MB)</h3>{{ charts.js_heap|safe }}</div>
+            </div>
             
-            # Get recent scans
-            cursor.execute("""
-                SELECT 
-                    timestamp,
-                    total_followers,
-                    new_followers,
-                    batch_number 
-                FROM scans 
-                WHERE target_username = ? 
-                ORDER BY timestamp DESC 
-                LIMIT 10
-            """, [self.target_username])
-            recent_scans = cursor.fetchall()
+            <h3>Recent Scans</h3>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Started</th>
+                        <th>Type</th>
+                        <th>Mode</th>
+                        <th>Duration (s)</th>
+                        <th>Followers</th>
+                        <th>New</th>
+                        <th>Followers/sec</th>
+                        <th>Steps</th>
+                        <th>WebDriver Calls</th>
+                        <th>JS Heap (MB)</th>
+                        <th>DOM Nodes</th>
+                        <th>Error</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    {% for scan in scans|reverse %}
+                    <tr>
+                        <td>{{ scan.started_at }}</td>
+                        <td>{{ scan.scan_type }}</td>
+                        <td>{{ scan.extraction_mode }}{% if scan.lean %} (lean){% endif %}</td>
+                        <td>{{ '%.1f'|format(scan.duration_ms / 1000) }}</td>
+                        <td>{{ scan.followers_seen }}</td>
+                        <td>{{ scan.new_followers }}</td>
+                        <td>{{ scan.followers_per_sec }}</td>
+                        <td>{{ scan.steps }}</td>
+                        <td>{{ scan.webdriver_calls }}</td>
+                        <td>{{ '%.1f'|format(scan.js_heap_bytes / 1048576) if scan.js_heap_bytes else '-' }}</td>
+                        <td>{{ scan.dom_nodes or '-' }}</td>
+                        <td>{{ scan.error or '' }}</td>
+                    </tr>
+                    {% endfor %}
+                </tbody>
+            </table>
+            {% else %}
+            <p>No scans recorded for @{{ target_username }} yet.</p>
+            {% endif %}
+        </body>
+        </html>
+        """
+        
+    def get_follower_data(self, page=1, per_page=25, username_filter=None, target_username=None):
+        """Get follower data with pagination and filtering"""
+        target_username = target_username or self.target_username
+        # Reads use this thread's connection; WAL keeps them from waiting on the writer
+        cursor = self.db.get_connection().cursor()
+        
+        if username_filter:
+            # Username and display name search through the trigram index
+            matches = self.db.search_followers(target_username, username_filter, per_page, (page - 1) * per_page)
+            followers = matches['followers']
+            total_count = matches['total']
+        else:
+            # Count from the shared follower index, timestamps formatted by SQLite
+            total_count = self.db.follower_index(target_username).active_count
+            cursor.execute(HOT_QUERIES['follower_list'][1], (target_username, per_page, (page - 1) * per_page))
+            followers = [dict(row) for row in cursor.fetchall()]
             
-            # Format scan timestamps
-            formatted_scans = []
-            for scan in recent_scans:
-                scan_dict = dict(scan)
-                if scan_dict['timestamp']:
-                    dt = datetime.fromisoformat(scan_dict['timestamp'].replace('Z', '+00:00'))
-                    scan_dict['timestamp'] = dt.strftime('%Y-%m-%d %H:%M:%S')
-                formatted_scans.append(scan_dict)
+        # Get recent scans
+        cursor.execute(HOT_QUERIES['recent_scans'][1], [target_username])
+        recent_scans = [dict(row) for row in cursor.fetchall()]
+        
+        return {
+            'active_followers': followers,
+            'total_active': total_count,
+            'recent_scans': recent_scans,
+            'total_pages': math.ceil(total_count / per_page)
+        }
+        
+    def get_gained_chart(self, target_username: str, hours: int = 48) -> str:
+        """Chart followers gained per hour over the last hours, from the hourly rollups"""
+        since = datetime.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=hours - 1)
+        gained = {row['bucket']: row['new_followers'] for row in self.db.get_follower_stats(target_username, 3600, since)}
+        start = int(since.timestamp())
+        return svg_line_chart([gained.get(start + hour * 3600, 0) for hour in range(hours)], '#28a745', width=1160)
+        
+    def get_active_chart(self, target_username: str, days: int = 365) -> str:
+        """Chart active followers at the end of each day, from the daily rollups"""
+        since = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days - 1)
+        stats = self.db.get_follower_stats(target_username, 86400)
+        
+        # Days without changes keep the previous day's count; days before the first are left out
+        values, active, i = [], None, 0
+        for day in range(days):
+            end = (since + timedelta(days=day + 1)).timestamp()
+            while i < len(stats) and stats[i]['bucket'] < end:
+                active = stats[i]['active']
+                i += 1
+            values.append(active)
+        return svg_line_chart(values, '#007bff', width=1160)
             
-            return {
-                'active_followers': formatted_followers,
-                'total_active': total_count,
-                'recent_scans': formatted_scans,
-                'total_pages': math.ceil(total_count / per_page)
-            }
+    def build_login_options(self) -> Options:
+        """Build Chrome options for the login browser"""
+        # Use Chrome profile directory
+        profile_dir = Path("data/chrome_profiles")
+        if not profile_dir.exists():
+            profile_dir.mkdir(parents=True, exist_ok=True)
             
-        finally:
-            conn.close()
+        # Profile settings
+        options = Options()
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        options.add_argument('--no-sandbox')
+        options.add_argument(f'--user-data-dir={profile_dir.absolute()}')
+        options.add_argument('--profile-directory=Default')
+        options.add_experimental_option('excludeSwitches', ['enable-automation'])
+        options.add_experimental_option('useAutomationExtension', False)
+        
+        # Additional settings to avoid detection
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-extensions')
+        options.add_argument('--disable-gpu')
+        options.add_argument('--no-first-run')
+        options.add_argument('--no-service-autorun')
+        options.add_argument('--password-store=basic')
+        return options
+        
+    def get_browser_sessions(self):
+        """Get restart and cold-start metrics of every browser session"""
+        trackers = []
+        if hasattr(self.follower_tracker, 'trackers'):
+            trackers = list(self.follower_tracker.trackers.values())
+        elif self.follower_tracker is not None:
+            trackers = [self.follower_tracker]
             
+        sessions = [tracker.session for tracker in trackers if getattr(tracker, 'session', None)]
+        if self.login_browser:
+            sessions.append(self.login_browser)
+        return [session.metrics() for session in sessions]
+        
+    def get_target_status(self):
+        """Get per-target scheduling state, from the running scheduler if any"""
+        if hasattr(self.follower_tracker, 'get_status'):
+            return self.follower_tracker.get_status()
+        return [target.to_dict() for target in self.targets]
+        
+    def get_schedule_policy(self):
+        """Get the running scheduler's policy bounds and budget use, if any"""
+        if hasattr(self.follower_tracker, 'get_policy_status'):
+            return self.follower_tracker.get_policy_status()
+        return None
+        
+    def get_scan_charts(self, scans):
+        """Build the inline SVG charts of the scan performance page"""
+        return {
+            'phases': svg_phase_chart(scans),
+            'followers_per_sec': svg_line_chart([scan['followers_per_sec'] for scan in scans], '#28a745'),
+            'duration': svg_line_chart([scan['duration_ms'] / 1000 for scan in scans], '#007bff'),
+            'calls_per_1k': svg_line_chart([
+                1000 * scan['webdriver_calls'] / scan['followers_seen']
+                if scan['webdriver_calls'] is not None and scan['followers_seen'] else None
+                for scan in scans
+            ], '#ffc107'),
+            'js_heap': svg_line_chart([
+                scan['js_heap_bytes'] / 1048576 if scan['js_heap_bytes'] else None for scan in scans
+            ], '#dc3545')
+        }
+        
     def run(self):
         """Run the web viewer"""
         app = Flask(__name__)
@@ -346,87 +692,112 @@ class FollowerWebViewer:
             page = int(request.args.get('page', 1))
             per_page = int(request.args.get('per_page', 25))
             username_filter = request.args.get('username_filter', '')
+            target_username = request.args.get('target') or self.target_username
             
-            data = self.get_follower_data(page, per_page, username_filter)
+            data = self.get_follower_data(page, per_page, username_filter, target_username)
             checker_running = self.follower_tracker is not None and hasattr(self.follower_tracker, 'should_exit') and not self.follower_tracker.should_exit
-            api_sync_running = self.api_sync is not None and hasattr(self.api_sync, 'should_exit') and not self.api_sync.should_exit
-            login_browser_open = self.login_browser is not None
+            api_sync_running = any(not api_sync.should_exit for api_sync in self.api_syncs)
+            login_browser_open = self.login_browser is not None and self.login_browser.driver is not None
             
             return render_template_string(
                 self.template,
-                target_username=self.target_username,
+                target_username=target_username,
+                targets=self.get_target_status(),
+                schedule_policy=self.get_schedule_policy(),
                 active_followers=data['active_followers'],
                 total_active=data['total_active'],
                 recent_scans=data['recent_scans'],
+                gained_chart=self.get_gained_chart(target_username),
+                active_chart=self.get_active_chart(target_username),
                 page=page,
                 per_page=per_page,
                 total_pages=data['total_pages'],
                 username_filter=username_filter,
                 checker_running=checker_running,
                 api_sync_running=api_sync_running,
-                login_browser_open=login_browser_open
+                login_browser_open=login_browser_open,
+                browser_sessions=self.get_browser_sessions(),
+                db_writer=self.db.writer_stats()
+            )
+            
+        @app.route('/metrics')
+        def metrics():
+            target_username = request.args.get('target') or self.target_username
+            scans = self.db.get_scan_metrics(target_username, int(request.args.get('limit', 100)))
+            
+            return render_template_string(
+                self.metrics_template,
+                target_username=target_username,
+                targets=self.get_target_status(),
+                scans=scans,
+                charts=self.get_scan_charts(scans),
+                phase_colors=PHASE_COLORS
+            )
+            
+        @app.route('/export/<kind>.<fmt>')
+        def export_data(kind, fmt):
+            target_username = request.args.get('target') or self.target_username
+            active = request.args.get('active')
+            try:
+                chunks = export(
+                    self.db, kind, fmt, target_username,
+                    datetime.fromisoformat(request.args['since']) if request.args.get('since') else None,
+                    datetime.fromisoformat(request.args['until']) if request.args.get('until') else None,
+                    active == '1' if active in ('0', '1') else None
+                )
+            except ValueError as e:
+                return Response(f"{str(e)}\n", status=400, mimetype='text/plain')
+                
+            # Rows are read and sent batch by batch while the download runs
+            return Response(
+                stream_with_context(chunks),
+                mimetype=EXPORT_CONTENT_TYPES[fmt],
+                headers={'Content-Disposition': f'attachment; filename="{target_username}-{kind}.{fmt}"'}
             )
             
         @app.route('/open_login_browser', methods=['POST'])
         def open_login_browser():
             # Close existing login browser if any
             if self.login_browser:
-                try:
-                    self.login_browser.quit()
-                except:
-                    pass
-                    
-            # Use Chrome profile directory
-            profile_dir = Path("data/chrome_profiles")
-            if not profile_dir.exists():
-                profile_dir.mkdir(parents=True, exist_ok=True)
+                self.login_browser.close()
+                
+            # Open new browser and navigate to Twitter. The checker keeps the
+            # profile while it runs, so it has to be stopped first.
+            self.login_browser = BrowserSession(
+                'login',
+                "data/chrome_profiles",
+                self.build_login_options,
+                take_over_profile=False
+            )
+            if not self.login_browser.start():
+                print("Stop the checker before opening the login browser")
+                self.login_browser = None
+                return redirect('/')
                 
-            # Profile settings
-            options = Options()
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            options.add_argument('--no-sandbox')
-            options.add_argument(f'--user-data-dir={profile_dir.absolute()}')
-            options.add_argument('--profile-directory=Default')
-            options.add_experimental_option('excludeSwitches', ['enable-automation'])
-            options.add_experimental_option('useAutomationExtension', False)
-            
-            # Additional settings to avoid detection
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-extensions')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--no-first-run')
-            options.add_argument('--no-service-autorun')
-            options.add_argument('--password-store=basic')
-            
             try:
-                # Open new browser and navigate to Twitter
-                self.login_browser = webdriver.Chrome(options=options)
-                self.login_browser.get('https://x.com/login')
+                self.login_browser.driver.get('https://x.com/login')
                 print("Opened login browser with profile")
             except Exception as e:
                 print(f"Error opening login browser: {str(e)}")
-                if self.login_browser:
-                    self.login_browser.quit()
+                self.login_browser.close()
                 self.login_browser = None
             
             return redirect('/')
             
         @app.route('/toggle_checker', methods=['POST'])
         def toggle_checker():
-            # Close login browser if open
+            # Close login browser if open and hand its profile to the checker
             if self.login_browser:
-                try:
-                    self.login_browser.quit()
-                except:
-                    pass
+                self.login_browser.close()
                 self.login_browser = None
             
             if self.follower_tracker is None or self.follower_tracker.should_exit:
-                # Start the checker only
-                from twitter_checker import TwitterFollowerTracker
-                
-                # Initialize follower tracker
-                self.follower_tracker = TwitterFollowerTracker(self.target_username)
+                # Scan every target across a pool of browser workers
+                workers = int(os.getenv('SCAN_WORKERS', '2'))
+                policy = None
+                if os.getenv('SCAN_SCHEDULING', 'adaptive') == 'adaptive':
+                    policy = AdaptiveScanPolicy()
+                self.follower_tracker = ScanScheduler(self.targets, workers=workers, policy=policy)
                 
                 def run_checker():
                     self.follower_tracker.run()
@@ -445,31 +816,29 @@ class FollowerWebViewer:
                     print("Stopped follower checker")
             
             return redirect('/')
-
+            
         @app.route('/toggle_api_sync', methods=['POST'])
         def toggle_api_sync():
-            if self.api_sync is None or self.api_sync.should_exit:
+            if not any(not api_sync.should_exit for api_sync in self.api_syncs):
                 # Start API sync
                 from api_sync import APISyncService
                 
-                # Initialize API sync service
-                self.api_sync = APISyncService(self.target_username)
-                
-                def run_api_sync():
-                    self.api_sync.run()
+                # Sync the followers of every scanned target, not only the primary one
+                self.api_syncs = [APISyncService(target.username) for target in self.targets]
                 
-                # Start API sync in a separate thread
-                api_thread = threading.Thread(target=run_api_sync)
-                api_thread.daemon = True
-                api_thread.start()
-                
-                print("Started API sync service")
+                # Start each API sync in a separate thread
+                for api_sync in self.api_syncs:
+                    api_thread = threading.Thread(target=api_sync.run)
+                    api_thread.daemon = True
+                    api_thread.start()
+                    
+                print(f"Started API sync service for {len(self.api_syncs)} targets")
             else:
                 # Stop API sync
-                if self.api_sync:
-                    self.api_sync.stop()
-                    self.api_sync = None
-                    print("Stopped API sync service")
+                for api_sync in self.api_syncs:
+                    api_sync.stop()
+                self.api_syncs = []
+                print("Stopped API sync service")
             
             return redirect('/')
             
@@ -0,0 +1,17 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Modules live flat in src/ and import each other by name
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from database import DatabaseManager
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Fresh DatabaseManager on a migrated database in a temporary directory"""
+    monkeypatch.setenv('DATABASE_PATH', str(tmp_path / 'followers.db'))
+    monkeypatch.setattr(DatabaseManager, '_instance', None)
+    return DatabaseManager()
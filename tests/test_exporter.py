@@ -0,0 +1,41 @@
+import io
+import sys
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from exporter import export, EXPORT_COLUMNS
+
+MANAGE = str(Path(__file__).parent.parent / 'src' / 'manage.py')
+
+def test_parquet_columns_null_in_first_batch(db):
+    pyarrow = pytest.importorskip('pyarrow')
+    parquet = pytest.importorskip('pyarrow.parquet')
+    db.add_followers('target', [{'username': f'plain{i}', 'display_name': None} for i in range(5)], 1)
+    db.add_followers('target', [{'username': 'named', 'display_name': 'Named'}], 2)
+    
+    # Batches of two rows: display_name is NULL throughout the first ones
+    data = b''.join(export(db, 'followers', 'parquet', 'target', batch_size=2))
+    table = parquet.read_table(io.BytesIO(data))
+    
+    assert table.num_rows == 6
+    assert table.schema.field('display_name').type == pyarrow.string()
+    assert 'Named' in table.column('display_name').to_pylist()
+
+def test_empty_parquet_export_has_schema(db):
+    parquet = pytest.importorskip('pyarrow.parquet')
+    
+    for kind, columns in EXPORT_COLUMNS.items():
+        table = parquet.read_table(io.BytesIO(b''.join(export(db, kind, 'parquet', 'nobody'))))
+        assert table.num_rows == 0
+        assert table.schema.names == [name for name, _ in columns]
+
+def test_export_to_stdout_on_new_database(tmp_path, monkeypatch):
+    # Opening the database applies every migration before the export streams
+    monkeypatch.setenv('DATABASE_PATH', str(tmp_path / 'followers.db'))
+    result = subprocess.run([sys.executable, MANAGE, 'export', 'followers', '--target', 'target'],
+                            check=True, capture_output=True)
+    
+    assert result.stdout.decode().splitlines() == [','.join(name for name, _ in EXPORT_COLUMNS['followers'])]
+    assert b'Applied database migration' in result.stderr
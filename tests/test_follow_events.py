@@ -0,0 +1,26 @@
+from datetime import datetime
+
+def add_events(db, target, username, events):
+    """Log (followed, occurred_at) events for one follower, in the given id order"""
+    def write(conn):
+        target_id = db._account_id(conn, target)
+        account_id = db._account_id(conn, username)
+        conn.executemany("""
+            INSERT INTO follow_events (target_id, account_id, followed, occurred_at) VALUES (?, ?, ?, ?)
+        """, [(target_id, account_id, followed, at) for followed, at in events])
+    db.write(write)
+
+def test_backdated_event_does_not_override_later_one(db):
+    # Followed at 1000, unfollowed at 3000, then a follow back-dated to 2000 is logged last
+    add_events(db, 'target', 'alice', [(1, 1000), (0, 3000), (1, 2000)])
+    
+    assert db.get_followers_as_of('target', datetime.fromtimestamp(4000)) == []
+    assert db.get_followers_as_of('target', datetime.fromtimestamp(2500)) == ['alice']
+    
+    changes = db.get_follower_changes('target', datetime.fromtimestamp(1500), datetime.fromtimestamp(4000))
+    assert changes == {'followed': [], 'unfollowed': ['alice']}
+
+def test_same_second_events_use_the_last_logged(db):
+    add_events(db, 'target', 'bob', [(1, 1000), (0, 1000)])
+    
+    assert db.get_followers_as_of('target', datetime.fromtimestamp(2000)) == []
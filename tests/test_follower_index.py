@@ -0,0 +1,16 @@
+import pytest
+
+from follower_index import FollowerIndex
+
+@pytest.mark.parametrize('mode', ['set', 'intern', 'bloom'])
+def test_add_after_reload_counts_once(db, mode):
+    db.add_followers('target', [{'username': name, 'display_name': None} for name in ('alice', 'bob')], 1)
+    index = FollowerIndex('target', db, mode)
+    index.load()
+    
+    # A reload that ran after the insert already holds the usernames being added
+    index.add(['alice', 'bob'])
+    index.add(['carol'])
+    
+    assert index.count == 3
+    assert index.active_count == 3
@@ -0,0 +1,31 @@
+import time
+
+import pytest
+
+from database import stat_bucket
+from importer import import_followers
+
+@pytest.fixture
+def berlin_time(monkeypatch):
+    monkeypatch.setenv('TZ', 'Europe/Berlin')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+def test_rebuild_buckets_match_live_rollups(db, tmp_path, berlin_time):
+    # Half past midnight in winter and in summer time; one of them is off by
+    # an hour from whatever offset applies now
+    winter = int(time.mktime((2024, 1, 10, 0, 30, 0, 0, 0, -1)))
+    summer = int(time.mktime((2024, 7, 10, 0, 30, 0, 0, 0, -1)))
+    path = tmp_path / 'followers.csv'
+    path.write_text(f"username,first_seen\nalice,{winter}\nbob,{summer}\n")
+    import_followers(db, 'target', str(path))
+    
+    rebuilt = db.get_follower_stats('target', 86400)
+    assert [row['bucket'] for row in rebuilt] == [stat_bucket(winter, 86400), stat_bucket(summer, 86400)]
+    assert [row['active'] for row in rebuilt] == [1, 2]
+    
+    # The live rollup of a later follower lands in the bucket the rebuild uses
+    db.write(lambda conn: db._record_follower_stats(conn, db._account_id(conn, 'target'), summer + 60, new_followers=1))
+    assert [row['new_followers'] for row in db.get_follower_stats('target', 86400)] == [1, 2]
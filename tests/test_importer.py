@@ -0,0 +1,117 @@
+import sys
+import json
+import subprocess
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from exporter import export
+from importer import import_followers
+
+MANAGE = str(Path(__file__).parent.parent / 'src' / 'manage.py')
+
+def write_csv(path, rows):
+    path.write_text("username,display_name,first_seen\n" + "".join(f"{row}\n" for row in rows))
+    return str(path)
+
+def follows(db, target):
+    cursor = db.get_connection().execute("""
+        SELECT a.username, f.is_active, f.api_synced, f.imported FROM follows f
+        JOIN accounts a ON a.id = f.account_id
+        WHERE f.target_id = (SELECT id FROM accounts WHERE username = ?)
+        ORDER BY a.username
+    """, (target,))
+    return [tuple(row) for row in cursor.fetchall()]
+
+def test_csv_import_counts_as_sweep(db, tmp_path):
+    path = write_csv(tmp_path / 'followers.csv', ['@alice,Alice,2024-01-05T10:00:00', 'bob,,1700000000', ',Nobody,'])
+    
+    assert import_followers(db, 'target', path, chunk_size=1) == {'read': 2, 'added': 2}
+    assert follows(db, 'target') == [('alice', 1, 1, 1), ('bob', 1, 1, 1)]
+    assert db.get_unsynced_followers('target') == []
+    assert db.get_last_generation('target', 'import')['observed'] == 2
+
+def test_reimported_export_keeps_unfollowers_inactive(db, tmp_path):
+    db.add_followers('source', [{'username': name, 'display_name': name} for name in ('alice', 'bob')], 1)
+    generation_id = db.start_generation('source')
+    db.record_observations(generation_id, ['alice'])
+    db.finish_generation(generation_id, min_coverage=0)
+    
+    for fmt in ('csv', 'jsonl'):
+        path = tmp_path / f'followers.{fmt}'
+        path.write_bytes(b''.join(export(db, 'followers', fmt, 'source')))
+        import_followers(db, f'copy_{fmt}', str(path))
+        
+        assert follows(db, f'copy_{fmt}') == [('alice', 1, 1, 1), ('bob', 0, 1, 1)]
+        assert db.follower_index(f'copy_{fmt}').active_count == 1
+        assert db.get_followers_as_of(f'copy_{fmt}', datetime.now()) == ['alice']
+
+def test_failed_import_is_not_a_sweep(db, tmp_path, monkeypatch):
+    path = write_csv(tmp_path / 'followers.csv', ['alice,,', 'bob,,'])
+    written = db.import_followers
+    
+    def fail_second_chunk(target, chunk):
+        if chunk[0]['username'] == 'bob':
+            raise RuntimeError("disk full")
+        return written(target, chunk)
+    monkeypatch.setattr(db, 'import_followers', fail_second_chunk)
+    
+    with pytest.raises(RuntimeError):
+        import_followers(db, 'target', path, chunk_size=1)
+    assert follows(db, 'target') == [('alice', 1, 1, 1)]
+    assert db.get_last_generation('target', 'import') is None
+
+def test_follower_js_ids_wait_for_network_scan(db, tmp_path):
+    path = tmp_path / 'follower.js'
+    path.write_text('window.YTD.follower.part0 = [\n'
+                    '  { "follower" : { "accountId" : "111", "userLink" : "https://twitter.com/intent/user?user_id=111" } },\n'
+                    '  { "follower" : { "accountId" : "222", "userLink" : "https://twitter.com/intent/user?user_id=222" } }\n'
+                    ']\n')
+    
+    assert import_followers(db, 'target', str(path)) == {'read': 2, 'added': 2}
+    assert follows(db, 'target') == []
+    assert db.get_last_generation('target', 'import') is None
+    
+    # A network scan reads alice with an imported id and carol with an unknown one
+    new = db.add_followers('target', [
+        {'username': 'alice', 'display_name': 'Alice', 'user_id': '111'},
+        {'username': 'carol', 'display_name': 'Carol', 'user_id': '333'}
+    ], 1)
+    assert new == 1
+    assert follows(db, 'target') == [('alice', 1, 1, 1), ('carol', 1, 0, 0)]
+    assert [follower['username'] for follower in db.get_unsynced_followers('target')] == ['carol']
+    assert db.get_connection().execute("SELECT user_id FROM pending_followers").fetchall()[0][0] == '222'
+
+def test_index_sees_import_from_another_process(db, tmp_path):
+    db.add_followers('target', [{'username': 'alice', 'display_name': 'Alice'}], 1)
+    assert db.follower_index('target').active_count == 1
+    
+    path = write_csv(tmp_path / 'followers.csv', ['bob,,', 'carol,,'])
+    subprocess.run([sys.executable, MANAGE, 'import', path, '--target', 'target'], check=True, capture_output=True)
+    
+    index = db.follower_index('target')
+    assert index.active_count == 3
+    assert 'carol' in index
+
+def test_id_import_is_no_rate_baseline(db, tmp_path):
+    path = tmp_path / 'follower.js'
+    path.write_text('window.YTD.follower.part0 = [ { "follower" : { "accountId" : "111" } } ]\n')
+    import_followers(db, 'target', str(path))
+    db.write(lambda conn: conn.execute("UPDATE scan_generations SET finished_at = ?",
+                                       ((datetime.now() - timedelta(hours=1)).isoformat(),)))
+    assert db.get_new_follower_rate('target', 24) is None
+    
+    # The first sweep loads the whole list; none of it counts as new arrivals
+    generation_id = db.start_generation('target')
+    db.add_followers('target', [{'username': f'user{i}', 'display_name': None} for i in range(50)], 1)
+    db.record_observations(generation_id, [f'user{i}' for i in range(50)])
+    db.finish_generation(generation_id)
+    assert db.get_new_follower_rate('target', 24) == 0
+
+def test_export_tells_imported_followers_apart(db, tmp_path):
+    import_followers(db, 'target', write_csv(tmp_path / 'followers.csv', ['alice,,']))
+    db.add_followers('target', [{'username': 'bob', 'display_name': None}], 1)
+    
+    rows = b''.join(export(db, 'followers', 'jsonl', 'target')).decode().splitlines()
+    assert {row['username']: row['imported'] for row in map(json.loads, rows)} == {'alice': 1, 'bob': 0}
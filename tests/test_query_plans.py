@@ -0,0 +1,18 @@
+import database
+from database import MIGRATIONS
+
+def test_migrations_applied(db):
+    assert db.schema_version() == MIGRATIONS[-1][0]
+
+def test_hot_queries_use_their_indexes(db):
+    assert db.check_query_plans() == {}
+
+def test_migrate_skips_migrations_applied_meanwhile(db, monkeypatch):
+    # A second process read version 0 before this one applied everything
+    real_version = database.schema_version
+    stale = [0]
+    monkeypatch.setattr(database, 'schema_version', lambda conn: stale.pop() if stale else real_version(conn))
+    
+    conn = db.connect()
+    assert database.migrate(conn) == 0
+    assert real_version(conn) == MIGRATIONS[-1][0]
@@ -0,0 +1,19 @@
+def add_followers(db, target, usernames):
+    db.add_followers(target, [{'username': username, 'display_name': None} for username in usernames], 1)
+
+def usernames(result):
+    return sorted(follower['username'] for follower in result['followers'])
+
+def test_short_prefix_search_ignores_case(db):
+    add_followers(db, 'target', ['Alice', 'alan', 'bob'])
+    
+    for term in ('al', 'Al', 'AL', '@al', '@aL'):
+        result = db.search_followers('target', term)
+        assert usernames(result) == ['Alice', 'alan'], term
+        assert result['total'] == 2
+
+def test_trigram_search_ignores_case(db):
+    add_followers(db, 'target', ['Alice', 'malice', 'bob'])
+    
+    assert usernames(db.search_followers('target', 'ALI')) == ['Alice', 'malice']
+    assert usernames(db.search_followers('target', '@ali')) == ['Alice']